@@ -0,0 +1,21 @@
+"""
+bench — المقاييس (benchmarks) خارج كود التشغيل، من مكان واحد:
+  python -m bench                      # القائمة
+  python -m bench <name> [--help]      # مقياس واحد (من مجلد supabase/Scraper)
+
+الاختبارات (صح/غلط) في tests/ — هنا الأرقام بس.
+"""
+
+# name -> what it measures (bench/<name>.py, main(argv))
+BENCHMARKS = {
+    "details": "DetailFetcher على سيرفر محلي: زمن صفحات التفاصيل في الدورة حسب عدد المباريات المباشرة",
+    "extraction": "page.evaluate مقابل عنصر بعنصر على صفحة محفوظة: دورات بالثانية ورحلات Chromium",
+    "instances": "عدة نسخ (--coordination shard) كعمليات منفصلة: صفحات التفاصيل في الثانية حسب عدد النسخ",
+    "merge": "merge_sources على عدة مصادر وهمية (أسماء مختلفة، مضيف وضيف معكوسين، دقائق متأخرة)",
+    "overlap": "الجلب والكتابة متداخلين (--async) مقابل التسلسلي، بأزمنة وهمية",
+    "parse": "parse_status بالـ cache وبدونه + ScrapedMatch مقابل dict (ذاكرة وشغل الدورة)",
+    "recording": "كل مرحلة على تسجيل --record (fetch، parsing، details، browser، db_write) + بوابة تراجع",
+    "resolve": "EntityResolver / NameIndex في الذاكرة على آلاف الأسماء: exact، normalized، trigram، miss",
+    "table": "جدول الترتيب على موسم وهمي: تحديث بالفرق مقابل إعادة حساب كاملة",
+    "upsert": "upsert_matches على Postgres محلي بـ 50/200/1000 مباراة: مدة الدورة وعدد الـ statements",
+}
@@ -0,0 +1,21 @@
+"""python -m bench <name> [args] — يشغّل bench/<name>.py."""
+
+import sys
+import importlib
+
+from bench import BENCHMARKS
+
+
+def main(argv: list[str]):
+    if not argv or argv[0] not in BENCHMARKS:
+        if argv and argv[0] not in ("-h", "--help"):
+            print(f"❌ مقياس غير معروف: {argv[0]}\n")
+        print("python -m bench <name> [--help]\n")
+        for name, description in BENCHMARKS.items():
+            print(f"  {name:<12} {description}")
+        sys.exit(0 if not argv or argv[0] in ("-h", "--help") else 2)
+    importlib.import_module(f"bench.{argv[0]}").main(argv[1:])
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,151 @@
+"""
+bench/details.py — زمن صفحات التفاصيل في الدورة حسب عدد المباريات المباشرة
+سيرفر HTTP محلي يقدّم fixtures/yallakora_match.html لكل /match/<n> بتأخير ثابت (زمن الموقع)،
+و DetailFetcher بنفس إعدادات التشغيل. لكل عدد مباريات:
+  cold     — أول دورة: كل الصفحات تنجلب (اتصالات جديدة)
+  refresh  — بعد live_ttl: كل الصفحات تنجلب من جديد (اتصالات الـ pool جاهزة)
+  next     — الدورة اللي بعدها: من الكاش، إلا المؤجلة (لو الميزانية خلصت في refresh)
+  pages    — الصفحات اللي رجعت في دورة refresh، و deferred اللي تأجلت لأن الميزانية خلصت
+
+الاستخدام:
+  python -m bench details
+  python -m bench details --live 1 10 40 100 --delay 0.3 --workers 8 --per-host 4
+"""
+
+import os
+import time
+import logging
+import argparse
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+LIVE_COUNTS = (1, 5, 10, 20, 40, 80)
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "yallakora_match.html")
+
+
+def detail_server(delay: float) -> ThreadingHTTPServer:
+    """نفس صفحة التفاصيل لكل مسار، بعد delay ثانية. server.requests = عدد الطلبات."""
+    with open(FIXTURE, "rb") as f:
+        body = f.read()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real site
+
+        def do_GET(self):
+            with self.server.lock:
+                self.server.requests += 1
+            time.sleep(delay)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.lock, server.requests = threading.Lock(), 0
+    threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+    return server
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _live_matches(base_url: str, count: int) -> list:
+    from parsing import ScrapedMatch
+
+    kickoff = datetime.now(timezone.utc)
+    return [
+        ScrapedMatch(
+            home_team_name=f"bench {2 * i}",
+            away_team_name=f"bench {2 * i + 1}",
+            start_time=kickoff,
+            status="live",
+            minute=30,
+            detail_url=f"{base_url}/match/{i}",
+        )
+        for i in range(count)
+    ]
+
+
+def _timed(fetcher, matches: list) -> tuple[float, int]:
+    started = time.perf_counter()
+    pages = fetcher.fetch(matches)
+    elapsed = time.perf_counter() - started
+    while fetcher._in_flight:  # pages still running past the budget land in the cache
+        time.sleep(0.01)
+    return elapsed, len(pages)
+
+
+def bench_count(base_url: str, count: int, workers: int, per_host: int, budget: float) -> dict:
+    from details import DetailFetcher
+
+    clock = _Clock()
+    fetcher = DetailFetcher(
+        "kora-bench", max_workers=workers, per_host=per_host, budget_seconds=budget, clock=clock
+    )
+    matches = _live_matches(base_url, count)
+    try:
+        cold, _ = _timed(fetcher, matches)
+        clock.now += fetcher.ttl["live"]
+        deferred_before = fetcher.stats["deferred"]
+        refresh, pages = _timed(fetcher, matches)
+        deferred = fetcher.stats["deferred"] - deferred_before
+        following, _ = _timed(fetcher, matches)
+    finally:
+        fetcher.close()
+    return {
+        "live": count,
+        "cold_ms": cold * 1000,
+        "refresh_ms": refresh * 1000,
+        "next_ms": following * 1000,
+        "pages": pages,
+        "deferred": deferred,
+    }
+
+
+def run(counts=LIVE_COUNTS, delay: float = 0.15, workers: int = 4, per_host: int = 2, budget: float = 8.0) -> list[dict]:
+    server = detail_server(delay)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        return [bench_count(base_url, count, workers, per_host, budget) for count in counts]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+
+    parser = argparse.ArgumentParser(prog="python -m bench details", description="⚽ detail pages vs live matches")
+    parser.add_argument("--live", type=int, nargs="+", default=list(LIVE_COUNTS), help="عدد المباريات المباشرة")
+    parser.add_argument("--delay", type=float, default=0.15, help="زمن رد الموقع لكل صفحة (ثواني)")
+    parser.add_argument("--workers", type=int, default=4, help="max_workers (الافتراضي مثل التشغيل)")
+    parser.add_argument("--per-host", type=int, default=2, help="per_host")
+    parser.add_argument("--budget", type=float, default=8.0, help="budget_seconds")
+    args = parser.parse_args(argv)
+
+    rows = run(args.live, args.delay, args.workers, args.per_host, args.budget)
+
+    print(f"delay {args.delay:g}s، workers {args.workers}، per_host {args.per_host}، budget {args.budget:g}s")
+    print(f"{'live':>5} {'cold ms':>9} {'refresh ms':>11} {'next ms':>10} {'pages':>6} {'deferred':>9}")
+    for r in rows:
+        print(
+            f"{r['live']:>5} {r['cold_ms']:>9.0f} {r['refresh_ms']:>11.0f} {r['next_ms']:>10.2f} "
+            f"{r['pages']:>6} {r['deferred']:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
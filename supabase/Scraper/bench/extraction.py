@@ -0,0 +1,166 @@
+"""
+bench/extraction.py — الاستخراج في المتصفح: page.evaluate واحد ("page") مقابل عنصر بعنصر ("element")
+على صفحة Yallakora محفوظة (file://، بدون إنترنت). لكل طريقة:
+  cycle       — scrape_matches كاملة (تحميل الصفحة + انتظار البطاقات + الاستخراج): دورات بالثانية
+  extraction  — الاستخراج بس على صفحة محمّلة: مرات بالثانية
+  round trips — نداءات Playwright → Chromium لكل دورة (كل method على Page/ElementHandle = رحلة)
+
+الاستخدام:
+  python -m bench extraction                                   # fixtures/yallakora_old.html و yallakora_new.html
+  python -m bench extraction fixtures/yallakora_new.html --seconds 5
+يحتاج Playwright و Chromium (playwright install chromium).
+"""
+
+import os
+import time
+import logging
+import argparse
+from collections import Counter
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+MODES = ("page", "element")
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures")
+DEFAULT_FIXTURES = ("yallakora_old.html", "yallakora_new.html")
+# Returned objects that live in the browser — calls on them are round trips too
+_HANDLE_TYPES = ("ElementHandle", "JSHandle", "Frame")
+
+
+class RoundTrips:
+    """يعدّ نداءات Page/ElementHandle (حسب اسم الـ method) عبر proxy — wrap(page)."""
+
+    def __init__(self):
+        self.calls: Counter = Counter()
+
+    @property
+    def total(self) -> int:
+        return sum(self.calls.values())
+
+    def wrap(self, value):
+        if isinstance(value, list):
+            return [self.wrap(item) for item in value]
+        if type(value).__name__ in _HANDLE_TYPES or type(value).__name__ == "Page":
+            return _Counted(value, self)
+        return value
+
+
+class _Counted:
+    __slots__ = ("_target", "_trips")
+
+    def __init__(self, target, trips: RoundTrips):
+        self._target = target
+        self._trips = trips
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            self._trips.calls[name] += 1
+            return self._trips.wrap(attr(*args, **kwargs))
+
+        return call
+
+    def __bool__(self):
+        return True
+
+
+def _extract(page, mode: str, today):
+    import scraper
+    if mode == "page":
+        return scraper.extract_matches_in_page(page, today)
+    return scraper.extract_matches_by_element(page, today)
+
+
+def _repeat(fn, min_seconds: float) -> tuple[int, float]:
+    runs = 0
+    started = time.perf_counter()
+    while True:
+        fn()
+        runs += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_seconds:
+            return runs, elapsed
+
+
+def bench_mode(page, url: str, mode: str, min_seconds: float = 2.0) -> dict:
+    """طريقة استخراج وحدة على صفحة وحدة."""
+    import scraper
+
+    today = datetime.now(timezone.utc).date()
+    matches = scraper.scrape_matches(page, mode, url=url)  # warm-up (and the page stays loaded)
+
+    trips = RoundTrips()
+    counted = trips.wrap(page)
+    extractions, extraction_seconds = _repeat(lambda: _extract(counted, mode, today), min_seconds)
+    extraction_trips = trips.total / extractions
+
+    trips = RoundTrips()
+    counted = trips.wrap(page)
+    cycles, cycle_seconds = _repeat(lambda: scraper.scrape_matches(counted, mode, url=url), min_seconds)
+
+    return {
+        "mode": mode,
+        "matches": len(matches),
+        "cycles_per_sec": cycles / cycle_seconds,
+        "extractions_per_sec": extractions / extraction_seconds,
+        "round_trips_per_cycle": trips.total / cycles,
+        "extraction_round_trips": extraction_trips,
+        "top_calls": {name: n / cycles for name, n in trips.calls.most_common(4)},
+    }
+
+
+def run(pages: list[str], min_seconds: float = 2.0) -> list[dict]:
+    """كل الطريقتين على كل صفحة، بنفس المتصفح (نفس إعدادات scraper.BrowserSession)."""
+    import scraper
+
+    browser = scraper.BrowserSession()
+    rows = []
+    try:
+        for path in pages:
+            url = "file://" + os.path.abspath(path)
+            for mode in MODES:
+                rows.append({"page": os.path.basename(path), **bench_mode(browser.page, url, mode, min_seconds)})
+    finally:
+        browser.close()
+    return rows
+
+
+def print_rows(rows: list[dict]):
+    print(
+        f"{'page':<22} {'mode':<8} {'matches':>7} {'cycles/s':>9} {'extract/s':>10} "
+        f"{'trips/cycle':>12} {'trips/extract':>14}"
+    )
+    for r in rows:
+        print(
+            f"{r['page']:<22} {r['mode']:<8} {r['matches']:>7} {r['cycles_per_sec']:>9.2f} "
+            f"{r['extractions_per_sec']:>10.1f} {r['round_trips_per_cycle']:>12.0f} {r['extraction_round_trips']:>14.0f}"
+        )
+    for r in rows:
+        calls = ", ".join(f"{name} {n:.0f}" for name, n in r["top_calls"].items())
+        print(f"  {r['page']} / {r['mode']}: {calls}")
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+
+    parser = argparse.ArgumentParser(
+        prog="python -m bench extraction", description="⚽ page.evaluate vs element-by-element"
+    )
+    parser.add_argument("pages", nargs="*", help="صفحات HTML محفوظة (الافتراضي: fixtures)")
+    parser.add_argument("--seconds", type=float, default=2.0, help="أقل مدة لكل قياس")
+    args = parser.parse_args(argv)
+
+    try:
+        import playwright  # noqa: F401
+    except ImportError:
+        parser.exit(1, "⏭️ Playwright غير مثبّت (pip install playwright && playwright install chromium)\n")
+
+    pages = args.pages or [os.path.join(FIXTURES_DIR, name) for name in DEFAULT_FIXTURES]
+    print_rows(run(pages, args.seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+bench/instances.py — صفحات التفاصيل في الثانية حسب عدد النسخ (--coordination shard)
+كل نسخة عملية منفصلة بـ Coordinator و DetailFetcher خاصين فيها، والدوريات تتوزع بينها
+بـ consistent hashing. السيرفر المحلي (bench details) يقدّم صفحة التفاصيل بتأخير ثابت.
+لكل عدد نسخ: الصفحات المجلوبة (وبدون تكرار)، الزمن، صفحة/ث، التسريع، وأكبر حصة عند نسخة وحدة.
+
+يكتب فعلاً في scraper_leases على DATABASE_URL (Postgres محلي فقط!) — الـ holders تبدأ بـ "bench-".
+
+الاستخدام:
+  DATABASE_URL=postgresql://postgres@localhost:54322/postgres python -m bench instances
+  python -m bench instances --instances 1 2 4 8 --workers 2 --delay 0.05
+"""
+
+import time
+import logging
+import argparse
+import multiprocessing
+from datetime import datetime, timezone
+
+from bench.details import detail_server
+
+logger = logging.getLogger(__name__)
+
+INSTANCES = (1, 2, 4)
+DETAIL_DELAY_SECONDS = 0.05  # simulated detail page response time
+
+
+def _reset_leases(prefix: str):
+    from sqlalchemy import text
+    from database import session_scope, dispose_engine
+
+    with session_scope() as session:
+        session.execute(text("DELETE FROM public.scraper_leases WHERE holder LIKE :p"), {"p": f"{prefix}%"})
+    dispose_engine()  # children get their own connections
+
+
+def _matches(base_url: str, league_count: int, per_league: int) -> list:
+    from parsing import ScrapedMatch
+
+    kickoff = datetime.now(timezone.utc)
+    return [
+        ScrapedMatch(
+            home_team_name=f"bench {l}-{i}a",
+            away_team_name=f"bench {l}-{i}b",
+            start_time=kickoff,
+            status="live",
+            league_name=f"دوري تجريبي {l}",
+            detail_url=f"{base_url}/match/{l}/{i}",
+        )
+        for l in range(league_count)
+        for i in range(per_league)
+    ]
+
+
+def _instance(instance_id: str, matches: list, workers: int, ready, results):
+    from coordination import Coordinator
+    from database import dispose_engine
+    from details import DetailFetcher
+
+    logging.getLogger().setLevel(logging.WARNING)
+    coordinator = Coordinator("shard", instance_id, ttl=10, renew_every=0.2)
+    coordinator.refresh(force=True)
+    ready.wait()            # every instance registered
+    time.sleep(0.3)
+    coordinator.refresh(force=True)
+    owned = coordinator.select(matches)
+    fetcher = DetailFetcher("kora-bench", max_workers=workers, per_host=workers, budget_seconds=600)
+    started = time.perf_counter()
+    fetched = fetcher.fetch(owned)
+    elapsed = time.perf_counter() - started
+    fetcher.close()
+    results.put((instance_id, [m.detail_url for m, _ in fetched], elapsed))
+    coordinator.release()
+    dispose_engine()
+
+
+def run(
+    instances=INSTANCES,
+    league_count: int = 48,
+    per_league: int = 5,
+    workers: int = 2,
+    delay: float = DETAIL_DELAY_SECONDS,
+) -> list[dict]:
+    server = detail_server(delay)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    matches = _matches(base_url, league_count, per_league)
+    ctx = multiprocessing.get_context("fork")
+    rows = []
+    try:
+        for count in instances:
+            _reset_leases("bench-")
+            ready, results = ctx.Barrier(count), ctx.Queue()
+            procs = [
+                ctx.Process(target=_instance, args=(f"bench-{count}-{i}", matches, workers, ready, results))
+                for i in range(count)
+            ]
+            for proc in procs:
+                proc.start()
+            outcome = [results.get(timeout=120) for _ in procs]
+            for proc in procs:
+                proc.join(10)
+            urls = [url for _, fetched, _ in outcome for url in fetched]
+            wall = max(elapsed for _, _, elapsed in outcome)
+            rows.append({
+                "instances": count,
+                "pages": len(urls),
+                "unique": len(set(urls)),
+                "seconds": wall,
+                "pages_per_sec": len(urls) / wall if wall else 0.0,
+                "largest_share": max(len(fetched) for _, fetched, _ in outcome) / max(len(matches), 1),
+            })
+    finally:
+        server.shutdown()
+        server.server_close()
+    return rows
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+
+    parser = argparse.ArgumentParser(prog="python -m bench instances", description="⚽ detail pages vs instances")
+    parser.add_argument("--instances", type=int, nargs="+", default=list(INSTANCES), help="أعداد النسخ")
+    parser.add_argument("--workers", type=int, default=2, help="طلبات متزامنة لكل نسخة")
+    parser.add_argument("--delay", type=float, default=DETAIL_DELAY_SECONDS, help="زمن رد الموقع لكل صفحة (ثواني)")
+    args = parser.parse_args(argv)
+
+    rows = run(args.instances, workers=args.workers, delay=args.delay)
+
+    base = rows[0]["pages_per_sec"] / rows[0]["instances"]
+    print(f"{'نسخ':>4} {'صفحات':>6} {'بدون تكرار':>10} {'ثواني':>7} {'صفحة/ث':>8} {'تسريع':>6} {'أكبر حصة':>9}")
+    for row in rows:
+        print(
+            f"{row['instances']:>4} {row['pages']:>6} {row['unique']:>10} {row['seconds']:>7.2f} "
+            f"{row['pages_per_sec']:>8.1f} {row['pages_per_sec'] / base:>5.2f}x {row['largest_share']:>9.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
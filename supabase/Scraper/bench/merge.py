@@ -0,0 +1,85 @@
+"""
+bench/merge.py — دمج نتائج عدة مصادر (sources.merge_sources) على بيانات وهمية:
+كل مصدر يغطي ~80% من المباريات، أحياناً بدقيقة متأخرة، أو باسم مكتوب بشكل ثاني، أو بالمضيف والضيف معكوسين.
+
+الاستخدام:
+  python -m bench merge
+  python -m bench merge --records 3000 --sources 3 --rounds 20
+"""
+
+import time
+import random
+import argparse
+import dataclasses
+from datetime import datetime, timezone, timedelta
+
+from parsing import ScrapedMatch
+from sources import SourceResult, _normalized, merge_sources
+
+
+def synthetic_results(records: int, sources: int, seed: int = 7) -> list[SourceResult]:
+    """نفس المباريات من sources مصدر، بالاختلافات اللي فوق."""
+    rng = random.Random(seed)
+    start = datetime.now(timezone.utc) + timedelta(hours=2)
+    base = [
+        ScrapedMatch(
+            home_team_name=f"الأهلي {i}",
+            away_team_name=f"نادي الزمالك {i}",
+            start_time=start,
+            status=rng.choice(("upcoming", "live", "live", "finished")),
+            minute=rng.randint(1, 90),
+            home_score=rng.randint(0, 3),
+            away_score=rng.randint(0, 3),
+        )
+        for i in range(records)
+    ]
+    now = time.time()
+    results = []
+    for s in range(sources):
+        matches = []
+        for m in base:
+            if s and rng.random() > 0.8:
+                continue
+            changes = {}
+            if s and rng.random() < 0.3:
+                changes["minute"] = max(m.minute - rng.randint(1, 3), 0)
+            if s and rng.random() < 0.2:
+                changes["home_team_name"] = m.home_team_name.replace("الأهلي", "الاهلي")
+            if s and rng.random() < 0.05:
+                changes.update(
+                    home_team_name=m.away_team_name, away_team_name=m.home_team_name,
+                    home_score=m.away_score, away_score=m.home_score,
+                )
+            matches.append(dataclasses.replace(m, **changes) if changes else m)
+        results.append(SourceResult(f"source{s}", 1.0 - s * 0.1, now - s, matches))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench merge", description="⚽ Kora source merge")
+    parser.add_argument("--records", type=int, default=3000)
+    parser.add_argument("--sources", type=int, default=3)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    results = synthetic_results(args.records, args.sources)
+    cards = sum(len(r.matches) for r in results)
+
+    merged = merge_sources(results)  # warm the normalize cache, like every cycle after the first
+    started = time.perf_counter()
+    for _ in range(args.rounds):
+        merged = merge_sources(results)
+    elapsed = (time.perf_counter() - started) / args.rounds
+
+    _normalized.cache_clear()
+    started = time.perf_counter()
+    merge_sources(results)
+    cold = time.perf_counter() - started
+
+    print(f"{args.sources} sources, {cards:,} cards → {len(merged):,} matches")
+    print(f"  merge:        {elapsed * 1e3:.2f} ms/cycle ({cards / elapsed:,.0f} cards/s)")
+    print(f"  first cycle:  {cold * 1e3:.2f} ms (normalize cache empty)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+bench/overlap.py — الجلب والكتابة متداخلين (pipeline.py، وضع --async) مقابل التسلسلي
+fetcher و DB وهميين بأزمنة ثابتة (بدون شبكة أو DB) — الفرق بين الطريقتين من التداخل فقط.
+  المتوقع: التسلسلي ≈ cycles × (fetch + write)
+           المتوازي ≈ cycles × max(fetch, write) + min(fetch, write)
+
+الاستخدام:
+  python -m bench overlap
+  python -m bench overlap --cycles 20 --fetch-seconds 0.2 --write-seconds 0.15 --queue-size 2
+"""
+
+import time
+import asyncio
+import argparse
+
+from pipeline import run_pipeline
+
+
+def run_serial(fetch, write, next_interval, *, cycles: int, sleep=time.sleep):
+    """نفس حلقة run_pipeline بدون تداخل."""
+    for iteration in range(1, cycles + 1):
+        matches = fetch(iteration)
+        write(iteration, matches)
+        if iteration < cycles:
+            sleep(next_interval(matches))
+    return cycles
+
+
+def run(cycles: int, fetch_seconds: float, write_seconds: float, queue_size: int) -> dict:
+    fetched = []
+
+    def fake_fetch(iteration):
+        time.sleep(fetch_seconds)
+        fetched.append(iteration)
+        return [{"status": "live"}] * 20
+
+    def fake_write(iteration, matches):
+        time.sleep(write_seconds)
+        return len(matches)
+
+    def no_wait(matches):
+        return 0
+
+    started = time.perf_counter()
+    run_serial(fake_fetch, fake_write, no_wait, cycles=cycles)
+    serial = time.perf_counter() - started
+
+    fetched.clear()
+    started = time.perf_counter()
+    asyncio.run(run_pipeline(
+        fake_fetch,
+        fake_write,
+        no_wait,
+        queue_size=queue_size,
+        should_stop=lambda: len(fetched) >= cycles,
+    ))
+    pipelined = time.perf_counter() - started
+    return {"serial": serial, "pipelined": pipelined}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench overlap", description="⚽ Kora pipeline benchmark")
+    parser.add_argument("--cycles", type=int, default=20)
+    parser.add_argument("--fetch-seconds", type=float, default=0.2)
+    parser.add_argument("--write-seconds", type=float, default=0.15)
+    parser.add_argument("--queue-size", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    r = run(args.cycles, args.fetch_seconds, args.write_seconds, args.queue_size)
+
+    cycles = args.cycles
+    print(f"cycles={cycles} fetch={args.fetch_seconds}s write={args.write_seconds}s queue={args.queue_size}")
+    print(f"  serial:    {r['serial']:.2f}s  ({cycles / r['serial']:.2f} cycles/s)")
+    print(f"  pipelined: {r['pipelined']:.2f}s  ({cycles / r['pipelined']:.2f} cycles/s)")
+    print(f"  speedup:   {r['serial'] / r['pipelined']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+bench/parse.py — تحليل الحالة والمباريات في الذاكرة:
+  status   — parse_status بدون cache (أول مرة يظهر النص) ومن الـ cache (كل بطاقة ودورة بعدها)
+  records  — n مباراة: بناء ScrapedMatch، الذاكرة مقابل الـ dict القديم (to_dict)،
+             وشغل الدورة (key/fingerprint + فصل المباشر) بالطريقتين
+
+الاستخدام:
+  python -m bench parse
+  python -m bench parse --rounds 20000 --records 10000
+"""
+
+import time
+import argparse
+import tracemalloc
+from datetime import datetime, timezone
+
+from parsing import STATUS_KEYWORDS, build_match_from_raw, parse_status, partition_live
+
+# Every keyword, plus the minute / clock forms the cards show
+STATUS_SAMPLES = (*STATUS_KEYWORDS, "مباشر 45+2'", "مباشر ٤٥+٢'", "90 + 4'", "67'", "20:00", "لم تبدأ", "")
+
+
+def bench_status(rounds: int):
+    """نفس النصوص بدون cache ومن الـ cache."""
+    texts = list(STATUS_SAMPLES)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for text in texts:
+            parse_status.__wrapped__(text)
+    cold = (time.perf_counter() - started) / (rounds * len(texts))
+
+    parse_status.cache_clear()
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for text in texts:
+            parse_status(text)
+    warm = (time.perf_counter() - started) / (rounds * len(texts))
+
+    print(f"parse_status over {len(texts)} status strings × {rounds}")
+    print(f"  uncached: {cold * 1e6:.2f} µs/call")
+    print(f"  cached:   {warm * 1e6:.2f} µs/call  ({parse_status.cache_info()})")
+
+
+def synthetic_raw(n: int) -> list[dict]:
+    statuses = ("مباشر 67'", "ش.أ", "انتهت", "20:00", "90+4", "لم تبدأ")
+    return [
+        {
+            "home_team": f"فريق {i}",
+            "away_team": f"فريق {i + 1}",
+            "home_logo": f"https://img.example/{i}.png",
+            "away_logo": f"https://img.example/{i + 1}.png",
+            "score": f"{i % 4} - {i % 3}",
+            "status": statuses[i % len(statuses)],
+            "league": f"دوري {i % 20}",
+            "time": "20:00",
+            "channel": "beIN 1",
+            "round": f"الجولة {i % 38}",
+            "detail_url": f"https://www.yallakora.com/match/{i}",
+        }
+        for i in range(n)
+    ]
+
+
+def bench_records(n: int):
+    """ذاكرة وسرعة n مباراة: ScrapedMatch مقابل الـ dict القديم (to_dict)."""
+    raws = synthetic_raw(n)
+    today = datetime.now(timezone.utc).date()
+
+    started = time.perf_counter()
+    matches = [build_match_from_raw(raw, today) for raw in raws]
+    build = time.perf_counter() - started
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    records = [build_match_from_raw(raw, today) for raw in raws]
+    record_bytes = sum(s.size_diff for s in tracemalloc.take_snapshot().compare_to(before, "filename"))
+    before = tracemalloc.take_snapshot()
+    dicts = [m.to_dict() for m in records]
+    dict_bytes = sum(s.size_diff for s in tracemalloc.take_snapshot().compare_to(before, "filename"))
+    tracemalloc.stop()
+
+    # What every cycle does: change detection (key + fingerprint) and the live/other split
+    started = time.perf_counter()
+    cache = {m.key: m.fingerprint for m in matches}
+    changed = [m for m in matches if cache.get(m.key) != m.fingerprint]
+    live, other = partition_live(matches)
+    record_cycle = time.perf_counter() - started
+
+    started = time.perf_counter()
+    cache = {
+        (d["home_team_name"], d["away_team_name"], d["start_time"].date()):
+            (d.get("status", "upcoming"), d.get("home_score", 0), d.get("away_score", 0), d.get("minute", 0))
+        for d in dicts
+    }
+    changed = [
+        d for d in dicts
+        if cache.get((d["home_team_name"], d["away_team_name"], d["start_time"].date()))
+        != (d.get("status", "upcoming"), d.get("home_score", 0), d.get("away_score", 0), d.get("minute", 0))
+    ]
+    live = [d for d in dicts if d["status"] == "live"]
+    other = [d for d in dicts if d["status"] != "live"]
+    dict_cycle = time.perf_counter() - started
+    del changed, live, other
+
+    print(f"{n:,} records")
+    print(f"  build ScrapedMatch:   {build * 1e3:.1f} ms ({n / build:,.0f}/s)")
+    print(f"  memory ScrapedMatch:  {record_bytes / n:.0f} B/record (incl. key)")
+    print(f"  memory dict:          {dict_bytes / n:.0f} B/record (values shared)")
+    print(f"  cycle ScrapedMatch:   {record_cycle * 1e3:.2f} ms (key/fingerprint + partition)")
+    print(f"  cycle dict:           {dict_cycle * 1e3:.2f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench parse", description="⚽ Kora status/score parsers")
+    parser.add_argument("--rounds", type=int, default=20000)
+    parser.add_argument("--records", type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    bench_status(args.rounds)
+    bench_records(args.records)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+bench/recording.py — قياس سرعة كل مرحلة على صفحات مسجّلة (بدون الموقع وبدون Supabase)
+يشتغل على مجلد من --record (انظر replay.py) ويطبع عدد العمليات بالثانية لكل مرحلة:
+  fetch      — جلب صفحة المباريات من سيرفر الإعادة المحلي (HTTP)
+  parsing    — parse_matches_html على صفحات القائمة المسجّلة
+  fields     — parse_score / parse_minute / map_status
+  details    — parse_match_details على صفحات التفاصيل المسجّلة
+  browser    — scrape_matches عبر Playwright (لو مثبّت)، page.evaluate وعنصر بعنصر + رحلات Chromium
+  db_write   — upsert_matches على DATABASE_URL (مع --db فقط — يكتب فعلاً!)
+
+الاستخدام:
+  python -m bench recording recordings/2025-10-01
+  python -m bench recording recordings/2025-10-01 --json bench.json          # حفظ النتائج
+  python -m bench recording recordings/2025-10-01 --baseline bench.json      # بوابة: يفشل لو فيه تراجع
+  python -m bench recording recordings/2025-10-01 --db                       # مع كتابة الـ DB (Postgres محلي)
+"""
+
+import sys
+import json
+import time
+import logging
+import argparse
+from datetime import datetime, timezone
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    pass
+
+from replay import ReplayServer, recorded_pages
+from http_fetcher import HttpFetcher, parse_matches_html, match_containers, extract_raw_from_node
+from details import parse_match_details
+from parsing import parse_score, parse_minute, map_status
+
+logger = logging.getLogger(__name__)
+
+MIN_SECONDS = 1.0  # every stage runs at least this long (repeating its inputs)
+
+
+def _run(fn, items: list, min_seconds: float = MIN_SECONDS) -> dict:
+    """تشغيل fn على كل عنصر، وتكرار القائمة لين تمر min_seconds. Returns: {ops, seconds, ops_per_sec}"""
+    if not items:
+        return {"ops": 0, "seconds": 0.0, "ops_per_sec": 0.0}
+    ops = 0
+    started = time.perf_counter()
+    while True:
+        for item in items:
+            fn(item)
+        ops += len(items)
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_seconds:
+            return {"ops": ops, "seconds": elapsed, "ops_per_sec": ops / elapsed}
+
+
+def run_benchmarks(root: str, with_db: bool = False) -> dict:
+    listings, detail_pages = recorded_pages(root)
+    results: dict[str, dict] = {}
+    today = datetime.now(timezone.utc).date()
+
+    # ── fetch (local HTTP server, connection reused) ──
+    replay = ReplayServer(root)
+    replay.advance()
+    http = HttpFetcher(replay.listing_url, "kora-bench")
+    try:
+        results["fetch"] = _run(lambda _: http.fetch_html(), [None])
+    finally:
+        http.close()
+        replay.close()
+
+    # ── parsing (listing HTML -> match dicts) ──
+    results["parsing"] = _run(lambda page: parse_matches_html(page, today), listings)
+    matches = [m for page in listings for m in parse_matches_html(page, today)]
+    results["parsing"]["matches_per_page"] = len(matches) / max(len(listings), 1)
+
+    # ── field parsers (the raw strings the listing actually contains) ──
+    raws = [extract_raw_from_node(node) for page in listings for node in match_containers(page)]
+    fields = [(raw.get("score", ""), raw.get("status", ""), raw.get("status", "")) for raw in raws]
+    results["fields"] = _run(
+        lambda f: (parse_score(f[0]), parse_minute(f[1]), map_status(f[2])),
+        fields,
+    )
+
+    # ── detail pages ──
+    results["details"] = _run(parse_match_details, detail_pages)
+
+    # ── browser (optional) ──
+    try:
+        import playwright  # noqa: F401
+    except ImportError:
+        logger.info("⏭️ browser: Playwright غير مثبّت — تخطي")
+    else:
+        import scraper
+        from bench.extraction import RoundTrips
+        replay = ReplayServer(root)
+        replay.advance()
+        browser = scraper.BrowserSession()
+        try:
+            # "browser" stays the page.evaluate path (the baseline key); "browser_element" for comparison
+            for stage, mode in (("browser", "page"), ("browser_element", "element")):
+                trips = RoundTrips()
+                page = trips.wrap(browser.page)
+                results[stage] = _run(
+                    lambda _: scraper.scrape_matches(page, mode, url=replay.listing_url), [None]
+                )
+                results[stage]["round_trips_per_op"] = trips.total / max(results[stage]["ops"], 1)
+        finally:
+            browser.close()
+            replay.close()
+
+    # ── DB writes (optional, writes for real) ──
+    if with_db:
+        from database import session_scope, upsert_matches
+        with session_scope() as session:
+            results["db_write"] = _run(
+                lambda batch: upsert_matches(session, batch, skip_unchanged=False),
+                [matches],
+            )
+        results["db_write"]["rows_per_sec"] = results["db_write"]["ops_per_sec"] * len(matches)
+
+    return results
+
+
+def _compare(results: dict, baseline: dict, max_regression: float) -> list[str]:
+    failures = []
+    for stage, current in results.items():
+        before = baseline.get(stage, {}).get("ops_per_sec")
+        if not before or not current["ops_per_sec"]:
+            continue
+        change = current["ops_per_sec"] / before - 1
+        if change < -max_regression:
+            failures.append(f"{stage}: {before:,.0f} → {current['ops_per_sec']:,.0f} ops/s ({change:+.0%})")
+    return failures
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    for name in ("replay", "http_fetcher", "database", "resolver", "scraper"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    parser = argparse.ArgumentParser(prog="python -m bench recording", description="⚽ Kora offline benchmarks")
+    parser.add_argument("recording", help="مجلد تسجيل من scraper.py --record")
+    parser.add_argument("--db", action="store_true", help="قياس الكتابة في DATABASE_URL (يكتب فعلاً)")
+    parser.add_argument("--json", metavar="FILE", help="حفظ النتائج")
+    parser.add_argument("--baseline", metavar="FILE", help="مقارنة بنتائج سابقة (--json)")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="أقصى تراجع مسموح (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.recording, with_db=args.db)
+
+    print(f"{'stage':<16} {'ops/s':>12} {'ops':>8} {'seconds':>8} {'trips/op':>9}")
+    for stage, r in results.items():
+        trips = f"{r['round_trips_per_op']:>9.0f}" if "round_trips_per_op" in r else ""
+        print(f"{stage:<16} {r['ops_per_sec']:>12,.1f} {r['ops']:>8} {r['seconds']:>8.2f} {trips}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures = _compare(results, json.load(f), args.max_regression)
+        if failures:
+            print("\n❌ تراجع في الأداء:")
+            for line in failures:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\n✅ لا تراجع أكبر من {args.max_regression:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+bench/resolve.py — سرعة ربط الأسماء بالـ IDs في الذاكرة (EntityResolver / NameIndex)، بدون DB
+على بضعة آلاف اسم فريق مولّدة (كلمات عربية متشابهة، مثل الواقع):
+  build       — بناء الفهرس (نفس preload بدون الاستعلام): أسماء بالثانية
+  exact       — الاسم كما في الـ DB
+  normalized  — نفس الاسم بهمزة/تاء مربوطة/تشكيل مختلف
+  trigram     — كلمة ناقصة أو زايدة (المطابقة التقريبية)
+  miss        — اسم غير موجود (يمر على كل المراحل)
+  cycle       — resolve_teams على دورة كاملة (200 اسم، كلها موجودة)
+  (normalized/trigram/miss بتكلفة أول مرة — lookup يحفظ التهجئة بعدها كاسم exact)
+
+الاستخدام:
+  python -m bench resolve
+  python -m bench resolve --teams 10000 --seconds 2
+"""
+
+import time
+import random
+import logging
+import argparse
+
+logger = logging.getLogger(__name__)
+
+_CITIES = (
+    "القاهرة", "الإسكندرية", "جدة", "الرياض", "الدوحة", "دبي", "الشارقة", "عمّان", "بغداد", "الكويت",
+    "مسقط", "المنامة", "تونس", "الرباط", "الجزائر", "بيروت", "دمشق", "طرابلس", "الخرطوم", "أبها",
+)
+_WORDS = (
+    "الأهلي", "الاتحاد", "الهلال", "النصر", "الشباب", "الوحدة", "الرائد", "الفيصلي", "النجم", "الشرطة",
+    "الجيش", "المقاولون", "الإنتاج", "الرياضي", "الثقافي", "الاجتماعي", "الساحلي", "الجديد", "الأولمبي", "الفتح",
+)
+_NOISE = str.maketrans({"أ": "ا", "إ": "ا", "ة": "ه", "ي": "ى"})
+
+
+def synthetic_teams(count: int, seed: int = 7) -> list[str]:
+    """count اسم مختلف: كلمتين أو ثلاث + مدينة."""
+    rng = random.Random(seed)
+    names: dict[str, None] = {}
+    while len(names) < count:
+        words = rng.sample(_WORDS, rng.choice((1, 2, 2, 3)))
+        names[" ".join((*words, rng.choice(_CITIES)))] = None
+    return list(names)
+
+
+def _variants(names: list[str], rng: random.Random) -> dict[str, list[str]]:
+    sample = rng.sample(names, min(500, len(names)))
+    return {
+        "exact": sample,
+        "normalized": ["نادي " + name.translate(_NOISE).replace("ا", "اَ", 1) for name in sample],
+        "trigram": [name + " " + rng.choice(("FC", "السعودي", "المصري")) for name in sample],
+        "miss": [f"فريق غير معروف {i}" for i in range(len(sample))],
+    }
+
+
+def _rate(fn, items: list, min_seconds: float) -> float:
+    ops = 0
+    started = time.perf_counter()
+    while True:
+        for item in items:
+            fn(item)
+        ops += len(items)
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_seconds:
+            return ops / elapsed
+
+
+def run(team_count: int = 3000, min_seconds: float = 1.0) -> dict:
+    from resolver import EntityResolver, NameIndex
+
+    rng = random.Random(team_count)
+    names = synthetic_teams(team_count)
+    ids = {name: f"team-{i}" for i, name in enumerate(names)}
+
+    started = time.perf_counter()
+    index = NameIndex()
+    for name in names:
+        index.add(name, ids[name])
+    results = {"build": {"ops_per_sec": team_count / (time.perf_counter() - started), "found": 1.0}}
+
+    def first_sight(query: str):
+        # lookup() remembers a resolved spelling as an exact name — forget it so
+        # every call pays what a new spelling costs on its first cycle
+        entity_id = index.lookup(query)
+        index.exact.pop(query, None)
+        return entity_id
+
+    for kind, queries in _variants(names, rng).items():
+        lookup = index.lookup if kind == "exact" else first_sight
+        found = sum(lookup(q) is not None for q in queries) / len(queries)
+        results[kind] = {"ops_per_sec": _rate(lookup, queries, min_seconds), "found": found}
+
+    resolver = EntityResolver()
+    resolver.teams, resolver.loaded = index, True
+    cycle = {name: ("", None) for name in rng.sample(names, min(200, len(names)))}
+    results["cycle"] = {
+        "ops_per_sec": _rate(lambda teams: resolver.resolve_teams(None, teams), [cycle], min_seconds),
+        "found": 1.0,
+    }
+    return results
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+
+    parser = argparse.ArgumentParser(prog="python -m bench resolve", description="⚽ in-memory name resolution")
+    parser.add_argument("--teams", type=int, default=3000, help="عدد الفرق في الفهرس")
+    parser.add_argument("--seconds", type=float, default=1.0, help="أقل مدة لكل قياس")
+    args = parser.parse_args(argv)
+
+    results = run(args.teams, args.seconds)
+
+    print(f"{args.teams} فريق")
+    print(f"{'case':<11} {'ops/s':>12} {'µs/op':>9} {'found':>6}")
+    for case, r in results.items():
+        print(f"{case:<11} {r['ops_per_sec']:>12,.0f} {1e6 / r['ops_per_sec']:>9.1f} {r['found']:>6.0%}")
+    print("(build = أسماء مضافة بالثانية، cycle = دورات resolve_teams بـ 200 اسم بالثانية)")
+
+
+if __name__ == "__main__":
+    main()
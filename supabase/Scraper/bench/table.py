@@ -0,0 +1,91 @@
+"""
+bench/table.py — جدول الترتيب على موسم وهمي (20 فريق، 380 مباراة، جولة جولة):
+تحديث بالفرق (StandingsEngine.apply + table) مقابل إعادة حساب كاملة (full_recompute) كل جولة.
+
+الاستخدام:
+  python -m bench table
+  python -m bench table --teams 40
+"""
+
+import time
+import random
+import argparse
+from datetime import datetime, timezone, timedelta
+
+from standings import StandingsEngine
+
+
+def synthetic_season(teams: int = 20, seed: int = 7) -> list[list[dict]]:
+    """دوري ذهاب وإياب: teams × (teams - 1) مباراة مقسّمة على جولات (صفوف upsert_matches)."""
+    rng = random.Random(seed)
+    team_ids = [f"team-{i:02d}" for i in range(teams)]
+    kickoff = datetime(2025, 8, 15, 18, 0, tzinfo=timezone.utc)
+
+    # Circle method: every team plays once per round
+    rotation = team_ids[:]
+    rounds = []
+    for leg in range(2):
+        for r in range(teams - 1):
+            pairs = [(rotation[i], rotation[-1 - i]) for i in range(teams // 2)]
+            if leg:
+                pairs = [(away, home) for home, away in pairs]
+            day = kickoff + timedelta(days=7 * (leg * (teams - 1) + r))
+            rounds.append([
+                {
+                    "league_id": "league-bench",
+                    "home_team_id": home,
+                    "away_team_id": away,
+                    "start_time": day,
+                    "status": "finished",
+                    "home_score": rng.choice((0, 0, 1, 1, 1, 2, 2, 3)),
+                    "away_score": rng.choice((0, 0, 1, 1, 2, 2, 3)),
+                }
+                for home, away in pairs
+            ])
+            rotation = [rotation[0], rotation[-1], *rotation[1:-1]]
+    return rounds
+
+
+def run(teams: int) -> dict:
+    rounds = synthetic_season(teams)
+
+    # Incremental: apply each round's results, rebuild only that league's table
+    engine = StandingsEngine()
+    started = time.perf_counter()
+    for round_rows in rounds:
+        for league_id in engine.apply(round_rows):
+            engine.table(league_id)
+    incremental = time.perf_counter() - started
+
+    # Full: the same rounds, but totals recomputed from every result each time
+    full_engine = StandingsEngine()
+    started = time.perf_counter()
+    for round_rows in rounds:
+        for league_id in full_engine.apply(round_rows):
+            table = full_engine.full_recompute(league_id)
+    full = time.perf_counter() - started
+
+    return {
+        "matches": sum(len(r) for r in rounds),
+        "rounds": len(rounds),
+        "incremental": incremental,
+        "full": full,
+        "leader": table[0],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench table", description="⚽ Kora standings benchmark")
+    parser.add_argument("--teams", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    r = run(args.teams)
+    rounds, leader = r["rounds"], r["leader"]
+    print(f"teams={args.teams} matches={r['matches']} rounds={rounds}")
+    print(f"  incremental:     {r['incremental'] * 1000:.1f}ms ({r['incremental'] / rounds * 1000:.2f}ms/round)")
+    print(f"  full recompute:  {r['full'] * 1000:.1f}ms ({r['full'] / rounds * 1000:.2f}ms/round)")
+    print(f"  leader: {leader['team_id']} {leader['points']}pts form={''.join(leader['form'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+bench/upsert.py — كتابة الدورة في Postgres (upsert_matches) حسب عدد المباريات: 50، 200، 1000
+لكل حجم ثلاث حالات:
+  first  — أول دورة: كل الفرق والدوريات جديدة وكل المباريات INSERT
+  live   — دورة عادية: 10% من المباريات تغيّرت (skip_unchanged — الباقي ما ينكتب)
+  full   — كل المباريات تنكتب (skip_unchanged=False)
+ويطبع لكل حالة: مدة الدورة (الوسيط) وعدد الـ statements اللي راحت للـ DB.
+
+يكتب فعلاً في DATABASE_URL (Postgres محلي فقط!) — أسماء الفرق تبدأ بـ "bench" وتنمسح في النهاية.
+
+الاستخدام:
+  DATABASE_URL=postgresql://postgres@localhost:54322/postgres python -m bench upsert
+  python -m bench upsert --sizes 50 200 1000 5000 --cycles 20
+"""
+
+import time
+import random
+import logging
+import argparse
+import dataclasses
+from statistics import median
+from datetime import datetime, timezone, timedelta
+
+logger = logging.getLogger(__name__)
+
+SIZES = (50, 200, 1000)
+PREFIX = "bench"
+LIVE_FRACTION = 0.1
+
+
+def synthetic_cycle(size: int, seed: int = 7) -> list:
+    """size مباراة اليوم، كل فريق يلعب مرة وحدة، 20 مباراة لكل دوري."""
+    from parsing import ScrapedMatch
+
+    rng = random.Random(seed)
+    kickoff = datetime.now(timezone.utc).replace(hour=12, minute=0, second=0, microsecond=0)
+    return [
+        ScrapedMatch(
+            home_team_name=f"{PREFIX} {size} فريق {2 * i}",
+            away_team_name=f"{PREFIX} {size} فريق {2 * i + 1}",
+            start_time=kickoff + timedelta(minutes=15 * (i % 40)),
+            status="upcoming",
+            league_name=f"{PREFIX} {size} دوري {i // 20}",
+            channel=rng.choice(("beIN 1", "beIN 2", "SSC 1", "")),
+        )
+        for i in range(size)
+    ]
+
+
+def _advance(matches: list, fraction: float, rng: random.Random) -> list:
+    """دورة جديدة: fraction من المباريات صارت live بدقيقة/نتيجة جديدة."""
+    changed = set(rng.sample(range(len(matches)), max(1, int(len(matches) * fraction))))
+    return [
+        dataclasses.replace(
+            m, status="live", minute=m.minute + 1, home_score=m.home_score + rng.randint(0, 1)
+        ) if i in changed else m
+        for i, m in enumerate(matches)
+    ]
+
+
+class StatementCounter:
+    """عدد الـ statements (before_cursor_execute) على الـ engine المشترك."""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+def _cycle(database, counter: StatementCounter, matches: list, skip_unchanged: bool) -> tuple[float, int, dict]:
+    before = counter.count
+    started = time.perf_counter()
+    with database.session_scope() as session:
+        stats = database.upsert_matches(session, matches, skip_unchanged=skip_unchanged)
+    elapsed = time.perf_counter() - started
+    if "error" in stats:
+        raise RuntimeError(stats["error"])
+    return elapsed, counter.count - before, stats
+
+
+def _cleanup(database):
+    from sqlalchemy import text
+    with database.session_scope() as session:
+        params = {"prefix": f"{PREFIX} %"}
+        session.execute(text("""
+            DELETE FROM public.matches WHERE home_team_id IN (SELECT id FROM public.teams WHERE name LIKE :prefix)
+        """), params)
+        session.execute(text("DELETE FROM public.teams WHERE name LIKE :prefix"), params)
+        session.execute(text("DELETE FROM public.leagues WHERE name LIKE :prefix"), params)
+
+
+def _reset_caches(database):
+    # Every size starts cold, like a fresh process against an empty day
+    from resolver import EntityResolver
+    database._resolver = EntityResolver()
+    database._fingerprint_cache.clear()
+
+
+def bench_size(database, counter: StatementCounter, size: int, cycles: int) -> dict:
+    _reset_caches(database)
+    rng = random.Random(size)
+    matches = synthetic_cycle(size)
+
+    seconds, statements, stats = _cycle(database, counter, matches, skip_unchanged=True)
+    result = {"first": {"ms": seconds * 1000, "statements": statements, "written": stats["inserted"]}}
+
+    live, full = [], []
+    for _ in range(cycles):
+        matches = _advance(matches, LIVE_FRACTION, rng)
+        seconds, statements, stats = _cycle(database, counter, matches, skip_unchanged=True)
+        live.append((seconds, statements, stats["updated"] + stats["inserted"]))
+    for _ in range(cycles):
+        seconds, statements, stats = _cycle(database, counter, matches, skip_unchanged=False)
+        full.append((seconds, statements, stats["updated"] + stats["inserted"]))
+
+    for name, samples in (("live", live), ("full", full)):
+        result[name] = {
+            "ms": median(s for s, _, _ in samples) * 1000,
+            "statements": median(n for _, n, _ in samples),
+            "written": median(w for _, _, w in samples),
+        }
+    return result
+
+
+def run(sizes=SIZES, cycles: int = 10) -> dict[int, dict]:
+    import database
+
+    counter = StatementCounter(database.get_engine())
+    results = {}
+    try:
+        _cleanup(database)
+        for size in sizes:
+            results[size] = bench_size(database, counter, size, cycles)
+            _cleanup(database)
+    finally:
+        database.dispose_engine()
+    return results
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+
+    parser = argparse.ArgumentParser(prog="python -m bench upsert", description="⚽ upsert_matches per cycle size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="عدد المباريات في الدورة")
+    parser.add_argument("--cycles", type=int, default=10, help="دورات live و full لكل حجم")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.cycles)
+
+    print(f"{'matches':>7} {'cycle':<6} {'ms':>9} {'statements':>11} {'rows written':>13} {'ms/row':>8}")
+    for size, cases in results.items():
+        for name, r in cases.items():
+            per_row = r["ms"] / r["written"] if r["written"] else 0.0
+            print(f"{size:>7} {name:<6} {r['ms']:>9.1f} {r['statements']:>11.0f} {r['written']:>13.0f} {per_row:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+coordination.py — تنسيق أكثر من نسخة سكرابر على نفس الـ DB
+تشغيلين متداخلين (cron كل 5 دقائق مع حلقة 280 ثانية) كانوا يكتبون كل مباراة مرتين.
+الـ leases في جدول public.scraper_leases (migration 010) — صف بوقت انتهاء، ساعة الـ DB هي المرجع:
+  - all:    بدون تنسيق (الافتراضي — نسخة وحدة)
+  - leader: نسخة وحدة بس تشتغل (صاحبة lease "leader")، الباقي ينتظر ويستلم لو وقفت
+  - shard:  كل نسخة تجدد lease "member:<id>"، والدوريات تتوزع على الأعضاء الأحياء
+            بـ consistent hashing — نسخة تطيح = دورياتها بس تنتقل للباقين
+
+ما نستخدم advisory locks على مستوى الـ session: الـ pooler في Supabase (transaction mode)
+يبدّل الاتصال بين الـ transactions. إنشاء الفرق/الدوريات الجديدة يتسلسل بـ
+pg_advisory_xact_lock داخل الـ transaction (resolver.py) — ما يتكرر نفس الفريق.
+
+الاستخدام:
+  python scraper.py --daemon --coordination leader
+  python scraper.py --daemon --coordination shard --instance-id vps-1
+عدة عمليات على Postgres الاختبار (قائد واحد + إعادة توزيع): tests/test_coordination.py
+الإنتاجية مع عدد النسخ: python -m bench instances
+"""
+
+import os
+import time
+import bisect
+import socket
+import hashlib
+import logging
+from functools import lru_cache
+
+from sqlalchemy import text
+
+from database import session_scope
+from normalize import normalize_name
+from parsing import ScrapedMatch
+
+logger = logging.getLogger(__name__)
+
+MODES = ("all", "leader", "shard")
+LEASE_TTL_SECONDS = 30
+RENEW_EVERY_SECONDS = 10   # a lease survives one missed renewal
+VNODES = 64                # points per instance on the hash ring
+LEADER_LEASE = "leader"
+MEMBER_PREFIX = "member:"
+
+# Take the lease if it's ours or expired; RETURNING says whether we hold it now
+_ACQUIRE = text("""
+    INSERT INTO public.scraper_leases AS l (name, holder, expires_at)
+    VALUES (:name, :holder, now() + make_interval(secs => :ttl))
+    ON CONFLICT (name) DO UPDATE
+    SET holder = excluded.holder,
+        expires_at = excluded.expires_at,
+        renewed_at = now(),
+        acquired_at = CASE WHEN l.holder = excluded.holder THEN l.acquired_at ELSE now() END
+    WHERE l.holder = excluded.holder OR l.expires_at < now()
+    RETURNING holder
+""")
+_HOLDER = text("SELECT holder FROM public.scraper_leases WHERE name = :name AND expires_at >= now()")
+_MEMBERS = text("""
+    SELECT holder FROM public.scraper_leases
+    WHERE name LIKE 'member:%' AND expires_at >= now()
+    ORDER BY holder
+""")
+_RELEASE = text("DELETE FROM public.scraper_leases WHERE holder = :holder")
+
+
+def default_instance_id() -> str:
+    run = os.environ.get("GITHUB_RUN_ID")
+    return f"gh-{run}" if run else f"{socket.gethostname()}-{os.getpid()}"
+
+
+# ──────────────────────────────────────────────
+# Consistent hashing
+# ──────────────────────────────────────────────
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+@lru_cache(maxsize=4096)
+def league_key(league_name: str) -> int:
+    """نفس الدوري بكتابات مختلفة (همزة، تشكيل) = نفس المكان على الحلقة."""
+    return _hash(normalize_name(league_name))
+
+
+class HashRing:
+    """VNODES نقطة لكل نسخة — المفتاح يروح لأول نقطة بعده (مع عقارب الساعة)."""
+
+    def __init__(self, members, vnodes: int = VNODES):
+        self.members = tuple(sorted(set(members)))
+        points = sorted((_hash(f"{member}#{i}"), member) for member in self.members for i in range(vnodes))
+        self._points = [point for point, _ in points]
+        self._owners = [member for _, member in points]
+
+    def owner(self, key: int) -> str | None:
+        if not self._points:
+            return None
+        return self._owners[bisect.bisect(self._points, key) % len(self._points)]
+
+
+# ──────────────────────────────────────────────
+# Coordinator
+# ──────────────────────────────────────────────
+
+class Coordinator:
+    """
+    refresh() كل دورة (يجدد الـ lease كل renew_every فقط)، active() هل نشتغل هالدورة،
+    cap_sleep() حد الانتظار بين الدورات، select(matches) مباريات الدوريات اللي علينا،
+    release() عند الإيقاف (استلام فوري بدل انتظار الـ TTL).
+    clock: monotonic — صلاحية الـ lease محلياً تنتهي قبل ما تنتهي في الـ DB.
+    epoch: يزيد لما شغلنا ممكن يكون انكتب من نسخة ثانية (استلام القيادة، إعادة توزيع،
+    أو lease انتهى ورجع) — الحالة المبنية من كتاباتنا بس (جدول الترتيب) لازم تتحمّل من جديد.
+    """
+
+    def __init__(
+        self,
+        mode: str = "all",
+        instance_id: str | None = None,
+        ttl: float = LEASE_TTL_SECONDS,
+        renew_every: float = RENEW_EVERY_SECONDS,
+        clock=time.monotonic,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"coordination mode: {mode!r} (المتاح: {', '.join(MODES)})")
+        self.mode = mode
+        self.instance_id = instance_id or default_instance_id()
+        self.ttl = ttl
+        self.renew_every = renew_every
+        self.clock = clock
+        self.leader = False
+        self.holder: str | None = None
+        self.ring = HashRing([self.instance_id])
+        self.stats = {"renewals": 0, "failures": 0, "takeovers": 0, "rebalances": 0}
+        self.epoch = 0
+        self._renewed_at: float | None = None
+
+    def _valid(self) -> bool:
+        # The DB expiry is at least ttl after our last renewal started; stop well before it
+        return self._renewed_at is not None and self.clock() - self._renewed_at < self.ttl - self.renew_every
+
+    def refresh(self, force: bool = False):
+        if self.mode == "all":
+            return
+        started = self.clock()
+        if not force and self._renewed_at is not None and started - self._renewed_at < self.renew_every:
+            return
+
+        lease = LEADER_LEASE if self.mode == "leader" else MEMBER_PREFIX + self.instance_id
+        params = {"name": lease, "holder": self.instance_id, "ttl": self.ttl}
+        try:
+            with session_scope() as session:
+                held = session.execute(_ACQUIRE, params).fetchone() is not None
+                if self.mode == "leader":
+                    holder = self.instance_id if held else session.execute(_HOLDER, params).scalar()
+                else:
+                    members = [row[0] for row in session.execute(_MEMBERS)]
+        except Exception as e:
+            self.stats["failures"] += 1
+            logger.warning(f"⚠️ تعذّر تجديد الـ lease ({lease}): {e}")
+            return
+
+        # Our lease ran out locally: someone may have worked (and written) in our place meanwhile
+        lapsed = self._renewed_at is not None and not self._valid()
+        self._renewed_at = started
+        self.stats["renewals"] += 1
+        if lapsed:
+            self.epoch += 1
+        if self.mode == "leader":
+            if held and not self.leader:
+                self.stats["takeovers"] += 1
+                self.epoch += 1
+                logger.info(f"👑 {self.instance_id}: القائد الحين")
+            elif not held and (self.leader or holder != self.holder):
+                logger.info(f"⏸️ {self.instance_id}: نسخة احتياطية — القائد {holder or '?'}")
+            self.leader, self.holder = held, holder
+        elif tuple(members) != self.ring.members:
+            self.ring = HashRing(members)
+            self.stats["rebalances"] += 1
+            self.epoch += 1
+            logger.info(f"🧩 توزيع الدوريات على {len(members)} نسخة: {', '.join(members)}")
+
+    def active(self) -> bool:
+        """نشتغل هالدورة؟ leader: القائد فقط. shard: لو الـ lease لسه صالح. all: دائماً."""
+        if self.mode == "all":
+            return True
+        if not self._valid():
+            return False
+        return self.leader if self.mode == "leader" else True
+
+    def cap_sleep(self, seconds: float) -> float:
+        """
+        الانتظار بين الدورات بحد أقصى renew_every (leader/shard): الـ lease يتجدد في refresh() بس،
+        ونسخة نايمة 300s وهي فاضية كان الـ lease حقها ينتهي وتنتقل القيادة (أو الدوريات) وهي نايمة.
+        """
+        return seconds if self.mode == "all" else min(seconds, self.renew_every)
+
+    def owns(self, league_name: str) -> bool:
+        return self.mode != "shard" or self.ring.owner(league_key(league_name)) == self.instance_id
+
+    def select(self, matches: list[ScrapedMatch]) -> list[ScrapedMatch]:
+        """مباريات الدوريات اللي على هالنسخة (shard)، أو الكل."""
+        if self.mode != "shard":
+            return matches
+        return [m for m in matches if self.owns(m.league_name)]
+
+    def release(self):
+        if self.mode == "all" or self._renewed_at is None:
+            return
+        try:
+            with session_scope() as session:
+                session.execute(_RELEASE, {"holder": self.instance_id})
+        except Exception as e:
+            logger.warning(f"⚠️ تعذّر تحرير الـ lease: {e}")
+        self._renewed_at = None
+        self.leader = False
@@ -4,21 +4,30 @@ database.py — طبقة قاعدة البيانات لسكرابر Kora
 """
 
 import os
+import time
 import logging
-from datetime import datetime, timezone
+from contextlib import contextmanager
+from datetime import datetime, timezone, timedelta
 
 from sqlalchemy import (
     create_engine,
     Column,
     Integer,
     Boolean,
+    Date,
     DateTime,
+    Computed,
     Text,
     text,
+    event,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import declarative_base, sessionmaker, Session
 
+import metrics
+from parsing import ScrapedMatch
+from resolver import EntityResolver
+
 logger = logging.getLogger(__name__)
 
 Base = declarative_base()
@@ -33,7 +42,7 @@ class League(Base):
     __tablename__ = "leagues"
     __table_args__ = {"schema": "public"}
 
-    id = Column(UUID(as_uuid=True), primary_key=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("uuid_generate_v4()"))
     name = Column(Text, nullable=False)
     logo_url = Column(Text, default="")
     country = Column(Text, nullable=False)
@@ -46,7 +55,7 @@ class Team(Base):
     __tablename__ = "teams"
     __table_args__ = {"schema": "public"}
 
-    id = Column(UUID(as_uuid=True), primary_key=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("uuid_generate_v4()"))
     league_id = Column(UUID(as_uuid=True))
     name = Column(Text, nullable=False)
     short_name = Column(Text)
@@ -63,6 +72,8 @@ class Match(Base):
     home_team_id = Column(UUID(as_uuid=True))
     away_team_id = Column(UUID(as_uuid=True))
     start_time = Column(DateTime(timezone=True), nullable=False)
+    # Natural key part (migration 008): UNIQUE (home_team_id, away_team_id, match_date)
+    match_date = Column(Date, Computed("(start_time AT TIME ZONE 'UTC')::date", persisted=True))
     status = Column(Text, default="upcoming")
     home_score = Column(Integer, default=0)
     away_score = Column(Integer, default=0)
@@ -85,6 +96,7 @@ class MatchEvent(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("uuid_generate_v4()"))
     match_id = Column(UUID(as_uuid=True))
     minute = Column(Integer, nullable=False)
+    stoppage = Column(Integer, nullable=False, default=0)  # 45+2 → minute 47, stoppage 2 (migration 011)
     event_type = Column(Text, nullable=False)
     player_name = Column(Text, nullable=False)
     team_id = Column(UUID(as_uuid=True))
@@ -97,8 +109,8 @@ class MatchEvent(Base):
 # ──────────────────────────────────────────────
 
 
-def get_engine():
-    """Create SQLAlchemy engine from DATABASE_URL env var."""
+def _resolve_database_url() -> str:
+    """Read DATABASE_URL and fix common connection-string mistakes."""
     database_url = os.environ.get("DATABASE_URL")
     if not database_url:
         raise ValueError(
@@ -138,79 +150,176 @@ def get_engine():
     except Exception as e:
         logger.warning(f"⚠️ فشل التصحيح التلقائي للرابط: {e}")
 
-    # Create engine
-    return create_engine(database_url, pool_pre_ping=True, echo=False)
+    return database_url
+
+
+# Pool policy — overridable via env vars (see .env.example)
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        logger.warning(f"⚠️ قيمة غير صالحة لـ {name} — استخدام {default}")
+        return default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() not in ("0", "false", "no", "off")
+
+
+_engine = None
+_SessionLocal = None
+
+# Pool counters — a full run should show connects == 1
+_pool_stats = {
+    "connects": 0,
+    "checkouts": 0,
+    "checkout_wait_seconds": 0.0,
+}
+
+
+def get_engine():
+    """
+    SQLAlchemy engine مشترك للعملية كاملة (يُنشأ مرة واحدة عند أول طلب).
+    الـ pool يحتفظ بالاتصال بين الدورات بدل handshake جديد (TCP+TLS+auth) كل 30 ثانية.
+    """
+    global _engine, _SessionLocal
+    if _engine is not None:
+        return _engine
+
+    engine = create_engine(
+        _resolve_database_url(),
+        pool_size=_env_int("DB_POOL_SIZE", 2),
+        max_overflow=_env_int("DB_MAX_OVERFLOW", 1),
+        pool_recycle=_env_int("DB_POOL_RECYCLE_SECONDS", 1800),
+        pool_pre_ping=_env_bool("DB_POOL_PRE_PING", True),
+        echo=False,
+    )
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        _pool_stats["connects"] += 1
+        logger.info(f"🔌 اتصال جديد بقاعدة البيانات (#{_pool_stats['connects']})")
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        _pool_stats["checkouts"] += 1
+
+    _engine = engine
+    _SessionLocal = sessionmaker(bind=engine)
+    return _engine
 
 
 def get_session() -> Session:
-    """Create a new database session."""
-    engine = get_engine()
-    SessionLocal = sessionmaker(bind=engine)
-    return SessionLocal()
+    """جلسة جديدة فوق الـ engine المشترك (الاتصال يُستعار من الـ pool)."""
+    get_engine()
+    return _SessionLocal()
+
+
+@contextmanager
+def session_scope():
+    """
+    جلسة للدورة الواحدة: commit عند النجاح، rollback عند الخطأ، وإرجاع الاتصال للـ pool.
+
+    الاستخدام:
+        with session_scope() as session:
+            upsert_matches(session, matches)
+    """
+    session = get_session()
+    try:
+        started = time.perf_counter()
+        session.connection()  # check out now so the pool wait is measured here
+        waited = time.perf_counter() - started
+        _pool_stats["checkout_wait_seconds"] += waited
+        metrics.observe("db_checkout", waited)
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def get_pool_stats() -> dict:
+    """نسخة من عدّادات الـ pool (connects, checkouts, checkout_wait_seconds)."""
+    return dict(_pool_stats)
+
+
+def dispose_engine():
+    """إغلاق كل اتصالات الـ pool (عند نهاية التشغيل)."""
+    global _engine, _SessionLocal
+    if _engine is not None:
+        _engine.dispose()
+    _engine = None
+    _SessionLocal = None
 
 
 # ──────────────────────────────────────────────
 # Team & League Lookup (Get or Create)
 # ──────────────────────────────────────────────
 
-_team_cache: dict[str, str] = {}    # name -> uuid
-_league_cache: dict[str, str] = {}  # name -> uuid
+# In-memory index of every team/league, loaded once per process (see resolver.py)
+_resolver = EntityResolver()
 
 
 def get_or_create_league(session: Session, league_name: str) -> str | None:
     """البحث عن الدوري أو إنشاؤه إذا لم يكن موجوداً."""
     if not league_name:
         return None
+    return _resolver.resolve_leagues(session, [league_name]).get(league_name)
 
-    if league_name in _league_cache:
-        return _league_cache[league_name]
 
-    # بحث مطابق تمامًا
-    league = session.query(League).filter(League.name == league_name).first()
+def get_or_create_team(session: Session, team_name: str, logo_url: str = "", league_id: str = None) -> str:
+    """
+    البحث عن الفريق بالاسم العربي أو إنشاؤه.
+    """
+    return _resolver.resolve_teams(session, {team_name: (logo_url, league_id)}).get(team_name)
 
-    # بحث جزئي (ILIKE)
-    if not league:
-        league = session.query(League).filter(League.name.ilike(f"%{league_name}%")).first()
 
-    # Create if not found
-    if not league:
-        logger.info(f"🆕 إنشاء دوري جديد: {league_name}")
-        league = League(name=league_name, country="Unknown")
-        session.add(league)
-        session.flush()  # To get ID
+def get_resolver_stats() -> dict:
+    """إحصائيات ربط الأسماء: lookups, hits, hit_rate, created, queries, round_trips_saved."""
+    stats = dict(_resolver.stats)
+    stats["hit_rate"] = _resolver.hit_rate()
+    return stats
 
-    _league_cache[league_name] = str(league.id)
-    return str(league.id)
 
+# ──────────────────────────────────────────────
+# Change Detection
+# ──────────────────────────────────────────────
 
-def get_or_create_team(session: Session, team_name: str, logo_url: str = "", league_id: str = None) -> str:
+# Natural key of the row -> ScrapedMatch.fingerprint
+# (home_team_id, away_team_id, UTC date) -> (status, home_score, away_score, minute)
+# Keyed on resolved IDs, not scraped names: "الاهلى" and "الأهلي" are the same
+# row, and the seed from the DB (stored names) must hit for either spelling.
+# Only matches whose fingerprint changed are written, so unchanged rows don't
+# bump updated_at or fire Supabase Realtime events.
+_fingerprint_cache: dict[tuple, tuple] = {}
+
+
+def seed_fingerprint_cache(session: Session, days_back: int = 1) -> int:
     """
-    البحث عن الفريق بالاسم العربي أو إنشاؤه.
+    تعبئة كاش البصمات من الـ DB عند بداية التشغيل (مباريات اليوم وما قبله بـ days_back).
+    Returns: عدد المباريات المحمّلة
     """
-    if team_name in _team_cache:
-        # Update logo if needed (optional optimization)
-        return _team_cache[team_name]
-
-    # بحث مطابق تمامًا
-    team = session.query(Team).filter(Team.name == team_name).first()
+    since = datetime.now(timezone.utc).date() - timedelta(days=days_back)
+    rows = session.execute(
+        text("""
+            SELECT m.home_team_id, m.away_team_id, m.match_date,
+                   m.status, m.home_score, m.away_score, m.minute
+            FROM public.matches m
+            WHERE m.match_date >= :since
+        """),
+        {"since": since},
+    ).fetchall()
 
-    # بحث جزئي
-    if not team:
-        team = session.query(Team).filter(Team.name.ilike(f"%{team_name}%")).first()
-    
-    # Create if not found
-    if not team:
-        logger.info(f"🆕 إنشاء فريق جديد: {team_name}")
-        team = Team(
-            name=team_name,
-            logo_url=logo_url,
-            league_id=league_id
-        )
-        session.add(team)
-        session.flush()
+    for home, away, match_date, status, home_score, away_score, minute in rows:
+        _fingerprint_cache[(str(home), str(away), match_date)] = (status, home_score, away_score, minute)
 
-    _team_cache[team_name] = str(team.id)
-    return str(team.id)
+    logger.info(f"🧠 تم تحميل {len(rows)} بصمة مباراة من الـ DB")
+    return len(rows)
 
 
 # ──────────────────────────────────────────────
@@ -218,11 +327,84 @@ def get_or_create_team(session: Session, team_name: str, logo_url: str = "", lea
 # ──────────────────────────────────────────────
 
 
-def upsert_match(session: Session, match_data: dict) -> bool:
+# Columns written by the batched upsert, in VALUES order
+_MATCH_COLUMNS = (
+    "league_id", "home_team_id", "away_team_id", "start_time",
+    "status", "home_score", "away_score", "minute",
+    "channel", "round", "updated_at",
+)
+
+# Rows per INSERT statement — the whole cycle still shares one transaction
+UPSERT_BATCH_SIZE = 500
+
+
+def _utc_date(value):
+    """تاريخ المباراة بتوقيت UTC — نفس قيمة العمود المحسوب matches.match_date."""
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value.date()
+    return value
+
+
+def _build_match_row(match: ScrapedMatch, league_ids: dict, team_ids: dict, now: datetime) -> dict | None:
+    """
+    تجهيز صف المباراة للـ upsert من الـ IDs المحلولة مسبقاً.
+    Returns: dict بأعمدة _MATCH_COLUMNS، أو None لو الفريق غير موجود.
+    """
+    league_id = league_ids.get(match.league_name)
+    home_id = team_ids.get(match.home_team_name)
+    away_id = team_ids.get(match.away_team_name)
+
+    if not home_id or not away_id:
+        # Should not happen with create logic, but safety check
+        return None
+
+    return {
+        "league_id": league_id,
+        "home_team_id": home_id,
+        "away_team_id": away_id,
+        "start_time": match.start_time,
+        "status": match.status,
+        "home_score": match.home_score,
+        "away_score": match.away_score,
+        "minute": match.minute,
+        "channel": match.channel,
+        "round": match.round,
+        "updated_at": now,
+    }
+
+
+def _upsert_statement(row_count: int):
+    """
+    INSERT متعدد الصفوف مع ON CONFLICT على المفتاح الطبيعي (migration 008).
+    التحديث يغيّر الحالة والنتيجة والدقيقة فقط — start_time الأصلي يبقى كما هو.
     """
-    إدراج أو تحديث مباراة باستخدام Upsert.
+    values = ",\n".join(
+        "(" + ", ".join(f":{col}_{i}" for col in _MATCH_COLUMNS) + ")"
+        for i in range(row_count)
+    )
+    return text(f"""
+        INSERT INTO public.matches
+            ({", ".join(_MATCH_COLUMNS)})
+        VALUES
+            {values}
+        ON CONFLICT (home_team_id, away_team_id, match_date)
+        DO UPDATE SET
+            status = EXCLUDED.status,
+            home_score = EXCLUDED.home_score,
+            away_score = EXCLUDED.away_score,
+            minute = EXCLUDED.minute,
+            updated_at = EXCLUDED.updated_at
+        RETURNING home_team_id, away_team_id, (xmax = 0) AS inserted
+    """)
+
+
+def upsert_match(session: Session, match_data: ScrapedMatch | dict) -> bool:
+    """
+    إدراج أو تحديث مباراة واحدة (غلاف حول upsert_matches).
     
-    match_data يجب أن يحتوي على:
+    match_data: ScrapedMatch، أو dict (الشكل القديم — ScrapedMatch.to_dict()) يحتوي على:
       - home_team_name: اسم الفريق المضيف
       - away_team_name: اسم الفريق الضيف
       - league_name: اسم الدوري
@@ -236,122 +418,322 @@ def upsert_match(session: Session, match_data: dict) -> bool:
     
     Returns: True if upserted, False if skipped (team not found)
     """
-    league_id = get_or_create_league(session, match_data.get("league_name", ""))
+    if isinstance(match_data, dict):
+        match_data = ScrapedMatch(**{"start_time": datetime.now(timezone.utc), **match_data})
+    return upsert_matches(session, [match_data])["skipped"] == 0
 
-    home_id = get_or_create_team(
-        session, 
-        match_data["home_team_name"], 
-        match_data.get("home_team_logo", ""),
-        league_id
-    )
-    away_id = get_or_create_team(
-        session, 
-        match_data["away_team_name"], 
-        match_data.get("away_team_logo", ""),
-        league_id
-    )
 
-    if not home_id or not away_id:
-        # Should not happen with create logic, but safety check
-        return False
+def upsert_matches(session: Session, matches: list[ScrapedMatch], skip_unchanged: bool = True) -> dict:
+    """
+    Upsert قائمة مباريات في transaction واحدة.
 
-    # Check if match already exists (same teams, same date)
-    start_date = match_data["start_time"].date() if isinstance(match_data["start_time"], datetime) else match_data["start_time"]
-    
-    existing = session.execute(
-        text("""
-            SELECT id FROM public.matches
-            WHERE home_team_id = :home_id
-            AND away_team_id = :away_id
-            AND start_time::date = :match_date
-            LIMIT 1
-        """),
-        {
-            "home_id": home_id,
-            "away_id": away_id,
-            "match_date": str(start_date),
-        },
-    ).fetchone()
+    1. ربط كل الدوريات والفرق دفعة وحدة (من الذاكرة + INSERT واحد للناقص)
+       ثم تخطي المباريات اللي بصمتها ما تغيّرت (skip_unchanged — الكاش بالـ IDs)
+    2. INSERT ... ON CONFLICT DO UPDATE متعدد الصفوف للدورة كاملة
+    3. commit واحد
 
+    Returns: {"updated": N, "inserted": N, "unchanged": N, "skipped": N,
+              "rows": الصفوف اللي انكتبت (لحساب جدول الترتيب — standings.py),
+              "error": رسالة الخطأ لو الكتابة فشلت (ما انكتب شي — spool.py يعيد المحاولة)}
+    """
+    stats = {"updated": 0, "inserted": 0, "unchanged": 0, "skipped": 0, "rows": []}
     now = datetime.now(timezone.utc)
 
-    if existing:
-        # UPDATE existing match
-        session.execute(
-            text("""
-                UPDATE public.matches
-                SET status = :status,
-                    home_score = :home_score,
-                    away_score = :away_score,
-                    minute = :minute,
-                    updated_at = :updated_at
-                WHERE id = :match_id
-            """),
-            {
-                "match_id": str(existing[0]),
-                "status": match_data.get("status", "upcoming"),
-                "home_score": match_data.get("home_score", 0),
-                "away_score": match_data.get("away_score", 0),
-                "minute": match_data.get("minute", 0),
-                "updated_at": now,
-            },
+    # ── 1. Resolve teams & leagues (whole cycle at once), then change detection ──
+    try:
+        with metrics.timer("resolution"):
+            league_ids = _resolver.resolve_leagues(session, [m.league_name for m in matches])
+            teams: dict[str, tuple] = {}  # name -> (logo, league_id), first card wins
+            for match in matches:
+                league_id = league_ids.get(match.league_name)
+                teams.setdefault(match.home_team_name, (match.home_team_logo, league_id))
+                teams.setdefault(match.away_team_name, (match.away_team_logo, league_id))
+            team_ids = _resolver.resolve_teams(session, teams)
+    except Exception as e:
+        logger.error(f"❌ خطأ في ربط الفرق: {e}")
+        session.rollback()
+        _resolver.rollback()
+        stats["skipped"] += len(matches)
+        stats["error"] = str(e)
+        return stats
+
+    rows: dict[tuple, dict] = {}  # natural key -> row (last one wins)
+    names: dict[tuple, ScrapedMatch] = {}  # (home_id, away_id) -> match (for logging)
+    written: dict[tuple, ScrapedMatch] = {}  # natural key -> match actually sent
+    for match in matches:
+        row = _build_match_row(match, league_ids, team_ids, now)
+        if row is None:
+            stats["skipped"] += 1
+            continue
+
+        key = (row["home_team_id"], row["away_team_id"], _utc_date(row["start_time"]))
+        if skip_unchanged and _fingerprint_cache.get(key) == match.fingerprint:
+            stats["unchanged"] += 1
+            continue
+        if key in rows:
+            # ON CONFLICT can't touch the same row twice in one statement
+            stats["skipped"] += 1
+        rows[key] = row
+        names[(row["home_team_id"], row["away_team_id"])] = match
+        written[key] = match
+
+    # ── 2. One multi-row upsert per batch, single transaction ──
+    batch_rows = list(rows.values())
+    try:
+        for offset in range(0, len(batch_rows), UPSERT_BATCH_SIZE):
+            chunk = batch_rows[offset:offset + UPSERT_BATCH_SIZE]
+            params = {
+                f"{col}_{i}": row[col]
+                for i, row in enumerate(chunk)
+                for col in _MATCH_COLUMNS
+            }
+            with metrics.timer("db_write"):
+                result = session.execute(_upsert_statement(len(chunk)), params)
+
+            for home_id, away_id, inserted in result:
+                m = names.get((str(home_id), str(away_id)))
+                if m is None:
+                    stats["inserted" if inserted else "updated"] += 1
+                elif inserted:
+                    stats["inserted"] += 1
+                    logger.info(f"✅ إضافة: {m.home_team_name} vs {m.away_team_name}")
+                else:
+                    stats["updated"] += 1
+                    logger.info(
+                        f"🔄 تحديث: {m.home_team_name} {m.home_score}"
+                        f"-{m.away_score} {m.away_team_name} (د{m.minute})"
+                    )
+
+        with metrics.timer("db_write"):
+            session.commit()
+        _resolver.commit()
+        metrics.count("rows_written", len(batch_rows))
+
+        # Remember what the DB now holds (only after a successful commit)
+        for key, match in written.items():
+            _fingerprint_cache[key] = match.fingerprint
+        stats["rows"] = batch_rows
+    except Exception as e:
+        logger.error(f"❌ خطأ في upsert: {e}")
+        session.rollback()
+        # Teams/leagues created in this transaction were rolled back too
+        _resolver.rollback()
+        stats["skipped"] += len(batch_rows)
+        stats["updated"] = stats["inserted"] = 0
+        stats["error"] = str(e)
+
+    return stats
+
+
+# ──────────────────────────────────────────────
+# Match Details (venue / referee / commentator / channel)
+# ──────────────────────────────────────────────
+
+_DETAIL_COLUMNS = ("venue", "referee", "commentator", "channel")
+
+
+def _team_logos(matches) -> dict[str, tuple]:
+    """{team name: (logo, None)} لـ resolve_teams — الفرق موجودة غالباً من upsert_matches."""
+    teams: dict[str, tuple] = {}
+    for match in matches:
+        teams.setdefault(match.home_team_name, (match.home_team_logo, None))
+        teams.setdefault(match.away_team_name, (match.away_team_logo, None))
+    return teams
+
+
+def update_match_details(session: Session, details: list[tuple[ScrapedMatch, dict]]) -> int:
+    """
+    تحديث تفاصيل المباريات (من details.DetailFetcher) بـ UPDATE واحد.
+    الحقول الفاضية ما تمسح القيم الموجودة، والصف ما يتحدّث إلا لو تغيّر فعلاً
+    (عشان ما نطلق أحداث Realtime بدون داعي).
+
+    Returns: عدد المباريات اللي تحدّثت
+    """
+    if not details:
+        return 0
+
+    try:
+        team_ids = _resolver.resolve_teams(session, _team_logos(match for match, _ in details))
+
+        params = {}
+        values = []
+        for i, (match, info) in enumerate(details):
+            home_id = team_ids.get(match.home_team_name)
+            away_id = team_ids.get(match.away_team_name)
+            if not home_id or not away_id:
+                continue
+            params.update({
+                f"home_{i}": home_id,
+                f"away_{i}": away_id,
+                f"date_{i}": match.key[2],
+                **{f"{col}_{i}": info.get(col, "") for col in _DETAIL_COLUMNS},
+            })
+            values.append(
+                f"(CAST(:home_{i} AS uuid), CAST(:away_{i} AS uuid), CAST(:date_{i} AS date), "
+                + ", ".join(f":{col}_{i}" for col in _DETAIL_COLUMNS) + ")"
+            )
+
+        if not values:
+            return 0
+
+        assignments = ",\n".join(
+            f"{col} = COALESCE(NULLIF(v.{col}, ''), m.{col})" for col in _DETAIL_COLUMNS
         )
-        logger.info(
-            f"🔄 تحديث: {match_data['home_team_name']} {match_data.get('home_score', 0)}"
-            f"-{match_data.get('away_score', 0)} {match_data['away_team_name']} "
-            f"(د{match_data.get('minute', 0)})"
+        changed = " OR ".join(
+            f"COALESCE(NULLIF(v.{col}, ''), m.{col}) IS DISTINCT FROM m.{col}" for col in _DETAIL_COLUMNS
         )
-    else:
-        # INSERT new match
-        session.execute(
-            text("""
-                INSERT INTO public.matches
-                    (league_id, home_team_id, away_team_id, start_time,
-                     status, home_score, away_score, minute,
-                     channel, round, updated_at)
-                VALUES
-                    (:league_id, :home_id, :away_id, :start_time,
-                     :status, :home_score, :away_score, :minute,
-                     :channel, :round, :updated_at)
+        result = session.execute(
+            text(f"""
+                UPDATE public.matches m
+                SET {assignments},
+                    updated_at = now()
+                FROM (VALUES {", ".join(values)})
+                    AS v(home_team_id, away_team_id, match_date, {", ".join(_DETAIL_COLUMNS)})
+                WHERE m.home_team_id = v.home_team_id
+                  AND m.away_team_id = v.away_team_id
+                  AND m.match_date = v.match_date
+                  AND ({changed})
             """),
-            {
-                "league_id": league_id,
-                "home_id": home_id,
-                "away_id": away_id,
-                "start_time": match_data.get("start_time", now),
-                "status": match_data.get("status", "upcoming"),
-                "home_score": match_data.get("home_score", 0),
-                "away_score": match_data.get("away_score", 0),
-                "minute": match_data.get("minute", 0),
-                "channel": match_data.get("channel", ""),
-                "round": match_data.get("round", ""),
-                "updated_at": now,
-            },
-        )
-        logger.info(
-            f"✅ إضافة: {match_data['home_team_name']} vs {match_data['away_team_name']}"
+            params,
         )
+        session.commit()
+        _resolver.commit()
+        return result.rowcount
+    except Exception as e:
+        logger.error(f"❌ خطأ في تحديث تفاصيل المباريات: {e}")
+        session.rollback()
+        _resolver.rollback()
+        return 0
+
+
+# ──────────────────────────────────────────────
+# Match Events (goals / cards / substitutions)
+# ──────────────────────────────────────────────
+
+# ScrapedMatch.key -> {event_key(event)} already in the DB.
+# Live pages are polled every few seconds and list every event so far;
+# this keeps each cycle's INSERT down to the genuinely new ones.
+_seen_events: dict[tuple, set[tuple]] = {}
 
-    session.commit()
-    return True
+_EVENT_COLUMNS = ("minute", "stoppage", "event_type", "player_name", "side", "description")
 
 
-def upsert_matches(session: Session, matches: list[dict]) -> dict:
+def event_key(event: dict) -> tuple:
     """
-    Upsert قائمة مباريات.
-    Returns: {"updated": N, "inserted": N, "skipped": N}
+    مفتاح الحدث داخل المباراة — نفس أعمدة uq_match_events_dedup (migration 011).
+    stoppage يفرّق 45+2 (47، 2) عن 47 في الشوط الثاني (47، 0).
     """
-    stats = {"updated": 0, "inserted": 0, "skipped": 0}
-
-    for match_data in matches:
-        try:
-            if upsert_match(session, match_data):
-                stats["updated"] += 1
-            else:
-                stats["skipped"] += 1
-        except Exception as e:
-            logger.error(f"❌ خطأ في upsert: {e}")
-            session.rollback()
-            stats["skipped"] += 1
+    return (
+        event["minute"], event.get("stoppage", 0), event["event_type"], " ".join(event["player_name"].split()),
+    )
+
+
+def _prune_seen_events(today):
+    for key in [key for key in _seen_events if key[2] < today - timedelta(days=1)]:
+        del _seen_events[key]
+
+
+def insert_match_events(session: Session, details: list[tuple[ScrapedMatch, dict]]) -> dict:
+    """
+    إدراج الأحداث الجديدة فقط (من details.DetailFetcher) بـ INSERT واحد.
+    الأحداث المكررة تُتجاهل مرتين: في الذاكرة (_seen_events) ثم ON CONFLICT DO NOTHING
+    في الـ DB — فكل حدث حقيقي يوصل للتطبيق عبر Realtime مرة وحدة بس.
+
+    Returns: {"inserted": N, "skipped": N (موجود في الـ DB أو المباراة ناقصة), "seen": N}
+    """
+    stats = {"inserted": 0, "skipped": 0, "seen": 0}
+    _prune_seen_events(datetime.now(timezone.utc).date())
+
+    pending: list[tuple[ScrapedMatch, dict]] = []  # (match, event)
+    for match, info in details:
+        key = match.key
+        seen = _seen_events.get(key, set())
+        batch_keys = set()
+        for event in info.get("events", []):
+            ekey = event_key(event)
+            if ekey in seen or ekey in batch_keys:
+                stats["seen"] += 1
+                continue
+            batch_keys.add(ekey)
+            pending.append((match, event))
+
+    if not pending:
+        return stats
+
+    try:
+        team_ids = _resolver.resolve_teams(session, _team_logos(match for match, _ in pending))
+
+        params = {}
+        values = []
+        for i, (match, event) in enumerate(pending):
+            home_id = team_ids.get(match.home_team_name)
+            away_id = team_ids.get(match.away_team_name)
+            if not home_id or not away_id:
+                continue
+            minute, stoppage, event_type, player_name = event_key(event)
+            params.update({
+                f"home_{i}": home_id,
+                f"away_{i}": away_id,
+                f"date_{i}": match.key[2],
+                f"minute_{i}": minute,
+                f"stoppage_{i}": stoppage,
+                f"event_type_{i}": event_type,
+                f"player_name_{i}": player_name,
+                f"side_{i}": event.get("side", ""),
+                f"description_{i}": event.get("description", ""),
+            })
+            values.append(
+                f"({i}, CAST(:home_{i} AS uuid), CAST(:away_{i} AS uuid), CAST(:date_{i} AS date), "
+                + ", ".join(f":{col}_{i}" for col in _EVENT_COLUMNS) + ")"
+            )
+
+        if not values:
+            return stats
+
+        # "joined" = events whose match row exists; the outer SELECT returns their
+        # positions in pending (inserted or hit the dedup conflict) and the insert count
+        result = session.execute(
+            text(f"""
+                WITH joined AS (
+                    SELECT v.idx, m.id AS match_id, v.minute, v.stoppage, v.event_type, v.player_name,
+                           CASE v.side
+                               WHEN 'home' THEN m.home_team_id
+                               WHEN 'away' THEN m.away_team_id
+                           END AS team_id,
+                           v.description
+                    FROM (VALUES {", ".join(values)})
+                        AS v(idx, home_team_id, away_team_id, match_date, {", ".join(_EVENT_COLUMNS)})
+                    JOIN public.matches m
+                      ON m.home_team_id = v.home_team_id
+                     AND m.away_team_id = v.away_team_id
+                     AND m.match_date = v.match_date
+                ), inserted AS (
+                    INSERT INTO public.match_events
+                        (match_id, minute, stoppage, event_type, player_name, team_id, description)
+                    SELECT match_id, minute, stoppage, event_type, player_name, team_id, description
+                    FROM joined
+                    ON CONFLICT (match_id, minute, stoppage, event_type, player_name) DO NOTHING
+                    RETURNING id
+                )
+                SELECT idx, (SELECT COUNT(*) FROM inserted) FROM joined
+            """),
+            params,
+        )
+        rows = result.fetchall()
+        stats["inserted"] = rows[0][1] if rows else 0
+        stats["skipped"] = len(values) - stats["inserted"]
+        session.commit()
+        _resolver.commit()
+
+        # Inserted or already there — either way the DB has them now. Events whose
+        # match row isn't written yet stay unseen and are tried again next cycle.
+        for idx, _ in rows:
+            match, event = pending[idx]
+            _seen_events.setdefault(match.key, set()).add(event_key(event))
+    except Exception as e:
+        logger.error(f"❌ خطأ في إدراج أحداث المباريات: {e}")
+        session.rollback()
+        _resolver.rollback()
+        stats["inserted"] = stats["skipped"] = 0
 
     return stats
@@ -0,0 +1,292 @@
+"""
+details.py — صفحات تفاصيل المباريات (الملعب، الحكم، المعلق، القناة، الأحداث)
+بعد جلب صفحة المباريات، نجلب صفحة كل مباراة مباشرة (والقادمة بأولوية أقل)
+بعدد محدود من الـ workers، وحد لكل host، وميزانية وقت لكل دورة
+عشان تحديث النتائج المباشرة ما يتأخر بسبب التفاصيل
+
+التشكيلات (match_lineups) خارج النطاق: ما عندنا صفحة محفوظة فيها تشكيلة نبني عليها
+selectors، والجدول ما له مفتاح طبيعي (player_number و position إجباريين) — تحتاج migration خاصة.
+"""
+
+import re
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urlsplit
+
+from lxml import html as lxml_html
+
+from http_fetcher import HttpFetcher, _compile, _text
+from parsing import ScrapedMatch, parse_status
+
+logger = logging.getLogger(__name__)
+
+
+# ──────────────────────────────────────────────
+# Detail Page Parsing
+# ──────────────────────────────────────────────
+
+# Dedicated elements on the match page, tried first
+DETAIL_SELECTORS = {
+    "venue": ".matchInfo .stadium, .match-info .stadium, .venue",
+    "referee": ".matchInfo .referee, .match-info .referee, .referee",
+    "commentator": ".matchInfo .commentator, .match-info .commentator, .commentator",
+    "channel": ".matchInfo .channel, .match-info .channel",
+}
+
+# Fallback: "الملعب: ستاد القاهرة" style label/value rows
+DETAIL_LABELS = {
+    "venue": ("الملعب", "الاستاد", "ستاد المباراة"),
+    "referee": ("الحكم", "حكم المباراة"),
+    "commentator": ("المعلق", "التعليق"),
+    "channel": ("القناة", "القنوات الناقلة", "القناة الناقلة"),
+}
+
+# Timeline rows (goals, cards, substitutions)
+EVENT_CONTAINER_SELECTOR = ".eventsTtl li, .matchEvents li, .events .event, .timeline .event"
+EVENT_FIELD_SELECTORS = {
+    "minute": ".min, .minute, .time",
+    "player": ".playerName, .player, .name",
+}
+
+# First match wins — own goals and penalties before plain goals, red before yellow.
+# Each entry: (event_type, class/icon word prefixes, Arabic text keywords)
+EVENT_TYPES = (
+    ("own_goal", ("own", "og"), ("هدف عكسي", "في مرماه")),
+    ("penalty", ("penalty",), ("ركلة جزاء", "ضربة جزاء")),
+    ("goal", ("goal", "ball"), ("هدف",)),
+    ("red_card", ("red",), ("بطاقة حمراء", "طرد")),
+    ("yellow_card", ("yellow",), ("بطاقة صفراء", "إنذار")),
+    ("substitution", ("sub", "change"), ("تبديل",)),
+    ("var", ("var",), ("فار", "VAR")),
+)
+
+_DETAIL_SEL = {name: _compile(sel) for name, sel in DETAIL_SELECTORS.items()}
+_EVENT_SEL = _compile(EVENT_CONTAINER_SELECTOR)
+_EVENT_FIELD_SEL = {name: _compile(sel) for name, sel in EVENT_FIELD_SELECTORS.items()}
+_WORD_SPLIT = re.compile(r"[^a-z0-9]+")
+_HOME_MARKERS = ("teama", "home", "right")  # Arabic layout: home side on the right
+_AWAY_MARKERS = ("teamb", "away", "left")
+_LABEL_ROWS = _compile("li, tr, p, .item, .info-row")
+_LABEL_PATTERNS = {
+    name: re.compile(r"^\s*(?:" + "|".join(map(re.escape, labels)) + r")\s*[:：]?\s*(.+)$")
+    for name, labels in DETAIL_LABELS.items()
+}
+
+
+def parse_match_details(page_html: str) -> dict:
+    """
+    تحليل صفحة تفاصيل المباراة.
+    Returns: {"venue", "referee", "commentator", "channel", "events"} — الحقل الناقص = ""
+    """
+    tree = lxml_html.fromstring(page_html)
+    details = {name: "" for name in DETAIL_SELECTORS}
+
+    for name, sel in _DETAIL_SEL.items():
+        found = sel(tree)
+        if found:
+            value = _text(found[0])
+            match = _LABEL_PATTERNS[name].match(value)
+            details[name] = match.group(1).strip() if match else value
+
+    missing = [name for name, value in details.items() if not value]
+    if missing:
+        for row in _LABEL_ROWS(tree):
+            row_text = _text(row)
+            for name in missing:
+                if details[name]:
+                    continue
+                match = _LABEL_PATTERNS[name].match(row_text)
+                if match:
+                    details[name] = match.group(1).strip()
+
+    details["events"] = parse_match_events(tree)
+    return details
+
+
+def _event_type(row, row_text: str) -> str | None:
+    # Icons carry the type in class/src/alt; fall back to the visible text
+    words = {
+        word
+        for el in row.iter()
+        if isinstance(el.tag, str)
+        for attr in ("class", "src", "alt")
+        for word in _WORD_SPLIT.split(el.get(attr, "").lower())
+        if word
+    }
+    for event_type, prefixes, text_keywords in EVENT_TYPES:
+        if any(word.startswith(prefixes) for word in words) or any(kw in row_text for kw in text_keywords):
+            return event_type
+    return None
+
+
+def _event_side(row) -> str:
+    for el in (row, *row.iterancestors()):
+        classes = el.get("class", "").lower()
+        if any(marker in classes for marker in _HOME_MARKERS):
+            return "home"
+        if any(marker in classes for marker in _AWAY_MARKERS):
+            return "away"
+    return ""
+
+
+def parse_match_events(tree) -> list[dict]:
+    """
+    أحداث المباراة من الـ timeline.
+    Returns: [{"minute", "stoppage", "event_type", "player_name", "side", "description"}, ...]
+    minute مع الوقت بدل الضائع (45+2 → 47) و stoppage الوقت بدل الضائع بس (2) — نفس StatusInfo.
+    الصفوف اللي ما نعرف نوعها أو لاعبها تُتجاهل.
+    """
+    events = []
+    for row in _EVENT_SEL(tree):
+        row_text = " ".join(" ".join(row.itertext()).split())  # keep a space between child nodes
+        event_type = _event_type(row, row_text)
+
+        found = _EVENT_FIELD_SEL["player"](row)
+        player = _text(found[0]) if found else ""
+        found = _EVENT_FIELD_SEL["minute"](row)
+        minute_info = parse_status(_text(found[0])) if found else None
+        minute = minute_info.minute if minute_info else 0
+
+        if not event_type or not player or not minute:
+            continue
+        events.append({
+            "minute": minute,
+            "stoppage": minute_info.stoppage,
+            "event_type": event_type,
+            "player_name": player,
+            "side": _event_side(row),
+            "description": row_text,
+        })
+    return events
+
+
+# ──────────────────────────────────────────────
+# Bounded Detail Fetcher
+# ──────────────────────────────────────────────
+
+# Lower number = fetched first; finished matches are never fetched
+_PRIORITY = {"live": 0, "upcoming": 1}
+
+
+class DetailFetcher:
+    """
+    جلب صفحات التفاصيل بالتوازي:
+      - max_workers: عدد الطلبات المتزامنة الكلي
+      - per_host: أقصى عدد طلبات متزامنة لنفس الـ host
+      - budget_seconds: أقصى وقت تنتظره الدورة — الباقي يكمل بالخلفية ويُستخدم في الدورة الجاية
+      - live_ttl / upcoming_ttl: مدة صلاحية الصفحة في الكاش حسب حالة المباراة
+        (الصفحة اللي انتهت صلاحيتها لكل الحالات تنحذف من الكاش — التشغيل الطويل ما يكبر)
+    """
+
+    def __init__(
+        self,
+        user_agent: str,
+        max_workers: int = 4,
+        per_host: int = 2,
+        budget_seconds: float = 8.0,
+        live_ttl: float = 300.0,
+        upcoming_ttl: float = 3600.0,
+        timeout: float = 10.0,
+        clock=time.monotonic,
+    ):
+        self.http = HttpFetcher("", user_agent, timeout=timeout, pool_size=max_workers)
+        self.per_host = per_host
+        self.budget_seconds = budget_seconds
+        self.ttl = {"live": live_ttl, "upcoming": upcoming_ttl}
+        self.clock = clock
+        self.stats = {"fetched": 0, "failed": 0, "deferred": 0}
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="details")
+        self._lock = threading.Lock()
+        self._host_limits: dict[str, threading.BoundedSemaphore] = {}
+        self._cache: dict[str, tuple[float, dict]] = {}  # url -> (fetched_at, details)
+        self._in_flight: set[str] = set()
+        self._delivered: dict[str, float] = {}  # url -> fetched_at already handed to the caller
+
+    def _host_limit(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(self.per_host)
+            return self._host_limits[host]
+
+    def _fetch_one(self, url: str):
+        try:
+            with self._host_limit(url):
+                details = parse_match_details(self.http.fetch_html(url))
+            with self._lock:
+                self._cache[url] = (self.clock(), details)
+                self.stats["fetched"] += 1
+        except Exception as e:
+            logger.warning(f"⚠️ فشل جلب صفحة التفاصيل {url}: {e}")
+            with self._lock:
+                self.stats["failed"] += 1
+        finally:
+            with self._lock:
+                self._in_flight.discard(url)
+
+    def _evict(self, now: float):
+        """حذف الصفحات اللي ما عادت صالحة لأي حالة (مباريات خلصت أو اختفت من الصفحة)."""
+        max_ttl = max(self.ttl.values())
+        expired = [url for url, (fetched_at, _) in self._cache.items() if now - fetched_at >= max_ttl]
+        for url in expired:
+            del self._cache[url]
+            self._delivered.pop(url, None)
+
+    def _fresh(self, url: str, status: str, now: float) -> dict | None:
+        entry = self._cache.get(url)
+        if entry and now - entry[0] < self.ttl[status]:
+            return entry[1]
+        return None
+
+    def fetch(self, matches: list[ScrapedMatch]) -> list[tuple[ScrapedMatch, dict]]:
+        """
+        جلب تفاصيل المباريات المباشرة ثم القادمة ضمن ميزانية الوقت.
+        Returns: [(match, details), ...] للصفحات الجديدة فقط (بما فيها اللي
+        خلصت بالخلفية من دورة سابقة) — الصفحات المكررة من الكاش ما ترجع مرة ثانية
+        """
+        wanted = sorted(
+            (m for m in matches if m.detail_url and m.status in _PRIORITY),
+            key=lambda m: _PRIORITY[m.status],
+        )
+
+        now = self.clock()
+        submitted: list[tuple[str, object]] = []
+        with self._lock:
+            self._evict(now)
+            for m in wanted:
+                url = m.detail_url
+                if url in self._in_flight or self._fresh(url, m.status, now) is not None:
+                    continue
+                self._in_flight.add(url)
+                submitted.append((url, self._executor.submit(self._fetch_one, url)))
+
+        if submitted:
+            _, not_done = wait([f for _, f in submitted], timeout=self.budget_seconds)
+            if not_done:
+                with self._lock:
+                    for url, future in submitted:
+                        # Queued ones are dropped (retried next cycle); running ones finish into the cache
+                        if future.cancel():
+                            self._in_flight.discard(url)
+                    self.stats["deferred"] += len(not_done)
+                logger.info(
+                    f"⏱️ تأجيل {len(not_done)} صفحة تفاصيل للدورة الجاية "
+                    f"(ميزانية {self.budget_seconds:g}s)"
+                )
+
+        results = []
+        with self._lock:
+            for m in wanted:
+                url = m.detail_url
+                entry = self._cache.get(url)
+                if entry and self._delivered.get(url) != entry[0]:
+                    self._delivered[url] = entry[0]
+                    results.append((m, entry[1]))
+        return results
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.http.close()
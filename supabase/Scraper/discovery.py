@@ -0,0 +1,260 @@
+"""
+discovery.py — اكتشاف selector بطاقات المباريات حسب layout الصفحة
+الـ selectors العامة (.item و [class*='match']) تطابق أغلفة وعناصر داخلية مع البطاقات،
+فنحتفظ فقط بالعناصر اللي فيها فريقين بالضبط — والأبعد منها (مو المتداخلة داخل بعض).
+
+أول مرة نشوف layout نجرّب كل selector ونخزّن المجموعة الفائزة بـ hash هيكل الصفحة
+(أسماء العناصر والـ classes بدون الأرقام) — الدورات الجاية تروح للـ selector الصحيح مباشرة.
+نفس الخوارزمية في المتصفح داخل EXTRACT_MATCHES_JS (scraper.py).
+
+الاستخدام:
+  python discovery.py page.html          # اكتشاف على صفحة محفوظة
+الـ fixtures (layout قديم وجديد لـ Yallakora): tests/test_discovery.py
+"""
+
+import re
+import hashlib
+import logging
+import argparse
+from collections import OrderedDict
+from typing import NamedTuple
+
+from lxml import etree, html as lxml_html
+from cssselect import HTMLTranslator
+
+from parsing import MATCH_CONTAINER_SELECTOR, MATCH_CONTAINER_FALLBACK_SELECTOR, FIELD_SELECTORS
+
+logger = logging.getLogger(__name__)
+
+# Every container selector we know of, tried one by one on a new layout
+CONTAINER_CANDIDATES = tuple(dict.fromkeys(
+    css.strip()
+    for css in f"{MATCH_CONTAINER_SELECTOR},{MATCH_CONTAINER_FALLBACK_SELECTOR}".split(",")
+))
+LAYOUT_CACHE_SIZE = 32  # layouts remembered (live/finished state classes make a few variants per day)
+
+
+def _xpath(css: str) -> str:
+    return HTMLTranslator().css_to_xpath(css, prefix="descendant::")
+
+
+_CANDIDATE_XPATH = {css: _xpath(css) for css in CONTAINER_CANDIDATES}
+_CANDIDATE_SEL = {css: etree.XPath(xpath) for css, xpath in _CANDIDATE_XPATH.items()}
+_TEAM_SEL = etree.XPath(_xpath(FIELD_SELECTORS["team"]))
+_LEAGUE_XPATH = _xpath(FIELD_SELECTORS["league"])
+_DIGITS = re.compile(r"[0-9]+")
+
+
+# ──────────────────────────────────────────────
+# Layout cache (module-level, like database._fingerprint_cache)
+# ──────────────────────────────────────────────
+
+# skeleton hash -> (winning selectors, exact: the union matched only cards on that page)
+_layouts: OrderedDict[str, tuple[tuple[str, ...], bool]] = OrderedDict()
+_union_cache: dict[tuple[str, ...], etree.XPath] = {}
+_stats = {"discoveries": 0, "cache_hits": 0}
+
+
+def get_discovery_stats() -> dict:
+    return {**_stats, "layouts": len(_layouts)}
+
+
+def _union(selectors: tuple[str, ...], extra: str = "") -> etree.XPath:
+    """XPath واحد لعدة selectors — النتيجة بترتيب الصفحة وبدون تكرار."""
+    key = selectors + ((extra,) if extra else ())
+    sel = _union_cache.get(key)
+    if sel is None:
+        parts = [_CANDIDATE_XPATH[css] for css in selectors] + ([extra] if extra else [])
+        sel = _union_cache[key] = etree.XPath(" | ".join(parts))
+    return sel
+
+
+def skeleton_hash(root) -> str:
+    """
+    بصمة هيكل الصفحة: مجموعة (العنصر + الـ class) بدون الأرقام وبدون تكرار —
+    عدد البطاقات ومحتواها ما يغيّرها، تغيير الـ layout يغيّرها.
+    """
+    signatures = {
+        f"{el.tag}.{_DIGITS.sub('', el.get('class') or '')}"
+        for el in root.iter()
+        if isinstance(el.tag, str)
+    }
+    return hashlib.sha1("\n".join(sorted(signatures)).encode()).hexdigest()[:16]
+
+
+# ──────────────────────────────────────────────
+# Outermost match cards
+# ──────────────────────────────────────────────
+
+def _outermost(nodes: list, within, limit: int) -> list:
+    """العناصر من nodes اللي ما فوقها عنصر ثاني من nodes (داخل within)."""
+    node_set = set(nodes)
+    out = []
+    for node in nodes:
+        parent = node.getparent()
+        while parent is not within and parent is not None:
+            if parent in node_set:
+                break
+            parent = parent.getparent()
+        else:
+            out.append(node)
+            if len(out) >= limit:
+                break
+    return out
+
+
+def _pick_teams(found: list, el, limit: int) -> list:
+    nodes = _outermost(found, el, limit)
+    while len(nodes) == 1:
+        top = nodes[0]
+        inside = [node for node in found if node is not top and top in node.iterancestors()]
+        inner = _outermost(inside, top, limit)
+        if not inner:
+            break
+        nodes, found = inner, inside
+    return nodes
+
+
+def team_nodes(el, limit: int = 3) -> list:
+    """
+    عناصر الفريقين داخل البطاقة: الخارجية (teamA وداخله teamName = فريق واحد)،
+    ولو كلها داخل غلاف واحد للفريقين (teamsData) ننزل داخله.
+    يوقف عند limit (الغلاف اللي فيه عشرات الفرق ما يحتاج عد كامل).
+    """
+    return _pick_teams(_TEAM_SEL(el), el, limit)
+
+
+def _outermost_cards(elements: list) -> list:
+    """العناصر اللي فيها فريقين بالضبط، بدون اللي داخل عنصر مقبول ثاني."""
+    if not elements:
+        return []
+    # One team query for the whole page instead of one per element
+    element_set = set(elements)
+    teams_of: dict = {el: [] for el in elements}
+    for team in _TEAM_SEL(elements[0].getroottree().getroot()):
+        for ancestor in team.iterancestors():
+            if ancestor in element_set:
+                teams_of[ancestor].append(team)
+    valid = [el for el in elements if len(_pick_teams(teams_of[el], el, 3)) == 2]
+    valid_set = set(valid)
+    return [el for el in valid if not any(a in valid_set for a in el.iterancestors())]
+
+
+class Containers(NamedTuple):
+    cards: list                     # outermost match cards, page order
+    scanned: int                    # elements the selectors matched (before dedup)
+    selectors: tuple[str, ...]      # winning selector set
+    cached: bool                    # True = layout already known, no discovery
+    exact: bool = False             # the union matched cards only — nothing to filter
+
+
+def discover(root) -> Containers:
+    """
+    تجربة كل selector: كم بطاقة حقيقية يعطي. الأفضل أولاً، وبعده أي selector يضيف
+    بطاقات ما تتداخل مع اللي اخترناها (layout فيه نوعين بطاقات مثلاً).
+    """
+    scanned = 0
+    scored = []
+    for css, sel in _CANDIDATE_SEL.items():
+        found = sel(root)
+        scanned += len(found)
+        cards = _outermost_cards(found)
+        if cards:
+            scored.append((css, cards))
+    scored.sort(key=lambda item: -len(item[1]))  # stable: candidate order breaks ties
+
+    chosen: list[str] = []
+    covered: set = set()  # chosen cards and all their ancestors
+    chosen_cards: set = set()
+    for css, cards in scored:
+        new = [
+            card for card in cards
+            if card not in covered and not any(a in chosen_cards for a in card.iterancestors())
+        ]
+        if not new:
+            continue
+        chosen.append(css)
+        for card in cards:
+            chosen_cards.add(card)
+            covered.add(card)
+            covered.update(card.iterancestors())
+
+    if not chosen:
+        return Containers([], scanned, (), False)
+    selectors = tuple(chosen)
+    found = _union(selectors)(root)
+    cards = _outermost_cards(found)
+    return Containers(cards, scanned, selectors, False, len(cards) == len(found))
+
+
+def record_layout(layout: str, selectors: tuple[str, ...], exact: bool, cached: bool = False):
+    """تسجيل نتيجة layout في الـ cache — من find_containers أو من المتصفح (EXTRACT_MATCHES_JS)."""
+    if cached:
+        if layout in _layouts:
+            _layouts.move_to_end(layout)
+        _stats["cache_hits"] += 1
+        return
+    _stats["discoveries"] += 1
+    if not selectors:
+        return
+    _layouts[layout] = (selectors, exact)
+    _layouts.move_to_end(layout)
+    while len(_layouts) > LAYOUT_CACHE_SIZE:
+        _layouts.popitem(last=False)
+    logger.info(f"🔎 layout جديد ({layout}): {', '.join(selectors)}")
+
+
+def known_layouts() -> dict:
+    """الـ cache بشكل JSON للمتصفح: {hash: [selectors, exact]}"""
+    return {layout: [list(selectors), exact] for layout, (selectors, exact) in _layouts.items()}
+
+
+def find_containers(root) -> Containers:
+    """
+    بطاقات المباريات في الصفحة — من الـ layout المخزّن، أو اكتشاف جديد.
+    layout كان الـ union فيه بطاقات بس (exact) ما نعيد فحص الفريقين لكل بطاقة.
+    """
+    layout = skeleton_hash(root)
+    known = _layouts.get(layout)
+    if known:
+        selectors, exact = known
+        found = _union(selectors)(root)
+        cards = found if exact else _outermost_cards(found)
+        if cards:
+            record_layout(layout, selectors, exact, cached=True)
+            return Containers(cards, len(found), selectors, True, exact)
+
+    result = discover(root)
+    record_layout(layout, result.selectors, result.exact)
+    return result
+
+
+def group_headings(root, containers: Containers) -> dict:
+    """
+    عنوان الدوري خارج البطاقات (layout مجمّع: عنوان ثم بطاقات الدوري تحته).
+    Returns: {بطاقة: عنصر آخر عنوان دوري قبلها}
+    """
+    cards = set(containers.cards)
+    leagues = set(etree.XPath(_LEAGUE_XPATH)(root))
+    headings = {}
+    current = None
+    for el in _union(containers.selectors, _LEAGUE_XPATH)(root):
+        if el in cards:
+            if current is not None:
+                headings[el] = current
+        elif el in leagues and not any(a in cards for a in el.iterancestors()):
+            current = el
+    return headings
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    parser = argparse.ArgumentParser(description="⚽ Kora selector discovery")
+    parser.add_argument("page", help="صفحة HTML محفوظة")
+    args = parser.parse_args()
+
+    with open(args.page, encoding="utf-8") as f:
+        found = discover(lxml_html.fromstring(f.read()))
+    print(f"selectors: {', '.join(found.selectors) or '—'}")
+    print(f"scanned {found.scanned} → kept {len(found.cards)}")
@@ -0,0 +1,90 @@
+"""
+health.py — ملف الحالة للوضع الدائم (--daemon) وقياس الذاكرة
+"""
+
+import json
+import os
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def process_tree_rss_mb(pid: int | None = None) -> float | None:
+    """
+    مجموع الذاكرة (RSS) للعملية وكل العمليات التابعة لها (Playwright driver + Chromium).
+    يعتمد على /proc — يرجع None على الأنظمة اللي ما فيها /proc.
+    """
+    if not os.path.isdir("/proc"):
+        return None
+    pid = pid or os.getpid()
+
+    children: dict[int, list[int]] = {}
+    rss_pages: dict[int, int] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                stat = f.read()
+            with open(f"/proc/{entry}/statm") as f:
+                rss_pages[int(entry)] = int(f.read().split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        # The command name may contain spaces — fields after ")" are safe to split
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry))
+
+    total, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        total += rss_pages.get(current, 0)
+        stack.extend(children.get(current, []))
+
+    return total * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+class HealthFile:
+    """
+    ملف JSON يوصف حالة السكرابر — للـ liveness/readiness checks (Docker, systemd, k8s).
+
+    - ready: صار فيه دورة ناجحة وحدة على الأقل
+    - updated_at: آخر تحديث (لو قديم → السكرابر معلّق)
+    """
+
+    def __init__(self, path: str | None):
+        self.path = path
+        self.state = {
+            "pid": os.getpid(),
+            "status": "starting",
+            "ready": False,
+            "iteration": 0,
+            "matches": 0,
+            "last_success_at": None,
+            "updated_at": None,
+        }
+
+    def update(self, **fields):
+        self.state.update(fields)
+        self.state["updated_at"] = time.time()
+        if not self.path:
+            return
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self.state, f)
+            os.replace(tmp_path, self.path)  # atomic: readers never see half a file
+        except OSError as e:
+            logger.warning(f"⚠️ تعذّر كتابة ملف الحالة: {e}")
+
+    def cycle_ok(self, iteration: int, matches: int):
+        self.update(
+            status="ok",
+            ready=True,
+            iteration=iteration,
+            matches=matches,
+            last_success_at=time.time(),
+        )
+
+    def cycle_failed(self, iteration: int, error: str):
+        self.update(status="error", iteration=iteration, error=error)
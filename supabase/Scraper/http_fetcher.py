@@ -0,0 +1,197 @@
+"""
+http_fetcher.py — المسار السريع بدون متصفح
+يجلب صفحة المباريات بـ HTTP عادي (اتصالات مُعاد استخدامها) ويحللها بـ lxml
+ويرجع نفس ScrapedMatch اللي يرجعها extract_match_from_element
+(الجلب والتحليل لكل دورة في sources.SourceAdapter.scrape)
+"""
+
+import logging
+from datetime import datetime, timezone
+from urllib.parse import urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree, html as lxml_html
+from cssselect import HTMLTranslator
+
+from discovery import find_containers, group_headings, team_nodes
+from parsing import (
+    FIELD_SELECTORS,
+    build_match_from_raw,
+    ScrapedMatch,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# ──────────────────────────────────────────────
+# Compiled Selectors
+# ──────────────────────────────────────────────
+
+def _compile(css: str) -> etree.XPath:
+    """
+    CSS → XPath مُجمّع مرة واحدة عند الاستيراد (مش لكل بطاقة).
+    prefix="descendant::" مثل querySelector — بدون مطابقة العنصر نفسه.
+    """
+    return etree.XPath(HTMLTranslator().css_to_xpath(css, prefix="descendant::"))
+
+
+_FIELD_SEL = {name: _compile(sel) for name, sel in FIELD_SELECTORS.items()}
+_IMG_SEL = _compile("img")
+_LINK_SEL = etree.XPath("ancestor-or-self::a[@href][1] | descendant::a[@href][1]")
+
+
+def _text(el) -> str:
+    """نص العنصر بمسافات موحّدة (بديل innerText)."""
+    if el is None:
+        return ""
+    return " ".join(el.text_content().split())
+
+
+def _first(el, name: str):
+    """أول عنصر داخل el يطابق selector الحقل (مثل querySelector)."""
+    found = _FIELD_SEL[name](el)
+    return found[0] if found else None
+
+
+def _first_or_self(el, name: str):
+    # lxml elements without children are falsy, so no `or` chaining here
+    found = _first(el, name)
+    return el if found is None else found
+
+
+def _logo(team_el) -> str:
+    imgs = _IMG_SEL(team_el)
+    if not imgs:
+        return ""
+    return imgs[0].get("src") or imgs[0].get("data-src") or ""
+
+
+def extract_raw_from_node(el, base_url: str = "") -> dict:
+    """استخراج الحقول الخام من عنصر lxml — نفس شكل ناتج EXTRACT_MATCHES_JS."""
+    raw = {
+        "home_team": "",
+        "away_team": "",
+        "home_logo": "",
+        "away_logo": "",
+        "lines": [],
+    }
+
+    teams = team_nodes(el)
+    if len(teams) >= 2:
+        raw["home_team"] = _text(_first_or_self(teams[0], "team_name"))
+        raw["away_team"] = _text(_first_or_self(teams[1], "team_name"))
+        raw["home_logo"] = _logo(teams[0])
+        raw["away_logo"] = _logo(teams[1])
+
+    if not raw["home_team"] or not raw["away_team"]:
+        raw["lines"] = [t.strip() for t in el.itertext() if t.strip()]
+
+    for name in ("score", "status", "league", "time", "channel", "round"):
+        raw[name] = _text(_first(el, name))
+
+    links = _LINK_SEL(el)
+    raw["detail_url"] = urljoin(base_url, links[0].get("href")) if links else ""
+
+    return raw
+
+
+def match_containers(page_html: str) -> list:
+    """بطاقات المباريات في الصفحة (الأبعد فقط، بدون الأغلفة والعناصر الداخلية)."""
+    return find_containers(lxml_html.fromstring(page_html)).cards
+
+
+def parse_matches_html(page_html: str, today=None, base_url: str = "") -> list[ScrapedMatch]:
+    """تحليل HTML صفحة المباريات وإرجاع قائمة المباريات."""
+    if today is None:
+        today = datetime.now(timezone.utc).date()
+
+    root = lxml_html.fromstring(page_html)
+    containers = find_containers(root)
+    logger.info(
+        f"📦 وُجد {len(containers.cards)} بطاقة مباراة من {containers.scanned} عنصر "
+        f"(HTTP{'، layout معروف' if containers.cached else ''})"
+    )
+
+    raws = []
+    for container in containers.cards:
+        try:
+            raws.append((container, extract_raw_from_node(container, base_url)))
+        except Exception as e:
+            logger.debug(f"⏭️ تخطي عنصر: {e}")
+
+    # League-grouped layout: the league title sits above the cards, not inside them
+    if any(not raw["league"] for _, raw in raws):
+        headings = group_headings(root, containers)
+        for container, raw in raws:
+            if not raw["league"] and container in headings:
+                raw["league"] = _text(headings[container])
+
+    matches = []
+    for _, raw in raws:
+        try:
+            match_data = build_match_from_raw(raw, today)
+            if match_data:
+                matches.append(match_data)
+        except Exception as e:
+            logger.debug(f"⏭️ تخطي عنصر: {e}")
+    return matches
+
+
+# ──────────────────────────────────────────────
+# HTTP Fetcher
+# ──────────────────────────────────────────────
+
+
+class HttpFetcher:
+    """
+    جلب الصفحة بـ requests.Session واحد — الاتصال (TCP+TLS) يُعاد استخدامه بين الدورات.
+    """
+
+    def __init__(self, url: str, user_agent: str, timeout: float = 15.0, pool_size: int = 4):
+        self.url = url
+        self.timeout = timeout
+        self.recorder = None  # replay.Recorder (--record)
+        self.session = requests.Session()
+        self.session.headers.update({
+            "User-Agent": user_agent,
+            "Accept": "text/html,application/xhtml+xml",
+            "Accept-Language": "ar,en;q=0.8",
+        })
+        retry = Retry(total=2, backoff_factor=0.5, status_forcelist=(502, 503, 504))
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _body(self, response, url: str) -> str:
+        response.raise_for_status()
+        if "charset" not in response.headers.get("Content-Type", "").lower():
+            # requests falls back to ISO-8859-1, which mangles Arabic text
+            response.encoding = "utf-8"
+        if self.recorder:
+            self.recorder.save(url, response.text)
+        return response.text
+
+    def fetch_html(self, url: str | None = None) -> str:
+        url = url or self.url
+        return self._body(self.session.get(url, timeout=self.timeout), url)
+
+    def fetch_if_modified(self, url: str, etag: str = "", last_modified: str = "") -> tuple[str | None, str, str]:
+        """
+        GET شرطي (If-None-Match / If-Modified-Since) للصفحات اللي نادراً تتغيّر.
+        Returns: (HTML، أو None لو 304 ما تغيّرت، ETag، Last-Modified)
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304:
+            return None, etag, last_modified
+        page_html = self._body(response, url)
+        return page_html, response.headers.get("ETag", ""), response.headers.get("Last-Modified", "")
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,176 @@
+"""
+metrics.py — قياس زمن كل مرحلة في الدورة (navigation, extraction, resolution, db_write, ...)
+  - timer("stage"): يقيس الزمن ويضيفه للـ histogram
+  - count("name"): عدّاد
+  - end_cycle(iteration): ملخص الدورة في اللوق + كتابة الملف
+
+الملف حسب الامتداد:
+  - .prom: Prometheus text format (يُستبدل كل دورة — مناسب لـ node_exporter textfile collector)
+  - غير كذا: JSON lines (سطر لكل دورة)
+
+معطّل افتراضياً: timer() يرجع context manager فاضي، والكلفة تقريباً صفر.
+"""
+
+import json
+import os
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds (Prometheus-style cumulative buckets, +Inf implied)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Display order in the per-cycle log line; other stages follow alphabetically
+STAGE_ORDER = (
+    "navigation", "render_wait", "extraction", "http_fetch", "parsing", "merge",
+    "spool", "db_checkout", "resolution", "db_write", "standings", "details", "sleep",
+)
+
+
+# ──────────────────────────────────────────────
+# Registry (module-level, like database._pool_stats)
+# ──────────────────────────────────────────────
+
+_enabled = False
+_path: str | None = None
+_lock = threading.Lock()  # fetch and write stages run on different threads with --async
+
+# stage -> {"count": N, "sum": seconds, "buckets": [N per BUCKETS bound]}
+_histograms: dict[str, dict] = {}
+_counters: dict[str, float] = {}
+_cycle: dict[str, float] = {}  # stage -> seconds since the last end_cycle()
+
+
+def configure(path: str | None):
+    """تفعيل القياس (path = ملف الإخراج) أو تعطيله (None)."""
+    global _enabled, _path
+    _enabled = path is not None
+    _path = path
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+        _cycle.clear()
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def observe(stage: str, seconds: float):
+    if not _enabled:
+        return
+    with _lock:
+        hist = _histograms.get(stage)
+        if hist is None:
+            hist = _histograms[stage] = {"count": 0, "sum": 0.0, "buckets": [0] * len(BUCKETS)}
+        hist["count"] += 1
+        hist["sum"] += seconds
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                hist["buckets"][i] += 1
+        _cycle[stage] = _cycle.get(stage, 0.0) + seconds
+
+
+def count(name: str, value: float = 1):
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+class _Timer:
+    __slots__ = ("stage", "started")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.stage, time.perf_counter() - self.started)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(stage: str):
+    """with metrics.timer("db_write"): ... — يقيس حتى لو صار exception."""
+    return _Timer(stage) if _enabled else _NULL_TIMER
+
+
+# ──────────────────────────────────────────────
+# Export
+# ──────────────────────────────────────────────
+
+def _stage_sort_key(stage: str) -> tuple:
+    return (STAGE_ORDER.index(stage), "") if stage in STAGE_ORDER else (len(STAGE_ORDER), stage)
+
+
+def render_prometheus() -> str:
+    """كل الـ histograms والعدادات بصيغة Prometheus text (الإصدار 0.0.4)."""
+    lines = [
+        "# HELP kora_stage_seconds Time spent per scrape stage",
+        "# TYPE kora_stage_seconds histogram",
+    ]
+    with _lock:
+        for stage in sorted(_histograms, key=_stage_sort_key):
+            hist = _histograms[stage]
+            for bound, value in zip(BUCKETS, hist["buckets"]):
+                lines.append(f'kora_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {value}')
+            lines.append(f'kora_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {hist["count"]}')
+            lines.append(f'kora_stage_seconds_sum{{stage="{stage}"}} {hist["sum"]:.6f}')
+            lines.append(f'kora_stage_seconds_count{{stage="{stage}"}} {hist["count"]}')
+        for name in sorted(_counters):
+            lines.append(f"# TYPE kora_{name}_total counter")
+            lines.append(f"kora_{name}_total {_counters[name]:g}")
+    return "\n".join(lines) + "\n"
+
+
+def end_cycle(iteration: int) -> dict:
+    """
+    ملخص الدورة: زمن كل مرحلة منذ آخر ملخص. يطبعه في اللوق ويكتبه في الملف.
+    Returns: {stage: seconds} (فاضي لو القياس معطّل)
+    """
+    if not _enabled:
+        return {}
+    with _lock:
+        stages = dict(sorted(_cycle.items(), key=lambda item: _stage_sort_key(item[0])))
+        _cycle.clear()
+        counters = dict(_counters)
+
+    if stages:
+        logger.info("📈 المراحل: " + " | ".join(f"{stage} {seconds:.2f}s" for stage, seconds in stages.items()))
+
+    try:
+        if _path.endswith(".prom"):
+            tmp_path = f"{_path}.tmp"
+            with open(tmp_path, "w") as f:
+                f.write(render_prometheus())
+            os.replace(tmp_path, _path)  # atomic: the collector never reads half a file
+        else:
+            with open(_path, "a") as f:
+                f.write(json.dumps({
+                    "ts": time.time(),
+                    "iteration": iteration,
+                    "stages": {stage: round(seconds, 6) for stage, seconds in stages.items()},
+                    "counters": counters,
+                }) + "\n")
+    except OSError as e:
+        logger.warning(f"⚠️ تعذّر كتابة ملف القياسات: {e}")
+
+    return stages
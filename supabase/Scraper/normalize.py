@@ -0,0 +1,138 @@
+"""
+normalize.py — توحيد أسماء الفرق والدوريات قبل المقارنة
++ فهرس trigram في الذاكرة للمطابقة التقريبية (نفس فكرة pg_trgm)
+"""
+
+import re
+from typing import NamedTuple
+
+# Arabic diacritics (tashkeel) + superscript alef
+_DIACRITICS = re.compile(r"[\u064B-\u0652\u0670]")
+_TATWEEL = "\u0640"
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_SPACES = re.compile(r"\s+")
+
+# One-to-one letter unification: alef/hamza forms, alef maqsura, ta marbuta, Eastern digits
+_LETTER_MAP = str.maketrans({
+    "أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا",
+    "ى": "ي", "ئ": "ي",
+    "ؤ": "و",
+    "ة": "ه",
+    **{chr(0x0660 + d): str(d) for d in range(10)},  # ٠-٩
+    **{chr(0x06F0 + d): str(d) for d in range(10)},  # ۰-۹ (Persian)
+})
+
+# Tokens that don't identify a club
+NOISE_TOKENS = frozenset({
+    "نادي", "فريق",
+    "fc", "sc", "cf", "ac", "afc", "club",
+})
+
+# Definite article: "الزمالك" / "زمالك", "Al-Ahly" / "El Ahly" / "Ahly".
+# Arabic only when 3+ letters remain, so short words ("الم") keep their letters
+_ARTICLE = "ال"
+_LATIN_ARTICLES = frozenset({"al", "el"})
+
+
+def normalize_name(name: str) -> str:
+    """
+    صيغة موحّدة وحتمية للاسم:
+      - بدون تشكيل أو تطويل أو علامات ترقيم
+      - أ/إ/آ → ا ، ى/ئ → ي ، ؤ → و ، ة → ه ، أرقام عربية → لاتينية
+      - حذف الكلمات اللي ما تميّز النادي ("نادي"، "FC"...) وأداة التعريف ("ال"، "Al-"، "El")
+      - أحرف لاتينية صغيرة ومسافات موحّدة
+    مثال: "نادي الأهْــلي FC" → "اهلي" ، "Al-Ahly" → "ahly"
+    """
+    if not name:
+        return ""
+    name = _DIACRITICS.sub("", name).replace(_TATWEEL, "")
+    name = name.casefold().translate(_LETTER_MAP)
+    name = _PUNCTUATION.sub(" ", name.replace(".", ""))  # "F.C." → "fc", "al-ahly" → "al ahly"
+    tokens = [
+        t.removeprefix(_ARTICLE) if len(t) >= len(_ARTICLE) + 3 else t
+        for t in _SPACES.split(name)
+        if t and t not in NOISE_TOKENS and t not in _LATIN_ARTICLES
+    ]
+    return " ".join(tokens)
+
+
+def trigrams(normalized: str) -> frozenset[str]:
+    """trigrams بنفس طريقة pg_trgm: كل كلمة محاطة بمسافتين قبل ومسافة بعد."""
+    grams = set()
+    for word in normalized.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+class FuzzyMatch(NamedTuple):
+    entity_id: str
+    name: str
+    score: float
+
+
+class TrigramIndex:
+    """
+    فهرس trigram مقلوب (gram → أسماء) للمطابقة التقريبية.
+
+    best_match() يرجع أفضل مرشح بتشابه Jaccard (مثل similarity() في pg_trgm)
+    بشرط: score >= threshold، والفرق عن ثاني أفضل مرشح (لفريق آخر) >= margin —
+    عشان "الأهلي" ما ينربط عشوائياً بأول نادٍ من عدة أندية بنفس الاسم.
+    """
+
+    def __init__(self, threshold: float = 0.55, margin: float = 0.15):
+        self.threshold = threshold
+        self.margin = margin
+        self._grams: dict[str, frozenset[str]] = {}   # normalized name -> trigrams
+        self._ids: dict[str, str] = {}                # normalized name -> id
+        self._names: dict[str, str] = {}              # normalized name -> original name
+        self._postings: dict[str, set[str]] = {}      # trigram -> normalized names
+
+    def __len__(self):
+        return len(self._ids)
+
+    def add(self, name: str, entity_id: str):
+        key = normalize_name(name)
+        if not key or key in self._ids:
+            return
+        grams = trigrams(key)
+        self._grams[key] = grams
+        self._ids[key] = entity_id
+        self._names[key] = name
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(key)
+
+    def remove_ids(self, ids: set[str]):
+        for key in [k for k, v in self._ids.items() if v in ids]:
+            for gram in self._grams.pop(key):
+                self._postings[gram].discard(key)
+            del self._ids[key]
+            del self._names[key]
+
+    def candidates(self, name: str, limit: int = 5) -> list[FuzzyMatch]:
+        """أفضل المرشحين مرتبين بالتشابه (بدون تطبيق العتبة)."""
+        query = trigrams(normalize_name(name))
+        if not query:
+            return []
+
+        shared: dict[str, int] = {}
+        for gram in query:
+            for key in self._postings.get(gram, ()):
+                shared[key] = shared.get(key, 0) + 1
+
+        scored = [
+            FuzzyMatch(self._ids[key], self._names[key], count / (len(query) + len(self._grams[key]) - count))
+            for key, count in shared.items()
+        ]
+        scored.sort(key=lambda m: m.score, reverse=True)
+        return scored[:limit]
+
+    def best_match(self, name: str) -> FuzzyMatch | None:
+        ranked = self.candidates(name)
+        if not ranked or ranked[0].score < self.threshold:
+            return None
+        best = ranked[0]
+        runner_up = next((m for m in ranked[1:] if m.entity_id != best.entity_id), None)
+        if runner_up and best.score - runner_up.score < self.margin:
+            return None  # ambiguous
+        return best
@@ -0,0 +1,290 @@
+"""
+parsing.py — تحليل بيانات المباريات المستخرجة من Yallakora
+مشترك بين مسار المتصفح (Playwright) ومسار HTTP (lxml)
+
+النصوص المرجعية: tests/test_parsing.py — القياس: python -m bench parse
+"""
+
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from typing import NamedTuple
+
+# ──────────────────────────────────────────────
+# Selectors
+# ──────────────────────────────────────────────
+
+# CSS selectors — Yallakora changes layout occasionally, so each field tries several
+MATCH_CONTAINER_SELECTOR = ".matchCard, .match-card, .liItem, .item, [class*='match']"
+MATCH_CONTAINER_FALLBACK_SELECTOR = "#matchesContainer .item, .allData .item, .matchesList .item"
+FIELD_SELECTORS = {
+    "team": ".teamName, .team-name, .teamA, .teamB, .team, [class*='team']",
+    "team_name": ".name, span, strong",
+    "score": ".score, .result, .matchResult, [class*='score'], [class*='result']",
+    "status": ".matchStatus, .status, .time, .matchTime, [class*='status'], [class*='live']",
+    "league": ".championship, .league, .tournamentName, .tourName, [class*='champ'], [class*='league']",
+    "time": ".matchTime, .time, [class*='time']",
+    "channel": ".channel, [class*='channel'], [class*='broadcaster']",
+    "round": ".round, .matchRound, [class*='round'], [class*='week']",
+}
+
+
+# ──────────────────────────────────────────────
+# Field Parsers
+# ──────────────────────────────────────────────
+
+# Arabic-Indic (٠-٩) and Persian (۰-۹) digits → ASCII, so every regex below uses [0-9]
+_DIGITS = str.maketrans({
+    **{chr(0x0660 + d): str(d) for d in range(10)},
+    **{chr(0x06F0 + d): str(d) for d in range(10)},
+})
+
+_SCORE_RE = re.compile(r"([0-9]+)\s*[-–:]\s*([0-9]+)")
+_TIME_RE = re.compile(r"([0-9]{1,2}):([0-9]{2})")
+
+# Status keywords → (kind, period). Kinds, strongest first:
+#   "live"     — any of these makes the match live (checked before "finished", as before)
+#   "finished" — finished unless a live keyword is also there
+#   "weak"     — live only if nothing says finished (penalties: "انتهت بركلات الترجيح" = finished)
+# Longer phrases come first: the alternation consumes them before their parts ("نهاية الشوط" ≠ "نهاية").
+# The short Latin keywords (ht, ft) still match inside words, exactly like the old substring scan.
+STATUS_KEYWORDS = {
+    "نهاية الشوط الأول": ("live", "half_time"),
+    "نهاية الشوط": ("live", "half_time"),
+    "نهاية المباراة": ("finished", "full_time"),
+    "الشوط الأول": ("live", "first_half"),
+    "الشوط الثاني": ("live", "second_half"),
+    "half time": ("live", "half_time"),
+    "halftime": ("live", "half_time"),
+    "full time": ("finished", "full_time"),
+    "ركلات الترجيح": ("weak", "penalties"),
+    "ترجيح": ("weak", "penalties"),
+    "penalties": ("weak", "penalties"),
+    "pens": ("weak", "penalties"),
+    "live": ("live", None),
+    "مباشر": ("live", None),
+    "جارية": ("live", None),
+    "الشوط": ("live", None),
+    "شوط": ("live", None),
+    "ش.أ": ("live", "half_time"),
+    "ش.ث": ("live", "second_half"),
+    "بدأت": ("live", None),
+    "استراحة": ("live", "half_time"),
+    "ht": ("live", "half_time"),
+    "extra": ("live", "extra_time"),
+    "إضافي": ("live", "extra_time"),
+    "finished": ("finished", "full_time"),
+    "ended": ("finished", "full_time"),
+    "انتهت": ("finished", "full_time"),
+    "ن.م": ("finished", "full_time"),
+    "نهاية": ("finished", "full_time"),
+    "aet": ("finished", "extra_time"),
+    "ft": ("finished", "full_time"),
+    "et": ("live", "extra_time"),
+}
+# "et" and "aet" are whole words only — otherwise "street"/"ticket" would turn live
+_WORD_ONLY = {"et", "aet", "pens"}
+
+_STATUS_RE = re.compile(
+    "|".join(
+        rf"\b{re.escape(kw)}\b" if kw in _WORD_ONLY else re.escape(kw)
+        for kw in STATUS_KEYWORDS
+    )
+)
+# 45' / 45+2 / 90 + 4' — but not the clock in "20:00"
+_MINUTE_RE = re.compile(r"(?<![0-9:])([0-9]{1,3})(?:\s*\+\s*([0-9]{1,2}))?\s*(['′’])?(?![0-9:])")
+
+
+class StatusInfo(NamedTuple):
+    status: str             # live | finished | upcoming (enum الـ DB)
+    minute: int             # مع الوقت بدل الضائع: 45+2 → 47
+    period: str | None      # first_half | half_time | second_half | extra_time | penalties | full_time
+    stoppage: int           # الوقت بدل الضائع فقط: 45+2 → 2
+
+
+@lru_cache(maxsize=4096)
+def parse_status(status_text: str) -> StatusInfo:
+    """
+    تحليل نص الحالة مرة واحدة: الحالة + الدقيقة + الشوط + الوقت بدل الضائع.
+    نفس النص يتكرر في مئات البطاقات وكل دورة — النتيجة محفوظة (LRU).
+    أمثلة: "مباشر 45+2'" → live, 47, first_half, 2 — "HT" → live, 45, half_time
+    """
+    text = status_text.strip().lower().translate(_DIGITS)
+
+    kinds = {}  # kind -> period of the first keyword of that kind
+    for m in _STATUS_RE.finditer(text):
+        kind, period = STATUS_KEYWORDS[m.group()]
+        if kinds.get(kind) is None:
+            kinds[kind] = period
+
+    minute_match = _MINUTE_RE.search(text)
+    minute = stoppage = 0
+    if minute_match:
+        minute = int(minute_match.group(1))
+        stoppage = int(minute_match.group(2) or 0)
+        minute += stoppage
+        if minute_match.group(2) or minute_match.group(3):
+            kinds.setdefault("weak", None)  # "67'" / "90+4" alone = the match is running
+
+    if "live" in kinds:
+        status = "live"
+    elif "finished" in kinds:
+        status = "finished"
+    elif "weak" in kinds:
+        status = "live"
+    else:
+        return StatusInfo("upcoming", minute, None, stoppage)
+
+    if "weak" in kinds and kinds["weak"] == "penalties":
+        period = "penalties"
+    else:
+        period = kinds.get("live" if status == "live" else "finished") or kinds.get("weak")
+
+    if period is None and minute:
+        base = minute - stoppage
+        period = "first_half" if base <= 45 else "second_half" if base <= 90 else "extra_time"
+    if not minute_match:
+        if period == "half_time":
+            minute = 45
+        elif status == "finished":
+            minute = 120 if period in ("extra_time", "penalties") else 90
+    return StatusInfo(status, minute, period, stoppage)
+
+
+@lru_cache(maxsize=1024)
+def parse_score(score_text: str) -> tuple[int, int]:
+    """تحويل نص النتيجة إلى أرقام. مثال: '2 - 1' → (2, 1) ، '٢ - ١' → (2, 1)"""
+    match = _SCORE_RE.search(score_text.translate(_DIGITS))
+    if match:
+        return int(match.group(1)), int(match.group(2))
+    return 0, 0
+
+
+def parse_minute(minute_text: str) -> int:
+    """
+    تحويل نص الدقيقة إلى رقم.
+    أمثلة: "45'" → 45, "45+2'" → 47, "HT" → 45, "FT" → 90
+    """
+    return parse_status(minute_text).minute
+
+
+def map_status(status_text: str) -> str:
+    """تحويل حالة المباراة من النص العربي/الإنجليزي إلى enum الـ DB."""
+    return parse_status(status_text).status
+
+
+# ──────────────────────────────────────────────
+# Match Record
+# ──────────────────────────────────────────────
+
+@dataclass(slots=True, frozen=True)
+class ScrapedMatch:
+    """
+    مباراة واحدة كما جاءت من الصفحة — من الاستخراج لين باراميترات الـ DB.
+    key و fingerprint محسوبة مرة وحدة عند الإنشاء (كشف التغيير يقارنها كل دورة).
+    """
+
+    home_team_name: str
+    away_team_name: str
+    start_time: datetime
+    status: str = "upcoming"
+    home_score: int = 0
+    away_score: int = 0
+    minute: int = 0
+    league_name: str = ""
+    home_team_logo: str = ""
+    away_team_logo: str = ""
+    channel: str = ""
+    round: str = ""
+    detail_url: str = ""
+    # (home name, away name, UTC date) — natural key before names are resolved to IDs
+    key: tuple[str, str, date] = field(init=False, repr=False, compare=False)
+    # fields that change during a match — any difference means a write
+    fingerprint: tuple[str, int, int, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        start = self.start_time
+        match_date = (start.astimezone(timezone.utc) if start.tzinfo else start).date()
+        object.__setattr__(self, "key", (self.home_team_name, self.away_team_name, match_date))
+        object.__setattr__(
+            self, "fingerprint", (self.status, self.home_score, self.away_score, self.minute)
+        )
+
+    def to_dict(self) -> dict:
+        """نفس الـ dictionary القديم (للكود اللي لسه يتعامل مع dicts)."""
+        return {name: getattr(self, name) for name in _MATCH_FIELDS}
+
+
+_MATCH_FIELDS = tuple(
+    name for name in ScrapedMatch.__dataclass_fields__ if name not in ("key", "fingerprint")
+)
+
+
+def partition_live(matches: list[ScrapedMatch]) -> tuple[list[ScrapedMatch], list[ScrapedMatch]]:
+    """(المباشرة، الباقي) بمرور واحد — الترتيب داخل كل قائمة محفوظ."""
+    live, other = [], []
+    for m in matches:
+        (live if m.status == "live" else other).append(m)
+    return live, other
+
+
+def build_match_from_raw(raw: dict, today) -> ScrapedMatch | None:
+    """
+    تحويل الحقول الخام (نصوص العنصر) إلى ScrapedMatch.
+    مشترك بين الاستخراج داخل الصفحة والاستخراج عنصر بعنصر.
+    """
+    home_team = raw.get("home_team", "")
+    away_team = raw.get("away_team", "")
+    home_logo = raw.get("home_logo", "")
+    away_logo = raw.get("away_logo", "")
+
+    if not home_team or not away_team:
+        # Heuristic: Find localized text (basic fallback, no logos here)
+        all_text = raw.get("lines") or []
+        if len(all_text) >= 2:
+            home_team = all_text[0]
+            away_team = all_text[-1]
+
+    if not home_team or not away_team:
+        return None
+
+    # ── Score ──
+    home_score, away_score = 0, 0
+    score_text = raw.get("score", "")
+    if score_text:
+        home_score, away_score = parse_score(score_text)
+
+    # ── Status / Minute ──
+    info = parse_status(raw.get("status", ""))
+    status = info.status
+    minute = info.minute if status == "live" else 0
+
+    # ── Time ──
+    match_time = datetime.now(timezone.utc)
+    time_text = raw.get("time", "")
+    if time_text and status == "upcoming":
+        time_match = _TIME_RE.search(time_text.translate(_DIGITS))
+        if time_match:
+            hour, mins = int(time_match.group(1)), int(time_match.group(2))
+            match_time = datetime.combine(
+                today,
+                datetime.min.time().replace(hour=hour, minute=mins),
+                tzinfo=timezone.utc,
+            )
+
+    return ScrapedMatch(
+        home_team_name=home_team,
+        away_team_name=away_team,
+        start_time=match_time,
+        status=status,
+        home_score=home_score,
+        away_score=away_score,
+        minute=minute,
+        league_name=raw.get("league", ""),
+        home_team_logo=home_logo,
+        away_team_logo=away_logo,
+        channel=raw.get("channel", ""),
+        round=raw.get("round", ""),
+        detail_url=raw.get("detail_url", ""),
+    )
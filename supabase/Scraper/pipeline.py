@@ -0,0 +1,115 @@
+"""
+pipeline.py — تشغيل الجلب والكتابة بالتوازي (asyncio)
+الجلب التالي يبدأ والكتابة في الـ DB للدورة السابقة لسه شغّالة،
+والمرحلتين مربوطتين بـ queue محدود — لو الكتابة تأخرت الجلب ينتظر (backpressure)
+
+Playwright (sync) و SQLAlchemy يشتغلون كل واحد في thread خاص فيه:
+  - الجلب: thread واحد ثابت (كائنات Playwright sync مربوطة بالـ thread اللي أنشأها)
+  - الكتابة: thread واحد ثابت (ترتيب الكتابات محفوظ)
+
+المقارنة مع التسلسلي: python -m bench overlap
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+# ──────────────────────────────────────────────
+# Pipeline
+# ──────────────────────────────────────────────
+
+_DONE = object()  # end-of-stream marker for the writer
+
+
+async def run_pipeline(
+    fetch,
+    write,
+    next_interval,
+    *,
+    once: bool = False,
+    queue_size: int = 1,
+    shutdown: threading.Event | None = None,
+    should_stop=None,
+    on_written=None,
+    on_failed=None,
+    cleanup=None,
+) -> int:
+    """
+    حلقة جلب → كتابة متداخلة.
+
+    Args:
+        fetch(iteration) -> matches: جلب دورة (sync، يشتغل في thread الجلب)
+        write(iteration, matches): كتابة دورة (sync، يشتغل في thread الكتابة)
+        next_interval(matches) -> seconds: مدة الانتظار قبل الجلب التالي
+        once: دورة واحدة فقط (ينتظر الكتابة قبل ما يرجع)
+        queue_size: كم دورة مجلوبة ممكن تنتظر الكتابة قبل ما يتوقف الجلب
+        shutdown: threading.Event يوقف الجلب (الكتابات المنتظرة تكمل)
+        should_stop() -> bool: شرط إيقاف إضافي قبل كل دورة (مثلاً انتهاء الوقت)
+        on_written(iteration, matches, result) / on_failed(iteration, error): بعد كل دورة
+        cleanup(): يشتغل في thread الجلب قبل إغلاقه (مثلاً إغلاق المتصفح)
+
+    Returns: عدد الدورات المجلوبة
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    shutdown = shutdown or threading.Event()
+    fetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fetch")
+    write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="write")
+    iterations = 0
+
+    async def producer():
+        nonlocal iterations
+        try:
+            while not shutdown.is_set():
+                if should_stop and should_stop():
+                    break
+                iterations += 1
+                try:
+                    matches = await loop.run_in_executor(fetch_executor, fetch, iterations)
+                except Exception as e:
+                    logger.error(f"❌ خطأ في الدورة #{iterations}: {e}")
+                    if on_failed:
+                        on_failed(iterations, e)
+                    matches = None
+
+                if matches is not None:
+                    await queue.put((iterations, matches))  # blocks while the writer is behind
+
+                if once:
+                    break
+
+                sleep_time = next_interval(matches or [])
+                if sleep_time > 0:
+                    # Event.wait in a worker thread so SIGTERM wakes us up early
+                    await loop.run_in_executor(None, shutdown.wait, sleep_time)
+        finally:
+            await queue.put(_DONE)
+
+    async def consumer():
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                return
+            iteration, matches = item
+            try:
+                result = await loop.run_in_executor(write_executor, write, iteration, matches)
+            except Exception as e:
+                logger.error(f"❌ خطأ في كتابة الدورة #{iteration}: {e}")
+                if on_failed:
+                    on_failed(iteration, e)
+                continue
+            if on_written:
+                on_written(iteration, matches, result)
+
+    try:
+        await asyncio.gather(producer(), consumer())
+    finally:
+        if cleanup:
+            await loop.run_in_executor(fetch_executor, cleanup)
+        fetch_executor.shutdown(wait=True)
+        write_executor.shutdown(wait=True)
+    return iterations
@@ -0,0 +1,259 @@
+"""
+profiling.py — بروفايل CPU والذاكرة لكل دورة (--profile DIR)
+الذاكرة تزيد في التشغيل الطويل وما عندنا دليل من وين — هذا يسجّل لكل دورة:
+  - cycle-NNNN.prof       cProfile (يفتح بـ python -m pstats أو snakeviz)
+  - cycle-NNNN-memory.txt أكثر أسطر زادت ذاكرتها من الدورة السابقة (tracemalloc)
+                          + أكثر أنواع الكائنات زاد عددها (ElementHandle، dict...)
+  - cycles.jsonl          سطر لكل دورة: المدة، RSS بايثون، RSS العمليات التابعة (Playwright + Chromium)، tracemalloc
+  - summary.txt           التقرير: اتجاه الذاكرة، أكثر الدوال وقتاً لكل الدورات، النمو من أول دورة لآخر دورة
+
+الاستخدام:
+  python scraper.py --replay recordings/ --backend http --dry-run --profile /tmp/prof
+  python scraper.py --daemon --profile /tmp/prof --profile-cycles 50     # 50 دورة ثم التقرير والإيقاف
+  python profiling.py /tmp/prof                                         # طباعة التقرير من جديد
+"""
+
+import io
+import gc
+import os
+import json
+import time
+import pstats
+import logging
+import argparse
+import cProfile
+import threading
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+from health import process_tree_rss_mb
+
+logger = logging.getLogger(__name__)
+
+# tracemalloc stack depth. Every allocation resolves the line of each frame, and
+# run_scraper's frame is long enough to make depth > 1 cost ~10x per allocation
+TRACE_FRAMES = 1
+TOP_LINES = 25     # rows per section in the per-cycle files and the report
+# The profiler's own allocations (snapshots, pstats) aren't the scraper's
+_OWN_FILES = (__file__, pstats.__file__, tracemalloc.__file__, cProfile.__file__)
+
+
+def _own_rss_mb() -> float | None:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _type_counts() -> dict[str, int]:
+    # Collect first: unreachable cycles aren't a leak, and it untracks the snapshots' tuples.
+    # A plain dict built here: a Counter kept between cycles would show up as growth in collections/
+    gc.collect()
+    return {kind.__qualname__: n for kind, n in Counter(map(type, gc.get_objects())).items()}
+
+
+class CycleProfiler:
+    """
+    stage(cycle) حول كل جزء من الدورة (الجلب والكتابة ممكن يكونون على threads مختلفة مع --async)،
+    end_cycle(cycle) بعد ما تخلص — يكتب ملفات الدورة. close() يكتب التقرير.
+    directory=None → ما يسوي شي (نفس HealthFile).
+    """
+
+    def __init__(self, directory: str | None, cycles: int | None = None, top: int = TOP_LINES):
+        self.directory = directory
+        self.cycles = cycles
+        self.top = top
+        self.rows: list[dict] = []
+        self._lock = threading.Lock()
+        self._profiles: dict[int, list[cProfile.Profile]] = {}
+        self._started: dict[int, float] = {}
+        self._first_snapshot = None
+        self._last_snapshot = None
+        self._first_types: dict[str, int] = {}
+        self._last_types: dict[str, int] = {}
+        if not directory:
+            return
+        os.makedirs(directory, exist_ok=True)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+        # Growth is measured from here: imports and startup don't count as a leak
+        self._first_snapshot = self._last_snapshot = self._snapshot()
+        self._first_types = self._last_types = _type_counts()
+        open(os.path.join(directory, "cycles.jsonl"), "w").close()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory)
+
+    def finished(self) -> bool:
+        """--profile-cycles: وصلنا العدد المطلوب من الدورات؟"""
+        return bool(self.cycles) and len(self._started) >= self.cycles
+
+    @staticmethod
+    def _snapshot():
+        # Unfiltered: Snapshot.filter_traces (fnmatch per frame) takes seconds on a
+        # real run — our own frames are dropped from the (short) diff instead
+        return tracemalloc.take_snapshot()
+
+    @staticmethod
+    def _growth(snapshot, since, key_type: str) -> list:
+        return [
+            stat for stat in snapshot.compare_to(since, key_type)
+            if stat.size_diff > 0 and not any(frame.filename in _OWN_FILES for frame in stat.traceback)
+        ]
+
+    def stage(self, cycle: int):
+        """cProfile للـ thread الحالي طول الـ with — كل الأجزاء تندمج في ملف الدورة."""
+        if not self.enabled:
+            return nullcontext()
+        return self._stage(cycle)
+
+    @contextmanager
+    def _stage(self, cycle: int):
+        with self._lock:
+            self._started.setdefault(cycle, time.perf_counter())
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as e:
+            # Python 3.12+: one profiler per interpreter — the other stage already has it
+            logger.debug(f"بروفايل الدورة #{cycle} شغّال من thread ثاني: {e}")
+            yield
+            return
+        try:
+            yield
+        finally:
+            profile.disable()
+            with self._lock:
+                self._profiles.setdefault(cycle, []).append(profile)
+
+    def end_cycle(self, cycle: int):
+        if not self.enabled:
+            return
+        with self._lock:
+            profiles = self._profiles.pop(cycle, [])
+            started = self._started.get(cycle, time.perf_counter())
+        seconds = time.perf_counter() - started
+        name = os.path.join(self.directory, f"cycle-{cycle:04d}")
+
+        if profiles:
+            stats = pstats.Stats(profiles[0])
+            for profile in profiles[1:]:
+                stats.add(profile)
+            stats.dump_stats(f"{name}.prof")
+            del stats  # merged from the files in close(), nothing kept between cycles
+
+        overhead_started = time.perf_counter()
+        snapshot = self._snapshot()
+        types = _type_counts()
+        line_diff = self._growth(snapshot, self._last_snapshot, "lineno")
+        type_diff = sorted(((n - self._last_types.get(t, 0), t, n) for t, n in types.items()), reverse=True)
+        with open(f"{name}-memory.txt", "w", encoding="utf-8") as f:
+            f.write(f"# cycle {cycle}: top {self.top} growth since the previous cycle\n\n")
+            for stat in line_diff[:self.top]:
+                f.write(f"{stat}\n")
+            f.write("\n# object types (count, change)\n\n")
+            for delta, type_name, count in type_diff[:self.top]:
+                f.write(f"{type_name:<40} {count:>9} {delta:>+8}\n")
+        self._last_snapshot, self._last_types = snapshot, types
+
+        current, peak = tracemalloc.get_traced_memory()
+        tree = process_tree_rss_mb()
+        own = _own_rss_mb()
+        row = {
+            "cycle": cycle,
+            "seconds": round(seconds, 3),
+            "python_rss_mb": round(own, 1) if own is not None else None,
+            # Playwright driver + Chromium (and anything else we spawned)
+            "children_rss_mb": round(tree - own, 1) if tree is not None and own is not None else None,
+            "traced_mb": round(current / (1024 * 1024), 2),
+            "traced_peak_mb": round(peak / (1024 * 1024), 2),
+            "top_growth": str(line_diff[0].traceback[-1]) if line_diff else "",
+            # snapshot + diff + object count (not included in "seconds")
+            "profiler_seconds": round(time.perf_counter() - overhead_started, 3),
+        }
+        self.rows.append(row)
+        with open(os.path.join(self.directory, "cycles.jsonl"), "a", encoding="utf-8") as f:
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        tracemalloc.reset_peak()
+
+    def report(self) -> str:
+        out = io.StringIO()
+        rows = self.rows
+        out.write(f"Kora scraper profile — {len(rows)} cycles\n\n")
+        if rows:
+            first, last = rows[0], rows[-1]
+            out.write("## memory trend (first → last cycle)\n\n")
+            for key in ("python_rss_mb", "children_rss_mb", "traced_mb"):
+                if first[key] is not None and last[key] is not None:
+                    out.write(f"{key:<18} {first[key]:>9} → {last[key]:<9} ({last[key] - first[key]:+.1f})\n")
+            seconds = sorted(row["seconds"] for row in rows)
+            out.write(f"{'cycle seconds':<18} p50 {seconds[len(seconds) // 2]:.3f}  max {seconds[-1]:.3f}\n")
+
+        if self._first_snapshot is not None and self._last_snapshot is not None:
+            out.write(f"\n## allocation growth since start (top {self.top}, tracemalloc)\n\n")
+            for stat in self._growth(self._last_snapshot, self._first_snapshot, "lineno")[:self.top]:
+                out.write(f"{stat.size_diff / 1024:+10.1f} KiB {stat.count_diff:+7} blocks  {stat.traceback[-1]}\n")
+
+        if self._last_types:
+            out.write(f"\n## object count growth since start (top {self.top})\n\n")
+            growth = sorted(
+                ((n - self._first_types.get(t, 0), t, n) for t, n in self._last_types.items()), reverse=True
+            )
+            for delta, type_name, count in growth[:self.top]:
+                if delta <= 0:
+                    break
+                out.write(f"{type_name:<40} {count:>9} {delta:>+8}\n")
+
+        merged = self._merged_stats()
+        if merged is not None:
+            out.write(f"\n## CPU, all cycles (top {self.top} by cumulative time)\n\n")
+            merged.stream = out
+            merged.files = []  # one header line per cycle file otherwise
+            merged.sort_stats("cumulative").print_stats(self.top)
+        return out.getvalue()
+
+    def _merged_stats(self) -> pstats.Stats | None:
+        files = [
+            os.path.join(self.directory, f"cycle-{row['cycle']:04d}.prof") for row in self.rows
+        ]
+        files = [path for path in files if os.path.exists(path)]
+        return pstats.Stats(*files) if files else None
+
+    def close(self):
+        if not self.enabled:
+            return
+        for cycle in sorted(self._profiles):  # cycles that never ended (shutdown mid-cycle)
+            self.end_cycle(cycle)
+        merged = self._merged_stats()
+        if merged is not None:
+            merged.dump_stats(os.path.join(self.directory, "all-cycles.prof"))
+        path = os.path.join(self.directory, "summary.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.report())
+        tracemalloc.stop()
+        logger.info(f"🔬 تقرير البروفايل ({len(self.rows)} دورة) → {path}")
+
+
+def load_rows(directory: str) -> list[dict]:
+    with open(os.path.join(directory, "cycles.jsonl"), encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    parser = argparse.ArgumentParser(description="⚽ Kora cycle profile report")
+    parser.add_argument("directory", help="مجلد --profile")
+    args = parser.parse_args()
+
+    summary = os.path.join(args.directory, "summary.txt")
+    if os.path.exists(summary):
+        with open(summary, encoding="utf-8") as f:
+            print(f.read())
+    else:
+        # Run still going (or killed): per-cycle rows are written as they happen
+        for row in load_rows(args.directory):
+            print(json.dumps(row, ensure_ascii=False))
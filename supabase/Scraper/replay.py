@@ -0,0 +1,181 @@
+"""
+replay.py — تسجيل الصفحات وإعادة تشغيلها بدون إنترنت
+  - Recorder (--record DIR): يحفظ كل صفحة انجلبت (القائمة + صفحات التفاصيل) لكل دورة
+  - ReplayServer (--replay DIR): يقدّم نفس الصفحات من سيرفر HTTP محلي، دورة بعد دورة
+
+شكل المجلد:
+  DIR/cycle-0001/manifest.json   {"/match-center/": "pages/3f2a....html", ...}
+  DIR/cycle-0001/pages/*.html
+  DIR/listing.txt                https://www.yallakora.com/match-center/
+"""
+
+import json
+import os
+import hashlib
+import logging
+import threading
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from urllib.parse import urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+
+def _request_path(url: str) -> str:
+    """المفتاح في manifest: المسار + الـ query (بدون الـ host)."""
+    parts = urlsplit(url)
+    return urlunsplit(("", "", parts.path or "/", parts.query, ""))
+
+
+def _cycle_dir(root: str, cycle: int) -> str:
+    return os.path.join(root, f"cycle-{cycle:04d}")
+
+
+# ──────────────────────────────────────────────
+# Recording
+# ──────────────────────────────────────────────
+
+class Recorder:
+    """
+    حفظ الصفحات المجلوبة على القرص. آمن من عدة threads (صفحات التفاصيل تنجلب بالتوازي).
+    """
+
+    def __init__(self, root: str, listing_url: str):
+        self.root = root
+        self.cycle = 0
+        self.saved = 0
+        self._manifest: dict[str, str] = {}
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        with open(os.path.join(root, "listing.txt"), "w") as f:
+            f.write(listing_url)
+
+    def next_cycle(self, cycle: int):
+        with self._lock:
+            self.cycle = cycle
+            self._manifest = {}
+            os.makedirs(os.path.join(_cycle_dir(self.root, cycle), "pages"), exist_ok=True)
+
+    def save(self, url: str, body: str):
+        if not self.cycle:
+            return
+        path = _request_path(url)
+        name = f"pages/{hashlib.sha1(path.encode()).hexdigest()[:16]}.html"
+        with self._lock:
+            cycle_dir = _cycle_dir(self.root, self.cycle)
+            with open(os.path.join(cycle_dir, name), "w", encoding="utf-8") as f:
+                f.write(body)
+            self._manifest[path] = name
+            tmp_path = os.path.join(cycle_dir, "manifest.json.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._manifest, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, os.path.join(cycle_dir, "manifest.json"))
+            self.saved += 1
+
+
+# ──────────────────────────────────────────────
+# Replay
+# ──────────────────────────────────────────────
+
+def _load_manifest(root: str, cycle: int) -> dict[str, str]:
+    with open(os.path.join(_cycle_dir(root, cycle), "manifest.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def recorded_cycles(root: str) -> list[int]:
+    return sorted(
+        int(name.split("-", 1)[1])
+        for name in os.listdir(root)
+        if name.startswith("cycle-") and os.path.isfile(os.path.join(root, name, "manifest.json"))
+    )
+
+
+def recorded_pages(root: str) -> tuple[list[str], list[str]]:
+    """
+    كل الصفحات المسجّلة (للقياس في bench/recording.py).
+    Returns: (صفحات القائمة، صفحات التفاصيل)
+    """
+    with open(os.path.join(root, "listing.txt")) as f:
+        listing_path = _request_path(f.read().strip())
+
+    listings, details = [], []
+    for cycle in recorded_cycles(root):
+        for path, name in _load_manifest(root, cycle).items():
+            with open(os.path.join(_cycle_dir(root, cycle), name), encoding="utf-8") as f:
+                (listings if path == listing_path else details).append(f.read())
+    return listings, details
+
+
+class _ReplayHandler(SimpleHTTPRequestHandler):
+    def __init__(self, *args, replay: "ReplayServer", **kwargs):
+        self.replay = replay
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        body = self.replay.page(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass  # keep the scraper log readable
+
+
+class ReplayServer:
+    """
+    سيرفر HTTP محلي يقدّم الدورات المسجّلة بالترتيب — advance() ينتقل للدورة التالية.
+    الروابط المطلقة للموقع الأصلي تتحوّل لعنوان السيرفر المحلي،
+    والصفحة الناقصة في دورة تُؤخذ من آخر دورة قبلها فيها نفس الصفحة.
+    """
+
+    def __init__(self, root: str, host: str = "127.0.0.1", port: int = 0):
+        self.root = root
+        self.cycles = recorded_cycles(root)
+        if not self.cycles:
+            raise FileNotFoundError(f"ما فيه دورات مسجّلة في {root}")
+        with open(os.path.join(root, "listing.txt")) as f:
+            self.recorded_listing_url = f.read().strip()
+        parts = urlsplit(self.recorded_listing_url)
+        self.origin = f"{parts.scheme}://{parts.netloc}"
+
+        self._position = -1
+        self._manifests = {cycle: _load_manifest(root, cycle) for cycle in self.cycles}
+        self._server = ThreadingHTTPServer((host, port), partial(_ReplayHandler, replay=self))
+        self.base_url = f"http://{host}:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"📼 إعادة تشغيل {len(self.cycles)} دورة من {root} على {self.base_url}")
+
+    @property
+    def cycle(self) -> int | None:
+        return self.cycles[self._position] if self._position >= 0 else None
+
+    def advance(self) -> bool:
+        """الانتقال للدورة التالية. Returns: False لو خلصت الدورات."""
+        if self._position + 1 >= len(self.cycles):
+            return False
+        self._position += 1
+        return True
+
+    @property
+    def listing_url(self) -> str:
+        """رابط صفحة المباريات المسجّلة على السيرفر المحلي."""
+        return self.base_url + _request_path(self.recorded_listing_url)
+
+    def page(self, path: str) -> str | None:
+        for cycle in reversed(self.cycles[:max(self._position, 0) + 1]):
+            name = self._manifests[cycle].get(path)
+            if name:
+                with open(os.path.join(_cycle_dir(self.root, cycle), name), encoding="utf-8") as f:
+                    return f.read().replace(self.origin, self.base_url)
+        return None
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,209 @@
+"""
+resolver.py — ربط أسماء الفرق والدوريات بالـ IDs من الذاكرة
+يحمّل كل الفرق والدوريات باستعلام واحد لكل جدول، ويحل أسماء الدورة كاملة دفعة وحدة،
+وينشئ الناقص بـ INSERT واحد متعدد الصفوف.
+"""
+
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from normalize import normalize_name, TrigramIndex
+
+logger = logging.getLogger(__name__)
+
+
+class NameIndex:
+    """
+    فهرس أسماء في الذاكرة: مطابقة تامة ← اسم موحّد (normalize_name) ← تشابه trigram.
+    الأسماء البديلة (مثل short_name) تُضاف كـ aliases لنفس الـ ID.
+    """
+
+    def __init__(self):
+        self.exact: dict[str, str] = {}       # name -> id
+        self.normalized: dict[str, str] = {}  # normalize_name(name) -> id
+        self.fuzzy = TrigramIndex()
+
+    def __len__(self):
+        return len(self.exact)
+
+    def add(self, name: str, entity_id: str, aliases: tuple = ()):
+        self.exact[name] = entity_id
+        for variant in (name, *aliases):
+            key = normalize_name(variant)
+            if key:
+                self.normalized.setdefault(key, entity_id)
+                self.fuzzy.add(variant, entity_id)
+
+    def remove_ids(self, ids: set[str]):
+        self.exact = {k: v for k, v in self.exact.items() if v not in ids}
+        self.normalized = {k: v for k, v in self.normalized.items() if v not in ids}
+        self.fuzzy.remove_ids(ids)
+
+    def lookup(self, name: str) -> str | None:
+        entity_id = self.exact.get(name)
+        if entity_id:
+            return entity_id
+
+        key = normalize_name(name)
+        entity_id = self.normalized.get(key)
+        if entity_id:
+            self.exact[name] = entity_id  # remember the raw spelling
+            return entity_id
+
+        # Confident, unambiguous trigram match only — a bare "الأهلي" must not
+        # grab whichever Ahly happens to come first (the old ILIKE '%name%' bug)
+        match = self.fuzzy.best_match(name)
+        if match:
+            logger.debug(f"🔎 مطابقة تقريبية: {name} → {match.name} ({match.score:.2f})")
+            self.exact[name] = match.entity_id
+            return match.entity_id
+        return None
+
+
+class EntityResolver:
+    """
+    يحل أسماء الدوريات والفرق إلى IDs.
+
+    - preload(): استعلام واحد لكل جدول عند أول استخدام
+    - resolve_leagues() / resolve_teams(): دفعة أسماء كاملة
+    - الأسماء الناقصة: SELECT واحد (لو أضافها أحد آخر) ثم INSERT واحد متعدد الصفوف
+    - commit() / rollback(): الـ IDs المنشأة في transaction فاشلة تُحذف من الفهرس
+    """
+
+    def __init__(self):
+        self.leagues = NameIndex()
+        self.teams = NameIndex()
+        self.loaded = False
+        self._pending_ids: set[str] = set()
+        self.stats = {
+            "lookups": 0,
+            "hits": 0,
+            "created": 0,
+            "queries": 0,
+            "round_trips_saved": 0,
+        }
+
+    # ── Loading ──
+
+    def preload(self, session: Session):
+        """تحميل كل الدوريات والفرق (استعلامين فقط)."""
+        self.leagues = NameIndex()
+        self.teams = NameIndex()
+
+        for entity_id, name in session.execute(text("SELECT id, name FROM public.leagues")):
+            self.leagues.add(name, str(entity_id))
+        for entity_id, name, short_name in session.execute(
+            text("SELECT id, name, short_name FROM public.teams")
+        ):
+            self.teams.add(name, str(entity_id), aliases=(short_name,) if short_name else ())
+
+        self.stats["queries"] += 2
+        self.loaded = True
+        logger.info(f"📚 تم تحميل {len(self.leagues)} دوري و {len(self.teams)} فريق في الذاكرة")
+
+    def _ensure_loaded(self, session: Session):
+        if not self.loaded:
+            self.preload(session)
+
+    # ── Resolution ──
+
+    def _resolve(self, session: Session, index: NameIndex, table: str, names: list[str], make_row) -> dict[str, str]:
+        """
+        حل دفعة أسماء على فهرس واحد. make_row(name) يرجع أعمدة الـ INSERT للاسم الناقص.
+        """
+        resolved: dict[str, str] = {}
+        missing: list[str] = []
+        queries = 0
+
+        for name in dict.fromkeys(n for n in names if n):
+            self.stats["lookups"] += 1
+            entity_id = index.lookup(name)
+            if entity_id:
+                self.stats["hits"] += 1
+                resolved[name] = entity_id
+            else:
+                missing.append(name)
+
+        # Old per-name path: exact SELECT, then ILIKE SELECT on a miss, then INSERT
+        old_queries = len(resolved) + 2 * len(missing)
+        if not missing:
+            self.stats["round_trips_saved"] += old_queries
+            return resolved
+
+        # Another scraper instance may be creating the same names right now; serialize
+        # per table until commit (transaction-scoped, safe behind the pooler)
+        session.execute(text("SELECT pg_advisory_xact_lock(hashtext(:lock))"), {"lock": f"kora:{table}"})
+        queries += 1
+
+        # Someone else (another run, the dashboard) may have added them since preload
+        rows = session.execute(
+            text(f"SELECT id, name FROM public.{table} WHERE name = ANY(:names)"),
+            {"names": missing},
+        ).fetchall()
+        queries += 1
+        for entity_id, name in rows:
+            index.add(name, str(entity_id))
+            resolved[name] = str(entity_id)
+
+        to_create = [name for name in missing if name not in resolved]
+        if to_create:
+            new_rows = [make_row(name) for name in to_create]
+            columns = list(new_rows[0].keys())
+            values = ", ".join(
+                "(" + ", ".join(f":{col}_{i}" for col in columns) + ")"
+                for i in range(len(new_rows))
+            )
+            params = {f"{col}_{i}": row[col] for i, row in enumerate(new_rows) for col in columns}
+            created = session.execute(
+                text(f"INSERT INTO public.{table} ({', '.join(columns)}) VALUES {values} RETURNING id, name"),
+                params,
+            ).fetchall()
+            queries += 1
+            old_queries += len(created)
+            self.stats["created"] += len(created)
+
+            for entity_id, name in created:
+                logger.info(f"🆕 إنشاء {'دوري' if table == 'leagues' else 'فريق'} جديد: {name}")
+                index.add(name, str(entity_id))
+                self._pending_ids.add(str(entity_id))
+                resolved[name] = str(entity_id)
+
+        self.stats["queries"] += queries
+        self.stats["round_trips_saved"] += old_queries - queries
+        return resolved
+
+    def resolve_leagues(self, session: Session, names: list[str]) -> dict[str, str]:
+        """أسماء الدوريات → IDs (ينشئ الناقص)."""
+        self._ensure_loaded(session)
+        return self._resolve(
+            session, self.leagues, "leagues", names,
+            lambda name: {"name": name, "country": "Unknown"},
+        )
+
+    def resolve_teams(self, session: Session, teams: dict[str, tuple[str, str | None]]) -> dict[str, str]:
+        """
+        أسماء الفرق → IDs (ينشئ الناقص).
+        teams: {name: (logo_url, league_id)} — تُستخدم فقط عند الإنشاء.
+        """
+        self._ensure_loaded(session)
+        return self._resolve(
+            session, self.teams, "teams", list(teams),
+            lambda name: {"name": name, "logo_url": teams[name][0] or "", "league_id": teams[name][1]},
+        )
+
+    # ── Transaction bookkeeping ──
+
+    def commit(self):
+        self._pending_ids.clear()
+
+    def rollback(self):
+        """الفرق/الدوريات المنشأة في الـ transaction الفاشلة ما عادت موجودة."""
+        if self._pending_ids:
+            self.leagues.remove_ids(self._pending_ids)
+            self.teams.remove_ids(self._pending_ids)
+            self._pending_ids.clear()
+
+    def hit_rate(self) -> float:
+        return self.stats["hits"] / self.stats["lookups"] if self.stats["lookups"] else 0.0
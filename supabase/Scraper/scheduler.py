@@ -0,0 +1,102 @@
+"""
+scheduler.py — جدولة الدورات حسب حالة المباريات
+بدل انتظار ثابت 30 ثانية: سريع وقت المباريات المباشرة، وبطيء لما ما فيه شي قريب
+"""
+
+import time
+from datetime import datetime
+
+from parsing import ScrapedMatch
+
+# Human-readable reasons for the log line
+REASON_LABELS = {
+    "live": "مباريات مباشرة",
+    "kickoff_soon": "مباراة تبدأ قريباً",
+    "next_kickoff": "انتظار أقرب مباراة",
+    "idle": "لا توجد مباريات قادمة",
+    "no_data": "لا توجد بيانات",
+    "budget": "نهاية وقت التشغيل",
+    "lease": "تجديد الـ lease",
+}
+
+
+def _has_kickoff_time(start_time) -> bool:
+    """
+    Cards without a parsed time carry start_time = scrape time (parse_card), which
+    always looks like a kickoff that just passed. Parsed kickoffs are whole minutes.
+    """
+    return isinstance(start_time, datetime) and start_time.second == 0 and start_time.microsecond == 0
+
+
+class PollScheduler:
+    """
+    يختار وقت الدورة القادمة من حالة المباريات الحالية.
+
+    - مباراة مباشرة → live_interval
+    - مباراة تبدأ خلال kickoff_window، أو بدأ وقتها من أقل من kickoff_grace وبطاقتها لسه "upcoming"
+      → live_interval (استعداد لصافرة البداية — الموقع يتأخر كم دقيقة في تحويلها لمباشر)
+    - أقرب مباراة بعيدة → انتظار لين تبدأ نافذة ما قبل المباراة
+    - لا توجد مباريات قادمة → max_interval
+    - لا توجد بيانات (فشل الجلب) → default_interval
+
+    النتيجة دائماً بين min_interval و max_interval ولا تتجاوز الـ deadline.
+    clock قابل للحقن (للاختبار) ويرجع epoch seconds.
+    """
+
+    def __init__(
+        self,
+        min_interval: float = 10,
+        max_interval: float = 300,
+        live_interval: float = 10,
+        default_interval: float = 30,
+        kickoff_window: float = 600,
+        kickoff_grace: float = 900,
+        clock=time.time,
+    ):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.live_interval = live_interval
+        self.default_interval = default_interval
+        self.kickoff_window = kickoff_window
+        self.kickoff_grace = kickoff_grace
+        self.clock = clock
+
+    def next_kickoff(self, matches: list[ScrapedMatch], now: float) -> float | None:
+        """
+        أقرب وقت بداية (epoch) لمباراة قادمة، أو None. يشمل اللي بدأ وقتها من أقل من
+        kickoff_grace (البطاقة لسه "upcoming") — النتيجة ممكن تكون قبل now.
+        """
+        kickoffs = [
+            m.start_time.timestamp()
+            for m in matches
+            if m.status == "upcoming" and _has_kickoff_time(m.start_time)
+        ]
+        due = [k for k in kickoffs if k > now - self.kickoff_grace]
+        return min(due) if due else None
+
+    def next_interval(self, matches: list[ScrapedMatch], deadline: float | None = None) -> tuple[float, str]:
+        """
+        Returns: (ثواني الانتظار, السبب) — السبب واحد من مفاتيح REASON_LABELS.
+        deadline: epoch لنهاية وقت التشغيل (None = بدون حد).
+        """
+        now = self.clock()
+
+        if not matches:
+            interval, reason = self.default_interval, "no_data"
+        elif any(m.status == "live" for m in matches):
+            interval, reason = self.live_interval, "live"
+        else:
+            kickoff = self.next_kickoff(matches, now)
+            if kickoff is None:
+                interval, reason = self.max_interval, "idle"
+            elif kickoff - now <= self.kickoff_window:
+                interval, reason = self.live_interval, "kickoff_soon"
+            else:
+                interval, reason = kickoff - now - self.kickoff_window, "next_kickoff"
+
+        interval = max(self.min_interval, min(self.max_interval, interval))
+
+        if deadline is not None and deadline - now < interval:
+            interval, reason = max(0.0, deadline - now), "budget"
+
+        return interval, reason
@@ -1,19 +1,25 @@
 """
 scraper.py — سكرابر نتائج المباريات المباشرة من Yallakora
 يشتغل في حلقة مستمرة لمدة 5 دقائق (280 ثانية)
-كل 30 ثانية يجلب البيانات ويحدّث قاعدة البيانات
+يجلب البيانات ويحدّث قاعدة البيانات — كل 10 ثواني وقت المباريات المباشرة،
+وأبطأ لما ما فيه مباريات قريبة (انظر scheduler.py)
 
 الاستخدام:
   python scraper.py              # تشغيل الحلقة الكاملة
   python scraper.py --once       # تشغيل مرة واحدة فقط (للاختبار)
   python scraper.py --dry-run    # جلب البيانات بدون تحديث الـ DB
+  python scraper.py --daemon     # تشغيل دائم (خادم/حاوية) حتى SIGTERM
+  python scraper.py --async      # الجلب والكتابة متداخلين (انظر pipeline.py)
 """
 
 import sys
 import time
+import signal
 import logging
+import asyncio
 import argparse
-import re
+import threading
+from functools import partial
 from datetime import datetime, timezone, timedelta
 
 try:
@@ -22,23 +28,85 @@ try:
 except ImportError:
     pass  # في بيئة CI/CD الـ env vars تكون جاهزة
 
-from playwright.sync_api import sync_playwright
-
-from database import get_session, upsert_matches
+from database import (
+    session_scope,
+    upsert_matches,
+    update_match_details,
+    insert_match_events,
+    seed_fingerprint_cache,
+    get_pool_stats,
+    get_resolver_stats,
+    dispose_engine,
+)
+import metrics
+from sources import SourcePool, YallakoraAdapter, make_source
+from details import DetailFetcher
+from standings import StandingsEngine
+from pipeline import run_pipeline
+from replay import Recorder, ReplayServer
+from scheduler import PollScheduler, REASON_LABELS
+from health import HealthFile, process_tree_rss_mb
+from discovery import CONTAINER_CANDIDATES, known_layouts, record_layout
+from spool import MatchSpool
+from tiers import TieredCrawler
+from coordination import Coordinator, MODES as COORDINATION_MODES
+from profiling import CycleProfiler
+from parsing import (
+    MATCH_CONTAINER_SELECTOR,
+    MATCH_CONTAINER_FALLBACK_SELECTOR,
+    FIELD_SELECTORS,
+    parse_score,
+    parse_minute,
+    map_status,
+    build_match_from_raw,
+    partition_live,
+    ScrapedMatch,
+)
 
 # ──────────────────────────────────────────────
 # Configuration
 # ──────────────────────────────────────────────
 
-YALLAKORA_URL = "https://www.yallakora.com/match-center/"
+YALLAKORA_URL = YallakoraAdapter.DEFAULT_URL
+DEFAULT_SOURCES = ["yallakora"]  # --source: أول مصدر هو الأساسي (الأسماء منه)
+SOURCE_TIMEOUT_SECONDS = 10   # انتظار المصادر في الدورة — المتأخر تُستخدم آخر نتيجة له
+SOURCE_MAX_AGE_SECONDS = 60   # أقدم نتيجة مسموحة من مصدر متأخر/متعطّل
 LOOP_DURATION_SECONDS = 280   # 4 دقائق و 40 ثانية (أقل من GitHub Actions timeout)
-SLEEP_INTERVAL_SECONDS = 30   # كل 30 ثانية
+SLEEP_INTERVAL_SECONDS = 30   # الانتظار الافتراضي لو ما فيه بيانات
+LIVE_POLL_SECONDS = 10        # وقت المباريات المباشرة
+MIN_POLL_SECONDS = 10
+MAX_POLL_SECONDS = 300        # لما ما فيه مباريات قريبة
+KICKOFF_WINDOW_SECONDS = 600  # نبدأ الجلب السريع قبل المباراة بـ 10 دقائق
+KICKOFF_GRACE_SECONDS = 900   # ونكمل لين 15 دقيقة بعد موعدها لو بطاقتها لسه "upcoming"
+TODAY_HOT_TTL_SECONDS = 5     # صفحة اليوم وفيها مباراة جارية/قريبة — كل دورة
+TODAY_WARM_TTL_SECONDS = 300  # صفحة اليوم وما فيها شي جاري
+FIXTURE_DAYS_AHEAD = 3        # صفحات الأيام الجاية (--days-ahead، 0 = بدونها)
+FIXTURE_TTL_SECONDS = 6 * 3600  # صفحة يوم جاي تنجلب من جديد بعدها (GET شرطي)
+FIXTURE_PAGES_PER_CYCLE = 1   # أقصى عدد صفحات أيام جاية في الدورة الواحدة
+LEASE_TTL_SECONDS = 30        # --coordination: نسخة وقفت تنتهي leases حقها بعدها
+LEASE_RENEW_SECONDS = 10      # تجديد الـ lease (يتحمّل فشل تجديد واحد)
+STANDINGS_INCLUDE_LIVE = True # جدول الترتيب يحسب المباريات الجارية بنتيجتها الحالية
+DETAIL_WORKERS = 4            # صفحات تفاصيل متزامنة (الكل)
+DETAIL_PER_HOST = 2           # ولنفس الموقع
+DETAIL_BUDGET_SECONDS = 8     # أقصى وقت للتفاصيل في الدورة — الباقي يكمل بالخلفية
+DETAIL_LIVE_TTL_SECONDS = 20  # صفحة المباراة المباشرة تنجلب من جديد بعدها (الأحداث)
+RENDER_TIMEOUT_MS = 10000     # أقصى انتظار لظهور بطاقات المباريات
+RENDER_STABLE_MS = 500        # الصفحة جاهزة لما عدد البطاقات يثبت هالمدة
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+BLOCKED_HOSTS = (              # إعلانات وتحليلات — ما نحتاجها للنتائج
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net",
+    "googlesyndication.com", "adservice.google", "facebook.net", "connect.facebook",
+    "scorecardresearch.com", "taboola.com", "outbrain.com", "hotjar.com",
+)
+BROWSER_RECYCLE_CYCLES = 200       # إعادة تشغيل المتصفح بعد N دورة (الوضع الدائم)
+BROWSER_RSS_GROWTH_LIMIT_MB = 300  # أو لو زادت الذاكرة بهذا المقدار عن بدايته
 USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
     "AppleWebKit/537.36 (KHTML, like Gecko) "
     "Chrome/131.0.0.0 Safari/537.36"
 )
 
+
 # ──────────────────────────────────────────────
 # Logging
 # ──────────────────────────────────────────────
@@ -56,222 +124,348 @@ logger = logging.getLogger(__name__)
 # ──────────────────────────────────────────────
 
 
-def parse_score(score_text: str) -> tuple[int, int]:
-    """تحويل نص النتيجة إلى أرقام. مثال: '2 - 1' → (2, 1)"""
-    score_text = score_text.strip()
-    # Try common separators
-    for sep in ["-", "–", ":"]:
-        if sep in score_text:
-            parts = score_text.split(sep)
-            try:
-                return int(parts[0].strip()), int(parts[1].strip())
-            except (ValueError, IndexError):
-                continue
-    return 0, 0
+# Runs inside the browser: finds the match cards (discovery.py's algorithm — layout
+# hash, cached selectors or discovery, outermost two-team cards only) and returns
+# the raw text/attribute fields, so a whole page costs a single IPC round-trip.
+EXTRACT_MATCHES_JS = """
+([candidates, layouts, sel]) => {
+    const text = (el) => (el ? (el.innerText || "").trim() : "");
+    const logo = (team) => {
+        const img = team.querySelector("img");
+        return img ? (img.getAttribute("src") || img.getAttribute("data-src") || "") : "";
+    };
+    const insideAny = (el, set) => {
+        for (let a = el.parentElement; a; a = a.parentElement) {
+            if (set.has(a)) return true;
+        }
+        return false;
+    };
+
+    // Layout hash: distinct tag.class signatures without digits (FNV-1a)
+    const signatures = new Set();
+    for (const el of document.getElementsByTagName("*")) {
+        signatures.add(el.tagName.toLowerCase() + "." + (el.getAttribute("class") || "").replace(/[0-9]+/g, ""));
+    }
+    let hash = 0x811c9dc5;
+    const skeleton = Array.from(signatures).sort().join("\\n");
+    for (let i = 0; i < skeleton.length; i++) {
+        hash = Math.imul(hash ^ skeleton.charCodeAt(i), 0x01000193) >>> 0;
+    }
+    const layout = "js-" + hash.toString(16).padStart(8, "0");
+
+    const outermost = (nodes, within, limit) => {
+        const set = new Set(nodes);
+        const out = [];
+        for (const node of nodes) {
+            let p = node.parentElement;
+            while (p && p !== within && !set.has(p)) p = p.parentElement;
+            if (!p || p === within) {
+                out.push(node);
+                if (out.length >= limit) break;
+            }
+        }
+        return out;
+    };
+    const teamNodes = (el) => {
+        let found = Array.from(el.querySelectorAll(sel.team));
+        let nodes = outermost(found, el, 3);
+        while (nodes.length === 1) {
+            const top = nodes[0];
+            const inside = found.filter((n) => n !== top && top.contains(n));
+            const inner = outermost(inside, top, 3);
+            if (!inner.length) break;
+            nodes = inner;
+            found = inside;
+        }
+        return nodes;
+    };
+    const outermostCards = (elements) => {
+        const valid = elements.filter((el) => teamNodes(el).length === 2);
+        const validSet = new Set(valid);
+        return valid.filter((el) => !insideAny(el, validSet));
+    };
+    const query = (selectors) => Array.from(document.querySelectorAll(selectors.join(",")));
+
+    let selectors = [], cards = [], scanned = 0, exact = false, cached = false;
+    const known = layouts[layout];
+    if (known) {
+        [selectors, exact] = known;
+        const found = query(selectors);
+        cards = exact ? found : outermostCards(found);
+        scanned = found.length;
+        cached = cards.length > 0;
+    }
+    if (!cached) {
+        const scored = [];
+        scanned = 0;
+        for (const css of candidates) {
+            const found = Array.from(document.querySelectorAll(css));
+            scanned += found.length;
+            const valid = outermostCards(found);
+            if (valid.length) scored.push([css, valid]);
+        }
+        scored.sort((a, b) => b[1].length - a[1].length);  // stable: candidate order breaks ties
+        const covered = new Set(), chosenCards = new Set();
+        selectors = [];
+        for (const [css, valid] of scored) {
+            if (!valid.some((c) => !covered.has(c) && !insideAny(c, chosenCards))) continue;
+            selectors.push(css);
+            for (const card of valid) {
+                chosenCards.add(card);
+                for (let a = card; a; a = a.parentElement) covered.add(a);
+            }
+        }
+        const found = selectors.length ? query(selectors) : [];
+        cards = outermostCards(found);
+        exact = cards.length === found.length;
+    }
 
+    // League heading outside the cards (grouped layout: heading, then its cards)
+    const cardSet = new Set(cards);
+    const headings = new Map();
+    if (cards.length) {
+        let current = "";
+        for (const el of query([...selectors, sel.league])) {
+            if (cardSet.has(el)) {
+                if (current) headings.set(el, current);
+            } else if (el.matches(sel.league) && !insideAny(el, cardSet)) {
+                current = text(el);
+            }
+        }
+    }
 
-def parse_minute(minute_text: str) -> int:
-    """
-    تحويل نص الدقيقة إلى رقم.
-    أمثلة: "45'" → 45, "45+2'" → 47, "HT" → 45, "FT" → 90
-    """
-    minute_text = minute_text.strip().replace("'", "").replace("′", "")
+    const raws = cards.map((el) => {
+        try {
+            const raw = {
+                home_team: "", away_team: "", home_logo: "", away_logo: "",
+                lines: [],
+                score: text(el.querySelector(sel.score)),
+                status: text(el.querySelector(sel.status)),
+                league: text(el.querySelector(sel.league)) || headings.get(el) || "",
+                time: text(el.querySelector(sel.time)),
+                channel: text(el.querySelector(sel.channel)),
+                round: text(el.querySelector(sel.round)),
+                detail_url: "",
+            };
+            const link = el.closest("a[href]") || el.querySelector("a[href]");
+            if (link) {
+                raw.detail_url = link.href;  // already absolute
+            }
+            const teams = teamNodes(el);
+            if (teams.length >= 2) {
+                raw.home_team = text(teams[0].querySelector(sel.team_name) || teams[0]);
+                raw.away_team = text(teams[1].querySelector(sel.team_name) || teams[1]);
+                raw.home_logo = logo(teams[0]);
+                raw.away_logo = logo(teams[1]);
+            }
+            if (!raw.home_team || !raw.away_team) {
+                raw.lines = (el.innerText || "").split("\\n").map((t) => t.trim()).filter(Boolean);
+            }
+            return raw;
+        } catch (e) {
+            return null;
+        }
+    });
+    return { layout, selectors, exact, cached, scanned, raws };
+}
+"""
+
+# Ready when the number of match cards stops changing for RENDER_STABLE_MS.
+# A day with no matches is ready once the page finished loading and stayed empty
+# a little longer. State lives on window, so every navigation starts fresh.
+RENDER_READY_JS = """
+([containerSelector, fallbackSelector, stableMs]) => {
+    const count = document.querySelectorAll(containerSelector).length
+        || document.querySelectorAll(fallbackSelector).length;
+    const now = performance.now();
+    const state = window.__koraReady || (window.__koraReady = { count: -1, since: now });
+    if (count !== state.count) {
+        state.count = count;
+        state.since = now;
+        return false;
+    }
+    const stableFor = now - state.since;
+    if (count > 0) {
+        return stableFor >= stableMs;
+    }
+    return document.readyState === "complete" && stableFor >= stableMs * 4;
+}
+"""
 
-    if minute_text in ("HT", "ش.أ", "نهاية الشوط"):
-        return 45
-    if minute_text in ("FT", "ن.م", "نهاية المباراة"):
-        return 90
 
-    # Handle "45+2" format
-    match = re.match(r"(\d+)\+(\d+)", minute_text)
-    if match:
-        return int(match.group(1)) + int(match.group(2))
+def scrape_matches(page, extraction: str = "page", url: str | None = None, recorder=None) -> list[ScrapedMatch]:
+    """
+    جلب بيانات المباريات من صفحة Yallakora.
+    يرجع list[ScrapedMatch] جاهزة للـ upsert.
+
+    extraction:
+      - "page": استخراج كل المباريات بـ page.evaluate واحد (الافتراضي)
+      - "element": استخراج عنصر بعنصر عبر ElementHandle (أبطأ، احتياطي)
+    url: رابط الصفحة (الافتراضي YALLAKORA_URL — يتغيّر في --replay)
+    recorder: replay.Recorder يحفظ الصفحة بعد رسمها (--record)
+    """
+    url = url or YALLAKORA_URL
+    today = datetime.now(timezone.utc).date()
 
     try:
-        return int(minute_text)
-    except ValueError:
-        return 0
+        # Navigate
+        with metrics.timer("navigation"):
+            page.goto(url, wait_until="domcontentloaded", timeout=30000)
+        with metrics.timer("render_wait"):
+            wait_until_ready(page)
+        if recorder:
+            recorder.save(url, page.content())
+
+        if extraction == "page":
+            try:
+                with metrics.timer("extraction"):
+                    return extract_matches_in_page(page, today)
+            except Exception as e:
+                logger.warning(f"⚠️ فشل الاستخراج داخل الصفحة — الرجوع لعنصر بعنصر: {e}")
 
+        return extract_matches_by_element(page, today)
+
+    except Exception as e:
+        # A page that never loaded is a failed cycle, not "no matches" (health.cycle_failed)
+        logger.error(f"❌ خطأ في جلب الصفحة: {e}")
+        raise
 
-def map_status(status_text: str) -> str:
-    """تحويل حالة المباراة من النص العربي/الإنجليزي إلى enum الـ DB."""
-    status_lower = status_text.strip().lower()
 
-    live_keywords = [
-        "live", "مباشر", "جارية", "الشوط", "شوط", "ش.أ", "ش.ث",
-        "بدأت", "استراحة", "ht", "extra", "إضافي",
-    ]
-    finished_keywords = [
-        "finished", "ft", "انتهت", "ن.م", "نهاية", "ended",
-    ]
+def wait_until_ready(page) -> float:
+    """
+    انتظار رسم بطاقات المباريات بدل الانتظار الثابت:
+    جاهزة لما يثبت عددها RENDER_STABLE_MS، وبحد أقصى RENDER_TIMEOUT_MS.
+    Returns: الزمن حتى الجاهزية (ثواني)
+    """
+    started = time.perf_counter()
+    try:
+        page.wait_for_function(
+            RENDER_READY_JS,
+            arg=[MATCH_CONTAINER_SELECTOR, MATCH_CONTAINER_FALLBACK_SELECTOR, RENDER_STABLE_MS],
+            polling=100,
+            timeout=RENDER_TIMEOUT_MS,
+        )
+        elapsed = time.perf_counter() - started
+        logger.info(f"⚡ الصفحة جاهزة خلال {elapsed:.2f}s")
+    except Exception as e:
+        # Extract whatever rendered so far — same as the old fixed wait running out
+        elapsed = time.perf_counter() - started
+        logger.warning(f"⚠️ الصفحة ما ثبتت خلال {RENDER_TIMEOUT_MS / 1000:g}s — استخراج الموجود: {e}")
+    return elapsed
 
-    for kw in live_keywords:
-        if kw in status_lower:
-            return "live"
-    for kw in finished_keywords:
-        if kw in status_lower:
-            return "finished"
 
-    return "upcoming"
+def _block_heavy_requests(route):
+    """صور، خطوط، إعلانات وتحليلات — ما نحتاجها لقراءة النتائج (شعارات الفرق تُقرأ من src فقط)."""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(
+        host in request.url for host in BLOCKED_HOSTS
+    ):
+        return route.abort()
+    return route.continue_()
 
 
-def scrape_matches(page) -> list[dict]:
+def extract_matches_in_page(page, today) -> list[ScrapedMatch]:
     """
-    جلب بيانات المباريات من صفحة Yallakora.
-    يرجع قائمة dictionaries جاهزة للـ upsert.
+    استخراج كل المباريات بنداء page.evaluate واحد.
+    المتصفح يرجع الحقول الخام كـ JSON، والتحليل (النتيجة، الدقيقة، الحالة) يتم في Python.
     """
+    found = page.evaluate(
+        EXTRACT_MATCHES_JS,
+        [list(CONTAINER_CANDIDATES), known_layouts(), FIELD_SELECTORS],
+    )
+    record_layout(found["layout"], tuple(found["selectors"]), found["exact"], cached=found["cached"])
+    raw_matches = found["raws"]
+    logger.info(f"📦 وُجد {len(raw_matches)} بطاقة مباراة من {found['scanned']} عنصر في الصفحة")
+
     matches = []
-    today = datetime.now(timezone.utc).date()
+    for raw in raw_matches:
+        if not raw:
+            continue
+        try:
+            match_data = build_match_from_raw(raw, today)
+            if match_data:
+                matches.append(match_data)
+        except Exception as e:
+            logger.debug(f"⏭️ تخطي عنصر: {e}")
+    return matches
 
-    try:
-        # Navigate
-        page.goto(YALLAKORA_URL, wait_until="domcontentloaded", timeout=30000)
-        page.wait_for_timeout(3000)  # Wait for JS to render
 
-        # Try multiple selectors (Yallakora changes layout occasionally)
-        match_containers = page.query_selector_all(
-            ".matchCard, .match-card, .liItem, .item, [class*='match']"
-        )
+def extract_matches_by_element(page, today) -> list[ScrapedMatch]:
+    """
+    الطريقة القديمة (احتياطي): ElementHandle لكل بطاقة، ونداء للمتصفح لكل حقل.
+    """
+    # Try multiple selectors (Yallakora changes layout occasionally)
+    match_containers = page.query_selector_all(MATCH_CONTAINER_SELECTOR)
 
-        if not match_containers:
-            # Fallback: try the main content area
-            match_containers = page.query_selector_all(
-                "#matchesContainer .item, .allData .item, .matchesList .item"
-            )
+    if not match_containers:
+        # Fallback: try the main content area
+        match_containers = page.query_selector_all(MATCH_CONTAINER_FALLBACK_SELECTOR)
 
-        logger.info(f"📦 وُجد {len(match_containers)} عنصر مباراة في الصفحة")
+    logger.info(f"📦 وُجد {len(match_containers)} عنصر مباراة في الصفحة")
 
-        for container in match_containers:
-            try:
+    matches = []
+    for container in match_containers:
+        try:
+            with metrics.timer("extraction"):
                 match_data = extract_match_from_element(container, today)
-                if match_data:
-                    matches.append(match_data)
-            except Exception as e:
-                logger.debug(f"⏭️ تخطي عنصر: {e}")
-                continue
-
-    except Exception as e:
-        logger.error(f"❌ خطأ في جلب الصفحة: {e}")
-
+            if match_data:
+                matches.append(match_data)
+        except Exception as e:
+            logger.debug(f"⏭️ تخطي عنصر: {e}")
+            continue
     return matches
 
 
-def extract_match_from_element(element, today) -> dict | None:
+def extract_match_from_element(element, today) -> ScrapedMatch | None:
     """
     استخراج بيانات مباراة واحدة من عنصر HTML.
     يحاول عدة selectors مختلفة.
     """
+    def field_text(name: str) -> str:
+        el = element.query_selector(FIELD_SELECTORS[name])
+        return el.inner_text().strip() if el else ""
+
     # ── Team Names & Logos ──
-    team_elements = element.query_selector_all(
-        ".teamName, .team-name, .teamA, .teamB, .team, [class*='team']"
-    )
-    
-    home_team = ""
-    away_team = ""
-    home_logo = ""
-    away_logo = ""
+    team_elements = element.query_selector_all(FIELD_SELECTORS["team"])
+
+    raw = {
+        "home_team": "",
+        "away_team": "",
+        "home_logo": "",
+        "away_logo": "",
+        "lines": [],
+    }
 
     if len(team_elements) >= 2:
         # Extract name
-        home_team = team_elements[0].query_selector(".name, span, strong") or team_elements[0]
-        home_team = home_team.inner_text().strip()
-        
-        away_team = team_elements[1].query_selector(".name, span, strong") or team_elements[1]
-        away_team = away_team.inner_text().strip()
+        home_team = team_elements[0].query_selector(FIELD_SELECTORS["team_name"]) or team_elements[0]
+        raw["home_team"] = home_team.inner_text().strip()
+
+        away_team = team_elements[1].query_selector(FIELD_SELECTORS["team_name"]) or team_elements[1]
+        raw["away_team"] = away_team.inner_text().strip()
 
         # Extract logo
         home_img = team_elements[0].query_selector("img")
         if home_img:
-            home_logo = home_img.get_attribute("src") or home_img.get_attribute("data-src") or ""
-            
+            raw["home_logo"] = home_img.get_attribute("src") or home_img.get_attribute("data-src") or ""
+
         away_img = team_elements[1].query_selector("img")
         if away_img:
-            away_logo = away_img.get_attribute("src") or away_img.get_attribute("data-src") or ""
+            raw["away_logo"] = away_img.get_attribute("src") or away_img.get_attribute("data-src") or ""
 
-    if not home_team or not away_team:
+    if not raw["home_team"] or not raw["away_team"]:
         # Fallback to text splitting if selectors fail
         all_text = element.inner_text().strip().split("\n")
-        all_text = [t.strip() for t in all_text if t.strip()]
-        # Heuristic: Find localized text
-        if len(all_text) >= 2:
-             # Basic fallback, no logos here
-             home_team = all_text[0] 
-             away_team = all_text[-1]
-
-    if not home_team or not away_team:
-        return None
-
-    # ── Score ──
-    score_el = element.query_selector(
-        ".score, .result, .matchResult, [class*='score'], [class*='result']"
-    )
-    home_score, away_score = 0, 0
-    if score_el:
-        score_text = score_el.inner_text().strip()
-        home_score, away_score = parse_score(score_text)
-
-    # ── Status / Minute ──
-    status_el = element.query_selector(
-        ".matchStatus, .status, .time, .matchTime, [class*='status'], [class*='live']"
-    )
-    status_text = ""
-    minute = 0
-    if status_el:
-        status_text = status_el.inner_text().strip()
-        status = map_status(status_text)
-        if status == "live":
-            minute = parse_minute(status_text)
-    else:
-        status = "upcoming"
-
-    # ── League ──
-    league_el = element.query_selector(
-        ".championship, .league, .tournamentName, .tourName, [class*='champ'], [class*='league']"
-    )
-    league_name = league_el.inner_text().strip() if league_el else ""
+        raw["lines"] = [t.strip() for t in all_text if t.strip()]
 
-    # ── Time ──
-    time_el = element.query_selector(
-        ".matchTime, .time, [class*='time']"
-    )
-    match_time = datetime.now(timezone.utc)
-    if time_el and status == "upcoming":
-        time_text = time_el.inner_text().strip()
-        time_match = re.search(r"(\d{1,2}):(\d{2})", time_text)
-        if time_match:
-            hour, mins = int(time_match.group(1)), int(time_match.group(2))
-            match_time = datetime.combine(
-                today,
-                datetime.min.time().replace(hour=hour, minute=mins),
-                tzinfo=timezone.utc,
-            )
+    for name in ("score", "status", "league", "time", "channel", "round"):
+        raw[name] = field_text(name)
 
-    # ── Channel ──
-    channel_el = element.query_selector(
-        ".channel, [class*='channel'], [class*='broadcaster']"
+    raw["detail_url"] = element.evaluate(
+        "el => { const a = el.closest('a[href]') || el.querySelector('a[href]'); return a ? a.href : ''; }"
     )
-    channel = channel_el.inner_text().strip() if channel_el else ""
 
-    # ── Round ──
-    round_el = element.query_selector(
-        ".round, .matchRound, [class*='round'], [class*='week']"
-    )
-    round_name = round_el.inner_text().strip() if round_el else ""
-
-    return {
-        "home_team_name": home_team,
-        "away_team_name": away_team,
-        "home_team_logo": home_logo,
-        "away_team_logo": away_logo,
-        "home_score": home_score,
-        "away_score": away_score,
-        "status": status,
-        "minute": minute,
-        "league_name": league_name,
-        "start_time": match_time,
-        "channel": channel,
-        "round": round_name,
-    }
+    return build_match_from_raw(raw, today)
 
 
 # ──────────────────────────────────────────────
@@ -279,26 +473,49 @@ def extract_match_from_element(element, today) -> dict | None:
 # ──────────────────────────────────────────────
 
 
-def run_scraper(once: bool = False, dry_run: bool = False):
+class BrowserSession:
     """
-    حلقة السكرابر الرئيسية.
-    
-    Args:
-        once: تشغيل مرة واحدة فقط (للاختبار)
-        dry_run: جلب البيانات بدون تحديث الـ DB
+    متصفح Playwright يُشغَّل عند أول حاجة فقط (lazy).
+    في وضع auto ما نفتح Chromium إلا لو المسار السريع (HTTP) فشل.
     """
-    logger.info("=" * 50)
-    logger.info("⚽ سكرابر Kora — بداية التشغيل")
-    logger.info(f"   الوضع: {'مرة واحدة' if once else f'حلقة {LOOP_DURATION_SECONDS}s'}")
-    logger.info(f"   الـ DB: {'معطّل (dry-run)' if dry_run else 'مفعّل'}")
-    logger.info("=" * 50)
 
-    start_time = time.time()
-    iteration = 0
+    def __init__(self):
+        self._playwright = None
+        self._browser = None
+        self._page = None
+        self.cycles = 0           # cycles served since the last (re)start
+        self.baseline_rss_mb = None
+
+    @property
+    def started(self) -> bool:
+        return self._page is not None
+
+    @property
+    def page(self):
+        if self._page is None:
+            self._start()
+            self.baseline_rss_mb = process_tree_rss_mb()
+        self.cycles += 1
+        return self._page
+
+    def needs_recycle(self) -> str | None:
+        """سبب إعادة تشغيل المتصفح (عدد الدورات أو نمو الذاكرة)، أو None."""
+        if not self.started:
+            return None
+        if self.cycles >= BROWSER_RECYCLE_CYCLES:
+            return f"{self.cycles} دورة"
+        rss = process_tree_rss_mb()
+        if rss is not None and self.baseline_rss_mb is not None:
+            if rss - self.baseline_rss_mb >= BROWSER_RSS_GROWTH_LIMIT_MB:
+                return f"الذاكرة {int(rss)}MB (البداية {int(self.baseline_rss_mb)}MB)"
+        return None
+
+    def _start(self):
+        from playwright.sync_api import sync_playwright
 
-    with sync_playwright() as p:
         logger.info("🌐 تشغيل المتصفح...")
-        browser = p.chromium.launch(
+        self._playwright = sync_playwright().start()
+        self._browser = self._playwright.chromium.launch(
             headless=True,
             args=[
                 "--no-sandbox",
@@ -307,85 +524,497 @@ def run_scraper(once: bool = False, dry_run: bool = False):
                 "--disable-gpu",
             ],
         )
-        context = browser.new_context(
+        context = self._browser.new_context(
             user_agent=USER_AGENT,
             viewport={"width": 1280, "height": 720},
             locale="ar-SA",
         )
+        context.route("**/*", _block_heavy_requests)
 
         # Apply stealth
         try:
             from playwright_stealth import stealth_sync
-            page = context.new_page()
-            stealth_sync(page)
+            self._page = context.new_page()
+            stealth_sync(self._page)
         except ImportError:
             logger.warning("⚠️ playwright-stealth غير مثبّت — متابعة بدون stealth")
-            page = context.new_page()
+            self._page = context.new_page()
+
+    def close(self):
+        if self._browser:
+            self._browser.close()
+        if self._playwright:
+            self._playwright.stop()
+        self._playwright = self._browser = self._page = None
+        self.cycles = 0
+        self.baseline_rss_mb = None
+
+
+# Set by SIGTERM/SIGINT — the loop finishes the current cycle (including the
+# DB write) and then exits cleanly.
+_shutdown = threading.Event()
+
+
+def _request_shutdown(signum, frame):
+    if _shutdown.is_set():
+        raise KeyboardInterrupt  # second signal: stop immediately
+    logger.info(f"🛑 استلام {signal.Signals(signum).name} — إيقاف بعد الدورة الحالية...")
+    _shutdown.set()
+
+
+def fetch_matches(
+    backend: str,
+    sources: SourcePool | None,
+    browser: BrowserSession,
+    extraction: str,
+    url: str | None = None,
+    recorder=None,
+) -> list[ScrapedMatch]:
+    """
+    جلب المباريات حسب الـ backend:
+      - http: HTTP + lxml فقط (كل المصادر بالتوازي + دمج)
+      - browser: Playwright فقط
+      - auto: HTTP أولاً، والمتصفح فقط لو فشل أو ما لقينا بطاقات مباريات
+    يرمي exception لو الجلب فشل (الدورة تنحسب فاشلة في ملف الصحة).
+    """
+    if backend in ("http", "auto"):
+        try:
+            matches = sources.scrape()
+        except Exception as e:
+            if backend == "http":
+                raise
+            logger.warning(f"⚠️ المسار السريع فشل — الرجوع للمتصفح: {e}")
+        else:
+            if matches or backend == "http":
+                return matches
+            logger.warning("⚠️ المسار السريع ما لقى مباريات — الرجوع للمتصفح")
+
+    return scrape_matches(browser.page, extraction, url=url, recorder=recorder)
+
+
+def _time_is_up(start_time: float, deadline: float | None) -> bool:
+    if deadline is None or time.time() < deadline:
+        return False
+    logger.info(f"⏰ انتهى الوقت ({int(time.time() - start_time)}s) — إيقاف")
+    return True
+
+
+def _log_cycle_header(iteration: int, elapsed: float, deadline: float | None):
+    logger.info(f"\n{'─' * 40}")
+    if deadline is None:
+        logger.info(f"🔄 الدورة #{iteration} | {int(elapsed)}s منذ البداية")
+    else:
+        logger.info(f"🔄 الدورة #{iteration} | {int(elapsed)}s من {LOOP_DURATION_SECONDS}s")
+    logger.info(f"{'─' * 40}")
 
-        while True:
-            elapsed = time.time() - start_time
-            if not once and elapsed >= LOOP_DURATION_SECONDS:
-                logger.info(f"⏰ انتهى الوقت ({int(elapsed)}s) — إيقاف")
+
+def _recycle_browser(browser: BrowserSession):
+    # Long runs: restart Chromium before it grows without bound
+    recycle_reason = browser.needs_recycle()
+    if recycle_reason:
+        logger.info(f"♻️ إعادة تشغيل المتصفح ({recycle_reason})")
+        browser.close()
+
+
+def _prioritize(matches: list[ScrapedMatch]) -> list[ScrapedMatch]:
+    """المباريات المباشرة أولاً + طباعة ملخص الدورة."""
+    logger.info(f"📊 تم جلب {len(matches)} مباراة")
+
+    live, other = partition_live(matches)
+    sorted_matches = live + other
+
+    if live:
+        logger.info(f"🔴 {len(live)} مباراة مباشرة!")
+
+    for m in sorted_matches:
+        status_emoji = {"live": "🔴", "finished": "🏁", "upcoming": "⏳"}.get(
+            m.status, "❓"
+        )
+        logger.info(
+            f"  {status_emoji} {m.home_team_name} "
+            f"{m.home_score}-{m.away_score} "
+            f"{m.away_team_name} "
+            f"({m.league_name or '?'})"
+        )
+    return sorted_matches
+
+
+def _upsert_cycle(sorted_matches: list[ScrapedMatch], standings: StandingsEngine | None = None) -> dict:
+    """upsert المباريات ثم جدول الترتيب. يرمي exception لو الكتابة فشلت (الـ spool يعيد المحاولة)."""
+    with session_scope() as session:
+        stats = upsert_matches(session, sorted_matches)
+    if stats.get("error"):
+        raise RuntimeError(stats["error"])
+    logger.info(
+        f"💾 DB: {stats['updated']} تحديث | "
+        f"{stats['inserted']} إضافة | "
+        f"{stats['unchanged']} بدون تغيير | "
+        f"{stats['skipped']} تخطي"
+    )
+    # Only leagues whose results changed this cycle
+    if standings and stats["rows"]:
+        try:
+            with metrics.timer("standings"), session_scope() as session:
+                leagues, rows = standings.update(session, stats["rows"])
+            if leagues:
+                logger.info(f"🏆 الترتيب: {leagues} دوري | {rows} صف تغيّر")
+        except Exception as e:
+            logger.error(f"❌ خطأ في جدول الترتيب: {e}")
+    return stats
+
+
+def _write_details(fetched: list[tuple[ScrapedMatch, dict]]):
+    try:
+        with metrics.timer("details"), session_scope() as session:
+            updated = update_match_details(session, fetched)
+            events = insert_match_events(session, fetched)
+        logger.info(
+            f"📋 التفاصيل: {len(fetched)} صفحة | {updated} تحديث | "
+            f"{events['inserted']} حدث جديد | {events['seen'] + events['skipped']} مكرر"
+        )
+    except Exception as e:
+        logger.error(f"❌ خطأ في حفظ التفاصيل: {e}")
+
+
+def _write_cycle(
+    sorted_matches: list[ScrapedMatch],
+    dry_run: bool,
+    detail_fetcher: DetailFetcher | None,
+    standings: StandingsEngine | None = None,
+    spool: MatchSpool | None = None,
+):
+    """
+    كتابة الدورة في الـ DB، ثم جدول الترتيب، ثم صفحات التفاصيل.
+    مع spool: الدورة تكتب في الملف المحلي وترجع — الـ writer thread يكتب في الـ DB.
+    بدون spool: فشل الـ DB يرمي exception (الدورة فاشلة، والتفاصيل تنتظر الدورة الجاية).
+    """
+    if not dry_run and sorted_matches:
+        if spool:
+            with metrics.timer("spool"):
+                spool.put(sorted_matches)
+            if not spool.healthy:
+                logger.warning(f"📥 spool: {spool.pending()} مباراة تنتظر الـ DB (من {spool.lag():.0f}s)")
+        else:
+            _upsert_cycle(sorted_matches, standings)
+
+    # Detail pages + events (after the live write, bounded by DETAIL_BUDGET_SECONDS)
+    if detail_fetcher and sorted_matches:
+        with metrics.timer("details"):
+            fetched = detail_fetcher.fetch(sorted_matches)
+        if fetched and not dry_run:
+            if spool:
+                # Rows must exist before their details/events — runs after the spool drains
+                spool.defer(partial(_write_details, fetched))
+            else:
+                _write_details(fetched)
+        elif fetched:
+            logger.info(f"📋 التفاصيل: {len(fetched)} صفحة")
+
+
+def _next_sleep(
+    scheduler: PollScheduler, matches: list[ScrapedMatch], deadline: float | None, coordinator: Coordinator
+) -> float:
+    # Adaptive: depends on live/upcoming matches
+    sleep_time, reason = scheduler.next_interval(matches, deadline=deadline)
+    if coordinator.cap_sleep(sleep_time) < sleep_time:
+        # Wake up in time to renew the lease; pages still fresh in the tiers aren't refetched
+        sleep_time, reason = coordinator.cap_sleep(sleep_time), "lease"
+    metrics.observe("sleep", sleep_time)  # scheduled (SIGTERM may cut it short)
+    if sleep_time > 0:
+        logger.info(f"💤 انتظار {int(sleep_time)}s ({REASON_LABELS[reason]})...")
+    return sleep_time
+
+
+def run_scraper(
+    once: bool = False,
+    dry_run: bool = False,
+    extraction: str = "page",
+    backend: str = "auto",
+    daemon: bool = False,
+    health_file: str | None = None,
+    details: bool = True,
+    pipelined: bool = False,
+    standings: bool = True,
+    metrics_file: str | None = None,
+    record_dir: str | None = None,
+    replay_dir: str | None = None,
+    sources: list[str] | None = None,
+    spool_path: str | None = None,
+    days_ahead: int = FIXTURE_DAYS_AHEAD,
+    coordination: str = "all",
+    instance_id: str | None = None,
+    profile_dir: str | None = None,
+    profile_cycles: int | None = None,
+):
+    """
+    حلقة السكرابر الرئيسية.
+    
+    Args:
+        once: تشغيل مرة واحدة فقط (للاختبار)
+        dry_run: جلب البيانات بدون تحديث الـ DB
+        extraction: طريقة الاستخراج — "page" (نداء واحد) أو "element" (عنصر بعنصر)
+        backend: مصدر الصفحة — "http" أو "browser" أو "auto"
+        daemon: تشغيل دائم بدون حد LOOP_DURATION_SECONDS (يتوقف بـ SIGTERM/SIGINT)
+        health_file: مسار ملف JSON لحالة السكرابر (اختياري)
+        details: جلب صفحات تفاصيل المباريات المباشرة والقادمة بعد كل دورة
+        pipelined: الجلب التالي يبدأ والكتابة السابقة لسه شغّالة (انظر pipeline.py)
+        standings: تحديث جدول الترتيب للدوريات اللي تغيّرت نتائجها
+        metrics_file: ملف قياس زمن المراحل (.prom = Prometheus، غير كذا JSON lines) — اختياري
+        record_dir: حفظ كل صفحة مجلوبة في هذا المجلد (لكل دورة)
+        replay_dir: تشغيل الدورات المسجّلة من سيرفر محلي بدل الموقع (بدون انتظار بين الدورات)
+        sources: مصادر المباريات ("yallakora" أو "yallakora=URL") — تُجلب بالتوازي وتُدمج
+        spool_path: ملف SQLite للكتابة المؤجلة — الدورة ما تنتظر الـ DB ولا تضيع لو وقفت (انظر spool.py)
+        days_ahead: كم يوم جاي نجلب مبارياته (الطبقة الباردة في tiers.py) — 0 = اليوم فقط
+        coordination: "all" أو "leader" (نسخة وحدة تشتغل) أو "shard" (الدوريات تتوزع) — انظر coordination.py
+        instance_id: اسم النسخة في الـ leases (الافتراضي: الجهاز + pid)
+        profile_dir: مجلد بروفايل CPU والذاكرة لكل دورة + تقرير (انظر profiling.py)
+        profile_cycles: مع profile_dir — إيقاف وكتابة التقرير بعد هذا العدد من الدورات
+    """
+    sources = list(sources or DEFAULT_SOURCES)
+    if dry_run and coordination != "all":
+        logger.warning(f"⚠️ --coordination {coordination} يحتاج الـ DB — تشغيل بدون تنسيق (dry-run)")
+        coordination = "all"
+    if replay_dir:
+        mode = "إعادة تشغيل التسجيل"
+    elif once:
+        mode = "مرة واحدة"
+    elif daemon:
+        mode = "دائم (daemon)"
+    else:
+        mode = f"حلقة {LOOP_DURATION_SECONDS}s"
+
+    logger.info("=" * 50)
+    logger.info("⚽ سكرابر Kora — بداية التشغيل")
+    logger.info(f"   الوضع: {mode}{' — متوازي (async)' if pipelined else ''}")
+    if dry_run:
+        logger.info("   الـ DB: معطّل (dry-run)")
+    else:
+        logger.info(f"   الـ DB: مفعّل{f' — عبر spool {spool_path}' if spool_path else ''}")
+    coordinator = Coordinator(coordination, instance_id, ttl=LEASE_TTL_SECONDS, renew_every=LEASE_RENEW_SECONDS)
+    if coordination != "all":
+        logger.info(f"   التنسيق: {coordination} — النسخة {coordinator.instance_id}")
+    logger.info(f"   الـ Backend: {backend}")
+    if len(sources) > 1 and not replay_dir:
+        logger.info(f"   المصادر: {', '.join(sources)}")
+    if profile_dir:
+        logger.info(f"   البروفايل: {profile_dir}{f' — {profile_cycles} دورة' if profile_cycles else ''}")
+    if replay_dir:
+        logger.info(f"   المصدر: تسجيل {replay_dir}")
+    elif record_dir:
+        logger.info(f"   التسجيل: {record_dir}")
+    logger.info("=" * 50)
+
+    start_time = time.time()
+    iteration = 0
+    scheduler = PollScheduler(
+        min_interval=MIN_POLL_SECONDS,
+        max_interval=MAX_POLL_SECONDS,
+        live_interval=LIVE_POLL_SECONDS,
+        default_interval=SLEEP_INTERVAL_SECONDS,
+        kickoff_window=KICKOFF_WINDOW_SECONDS,
+        kickoff_grace=KICKOFF_GRACE_SECONDS,
+    )
+
+    deadline = None if daemon or replay_dir else start_time + LOOP_DURATION_SECONDS
+
+    metrics.configure(metrics_file)
+    _shutdown.clear()
+    previous_handlers = {
+        sig: signal.signal(sig, _request_shutdown) for sig in (signal.SIGTERM, signal.SIGINT)
+    }
+    health = HealthFile(health_file)
+    health.update()
+    profiler = CycleProfiler(profile_dir, profile_cycles)
+
+    replay = ReplayServer(replay_dir) if replay_dir else None
+    if replay:
+        # Only the primary source's listing is replayed (listing.txt)
+        sources = [f"{sources[0].partition('=')[0]}={replay.listing_url}"]
+    adapters = [make_source(spec, USER_AGENT) for spec in sources]
+    listing_url = adapters[0].url
+    recorder = Recorder(record_dir, listing_url) if record_dir else None
+    for adapter in adapters:
+        adapter.http.recorder = recorder
+    source_pool = SourcePool(adapters, timeout=SOURCE_TIMEOUT_SECONDS, max_age=SOURCE_MAX_AGE_SECONDS)
+    browser = BrowserSession()
+    detail_fetcher = (
+        DetailFetcher(
+            USER_AGENT,
+            max_workers=DETAIL_WORKERS,
+            per_host=DETAIL_PER_HOST,
+            budget_seconds=DETAIL_BUDGET_SECONDS,
+            live_ttl=DETAIL_LIVE_TTL_SECONDS,
+        )
+        if details else None
+    )
+    if detail_fetcher:
+        detail_fetcher.http.recorder = recorder
+    standings_engine = StandingsEngine(include_live=STANDINGS_INCLUDE_LIVE) if standings else None
+    crawler = TieredCrawler(
+        lambda: fetch_matches(backend, source_pool, browser, extraction, url=listing_url, recorder=recorder),
+        adapters[0],
+        # A recording only has today's page, and every recorded cycle must be fetched
+        days=0 if replay else days_ahead,
+        hot_ttl=0 if replay else TODAY_HOT_TTL_SECONDS,
+        warm_ttl=0 if replay else TODAY_WARM_TTL_SECONDS,
+        cold_ttl=FIXTURE_TTL_SECONDS,
+        cold_budget=FIXTURE_PAGES_PER_CYCLE,
+        kickoff_window=KICKOFF_WINDOW_SECONDS,
+    )
+    spool = (
+        MatchSpool(spool_path, partial(_upsert_cycle, standings=standings_engine))
+        if spool_path and not dry_run else None
+    )
+
+    if not dry_run:
+        try:
+            with session_scope() as session:
+                seed_fingerprint_cache(session)
+        except Exception as e:
+            logger.warning(f"⚠️ تعذّر تحميل بصمات المباريات — كل المباريات ستُكتب في أول دورة: {e}")
+
+    def should_stop() -> bool:
+        if replay and not replay.advance():
+            logger.info("📼 خلصت الدورات المسجّلة — إيقاف")
+            return True
+        if profiler.finished():
+            logger.info(f"🔬 خلصت {profile_cycles} دورة بروفايل — إيقاف")
+            return True
+        return not once and _time_is_up(start_time, deadline)
+
+    def next_sleep(matches: list[ScrapedMatch]) -> float:
+        # Pages still fresh in the tiers count too (cycle `matches` only has what was refetched)
+        if not coordinator.active():
+            return coordinator.renew_every  # standby: just keep trying to take over
+        return 0 if replay else _next_sleep(scheduler, crawler.snapshot(), deadline, coordinator)
+
+    standings_epoch = coordinator.epoch
+
+    def fetch_cycle(cycle: int) -> list[ScrapedMatch]:
+        nonlocal standings_epoch
+        if recorder:
+            recorder.next_cycle(cycle)
+        coordinator.refresh()
+        if coordinator.epoch != standings_epoch:
+            # Leagues we just got back were written by another instance meanwhile
+            standings_epoch = coordinator.epoch
+            if standings_engine:
+                standings_engine.invalidate()
+        if not coordinator.active():
+            logger.info(f"⏸️ نسخة احتياطية — القائد {coordinator.holder or '?'}، ما فيه جلب هالدورة")
+            return []
+        return _prioritize(coordinator.select(crawler.poll()))
+
+    try:
+        if pipelined:
+            def fetch_stage(cycle: int) -> list[ScrapedMatch]:
+                _log_cycle_header(cycle, time.time() - start_time, deadline)
+                with profiler.stage(cycle):
+                    _recycle_browser(browser)
+                    return fetch_cycle(cycle)
+
+            def write_stage(cycle: int, sorted_matches: list[ScrapedMatch]):
+                write_started = time.time()
+                with profiler.stage(cycle):
+                    _write_cycle(sorted_matches, dry_run, detail_fetcher, standings_engine, spool)
+                logger.info(f"⏱️ كتابة الدورة #{cycle}: {time.time() - write_started:.2f}s")
+
+            def cycle_written(cycle: int, sorted_matches: list[ScrapedMatch], _):
+                health.cycle_ok(cycle, len(sorted_matches))
+                metrics.count("cycles")
+                metrics.count("matches", len(sorted_matches))
+                metrics.end_cycle(cycle)
+                profiler.end_cycle(cycle)
+
+            def cycle_failed(cycle: int, error: Exception):
+                health.cycle_failed(cycle, str(error))
+                metrics.count("cycle_errors")
+                profiler.end_cycle(cycle)
+
+            iteration = asyncio.run(run_pipeline(
+                fetch_stage,
+                write_stage,
+                next_sleep,
+                once=once,
+                shutdown=_shutdown,
+                should_stop=should_stop,
+                on_written=cycle_written,
+                on_failed=cycle_failed,
+                cleanup=browser.close,  # Playwright objects belong to the fetch thread
+            ))
+            if once:
+                logger.info("✅ انتهى (وضع المرة الواحدة)")
+
+        while not pipelined and not _shutdown.is_set():
+            if should_stop():
                 break
 
             iteration += 1
-            logger.info(f"\n{'─' * 40}")
-            logger.info(f"🔄 الدورة #{iteration} | {int(elapsed)}s من {LOOP_DURATION_SECONDS}s")
-            logger.info(f"{'─' * 40}")
+            _log_cycle_header(iteration, time.time() - start_time, deadline)
+            with profiler.stage(iteration):
+                _recycle_browser(browser)
 
+            cycle_started = time.time()
+            matches = []
             try:
-                # 1. Scrape
-                matches = scrape_matches(page)
-                logger.info(f"📊 تم جلب {len(matches)} مباراة")
-
-                # 2. Prioritize live matches
-                live = [m for m in matches if m["status"] == "live"]
-                other = [m for m in matches if m["status"] != "live"]
-                sorted_matches = live + other
-
-                if live:
-                    logger.info(f"🔴 {len(live)} مباراة مباشرة!")
-
-                # 3. Log matches
-                for m in sorted_matches:
-                    status_emoji = {"live": "🔴", "finished": "🏁", "upcoming": "⏳"}.get(
-                        m["status"], "❓"
-                    )
-                    logger.info(
-                        f"  {status_emoji} {m['home_team_name']} "
-                        f"{m['home_score']}-{m['away_score']} "
-                        f"{m['away_team_name']} "
-                        f"({m.get('league_name', '?')})"
-                    )
-
-                # 4. Upsert to DB
-                if not dry_run and sorted_matches:
-                    try:
-                        session = get_session()
-                        stats = upsert_matches(session, sorted_matches)
-                        session.close()
-                        logger.info(
-                            f"💾 DB: {stats['updated']} تحديث | "
-                            f"{stats['skipped']} تخطي"
-                        )
-                    except Exception as e:
-                        logger.error(f"❌ خطأ في الـ DB: {e}")
+                with profiler.stage(iteration):
+                    # 1. Scrape + prioritize live matches
+                    matches = fetch_cycle(iteration)
+
+                    # 2. Upsert to DB, then detail pages
+                    _write_cycle(matches, dry_run, detail_fetcher, standings_engine, spool)
+
+                logger.info(f"⏱️ مدة الدورة: {time.time() - cycle_started:.2f}s")
+                health.cycle_ok(iteration, len(matches))
+                metrics.count("cycles")
+                metrics.count("matches", len(matches))
+                metrics.end_cycle(iteration)
 
             except Exception as e:
                 logger.error(f"❌ خطأ في الدورة #{iteration}: {e}")
+                health.cycle_failed(iteration, str(e))
+                metrics.count("cycle_errors")
+            profiler.end_cycle(iteration)
 
             if once:
                 logger.info("✅ انتهى (وضع المرة الواحدة)")
                 break
 
-            # Sleep
-            remaining = LOOP_DURATION_SECONDS - (time.time() - start_time)
-            sleep_time = min(SLEEP_INTERVAL_SECONDS, remaining)
+            sleep_time = next_sleep(matches)
             if sleep_time > 0:
-                logger.info(f"💤 انتظار {int(sleep_time)}s...")
-                time.sleep(sleep_time)
+                _shutdown.wait(sleep_time)  # wakes up early on SIGTERM/SIGINT
 
+    finally:
+        for sig, handler in previous_handlers.items():
+            signal.signal(sig, handler)
+        health.update(status="stopped", ready=False)
         browser.close()
+        source_pool.close()
+        if detail_fetcher:
+            detail_fetcher.close()
+        if spool:
+            spool.close()
+        coordinator.release()
+        profiler.close()
+        logger.info(f"🧊 الطبقات: {crawler.summary() or '—'}")
+        if replay:
+            replay.close()
+        if recorder:
+            logger.info(f"📼 تم تسجيل {recorder.saved} صفحة في {recorder.cycle} دورة → {record_dir}")
+        if not dry_run:
+            pool = get_pool_stats()
+            logger.info(
+                f"🔌 الـ DB pool: {pool['connects']} اتصال | "
+                f"{pool['checkouts']} استعارة | "
+                f"انتظار {pool['checkout_wait_seconds']:.2f}s"
+            )
+            names = get_resolver_stats()
+            logger.info(
+                f"📚 ربط الأسماء: {names['hit_rate']:.0%} من الذاكرة | "
+                f"{names['created']} جديد | {names['queries']} استعلام | "
+                f"وفّرنا ~{names['round_trips_saved']} استعلام"
+            )
+            dispose_engine()
 
     logger.info("=" * 50)
     logger.info(f"🏁 انتهى السكرابر — {iteration} دورة في {int(time.time() - start_time)}s")
@@ -408,6 +1037,123 @@ if __name__ == "__main__":
         action="store_true",
         help="جلب البيانات بدون تحديث قاعدة البيانات",
     )
+    parser.add_argument(
+        "--extraction",
+        choices=["page", "element"],
+        default="page",
+        help="page: استخراج كل المباريات بنداء واحد | element: عنصر بعنصر (احتياطي)",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["http", "browser", "auto"],
+        default="auto",
+        help="http: بدون متصفح | browser: Playwright | auto: HTTP مع الرجوع للمتصفح عند الحاجة",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="تشغيل دائم (بدون حد 280 ثانية) — يتوقف بـ SIGTERM/SIGINT",
+    )
+    parser.add_argument(
+        "--health-file",
+        metavar="PATH",
+        help="كتابة حالة السكرابر (JSON) في هذا الملف بعد كل دورة",
+    )
+    parser.add_argument(
+        "--details",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="جلب صفحات تفاصيل المباريات (الملعب، الحكم، المعلق) — --no-details لإيقافه",
+    )
+    parser.add_argument(
+        "--standings",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="تحديث جدول الترتيب بعد كل دورة — --no-standings لإيقافه",
+    )
+    parser.add_argument(
+        "--metrics",
+        metavar="PATH",
+        help="قياس زمن كل مرحلة وكتابته في الملف (.prom = Prometheus، غير كذا JSON lines)",
+    )
+    parser.add_argument(
+        "--async",
+        dest="pipelined",
+        action="store_true",
+        help="الجلب التالي يبدأ والكتابة في الـ DB للدورة السابقة لسه شغّالة",
+    )
+    parser.add_argument(
+        "--source",
+        dest="sources",
+        action="append",
+        metavar="NAME[=URL]",
+        help="مصدر مباريات (يتكرر) — الأول أساسي، والباقي يُجلب بالتوازي ويُدمج (الافتراضي: yallakora)",
+    )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument(
+        "--record",
+        metavar="DIR",
+        help="حفظ كل صفحة مجلوبة (القائمة + التفاصيل) لكل دورة في هذا المجلد",
+    )
+    source.add_argument(
+        "--replay",
+        metavar="DIR",
+        help="تشغيل الدورات المسجّلة بـ --record من سيرفر محلي بدل الموقع",
+    )
+    parser.add_argument(
+        "--spool",
+        metavar="PATH",
+        help="ملف SQLite للكتابة المؤجلة: الدورة تكتب محلياً و thread منفصل يكتب في الـ DB",
+    )
+    parser.add_argument(
+        "--days-ahead",
+        type=int,
+        default=FIXTURE_DAYS_AHEAD,
+        metavar="N",
+        help=f"جلب مباريات N يوم جاي (كل {FIXTURE_TTL_SECONDS // 3600} ساعات، GET شرطي) — 0 لإيقافه",
+    )
+    parser.add_argument(
+        "--coordination",
+        choices=COORDINATION_MODES,
+        default="all",
+        help="all: بدون تنسيق | leader: نسخة وحدة تشتغل والباقي احتياط | shard: الدوريات تتوزع على النسخ",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="DIR",
+        help="بروفايل CPU (cProfile) والذاكرة (tracemalloc + RSS المتصفح) لكل دورة، وتقرير summary.txt في المجلد",
+    )
+    parser.add_argument(
+        "--profile-cycles",
+        type=int,
+        metavar="N",
+        help="مع --profile: إيقاف وكتابة التقرير بعد N دورة",
+    )
+    parser.add_argument(
+        "--instance-id",
+        metavar="ID",
+        help="اسم هالنسخة في الـ leases (الافتراضي: اسم الجهاز + pid)",
+    )
     args = parser.parse_args()
 
-    run_scraper(once=args.once, dry_run=args.dry_run)
+    run_scraper(
+        once=args.once,
+        dry_run=args.dry_run,
+        extraction=args.extraction,
+        backend=args.backend,
+        daemon=args.daemon,
+        health_file=args.health_file,
+        details=args.details,
+        pipelined=args.pipelined,
+        standings=args.standings,
+        metrics_file=args.metrics,
+        record_dir=args.record,
+        replay_dir=args.replay,
+        sources=args.sources,
+        spool_path=args.spool,
+        days_ahead=args.days_ahead,
+        coordination=args.coordination,
+        instance_id=args.instance_id,
+        profile_dir=args.profile,
+        profile_cycles=args.profile_cycles,
+    )
@@ -0,0 +1,282 @@
+"""
+sources.py — مصادر المباريات (adapters) ودمج نتائجها
+  - SourceAdapter: واجهة المصدر — fetch() يجلب الصفحة، extract(html) يحوّلها لـ ScrapedMatch
+  - YallakoraAdapter: المصدر الأول (HTTP + lxml)
+  - SourcePool: جلب كل المصادر بالتوازي ثم merge_sources() بالمفتاح الطبيعي
+
+لو مصدر تأخر أو تعطّل، آخر نتيجة ناجحة منه تُستخدم لين تصير أقدم من max_age.
+الدمج: الحالة الأكثر تقدماً ثم الدقيقة الأكبر ثم الأهداف الأكثر تفوز، وبعدها الثقة (confidence) ثم الأحدث.
+الأسماء (والمفتاح في الـ DB) تبقى من أول مصدر شاف المباراة — عشان ما تتغير بين الدورات.
+
+قياس الدمج على بيانات وهمية: python -m bench merge
+"""
+
+import abc
+import time
+import logging
+import threading
+import dataclasses
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import lru_cache
+from typing import NamedTuple
+
+import metrics
+from http_fetcher import HttpFetcher, parse_matches_html
+from normalize import normalize_name
+from parsing import ScrapedMatch
+
+logger = logging.getLogger(__name__)
+
+
+# ──────────────────────────────────────────────
+# Adapters
+# ──────────────────────────────────────────────
+
+class SourceAdapter(abc.ABC):
+    """
+    مصدر واحد للمباريات. الـ adapter الجديد يحدد name و DEFAULT_URL و extract()
+    (adapter بدون extract() يفشل عند الإنشاء، مو في أول دورة).
+    extract() ما يلمس الشبكة — يتجرّب على صفحات محفوظة (fixtures/ في tests/، أو تسجيلات --record).
+    """
+
+    name = ""
+    DEFAULT_URL = ""
+    confidence = 1.0  # 0..1 — يرجّح بين مصدرين عند تساوي الحالة والدقيقة والنتيجة
+
+    def __init__(self, user_agent: str, url: str | None = None, timeout: float = 15.0):
+        self.url = url or self.DEFAULT_URL
+        self.http = HttpFetcher(self.url, user_agent, timeout=timeout)
+
+    def fetch(self) -> str:
+        return self.http.fetch_html()
+
+    @abc.abstractmethod
+    def extract(self, page_html: str, today=None) -> list[ScrapedMatch]:
+        ...
+
+    def day_url(self, day) -> str:
+        """رابط مباريات يوم معيّن (tiers.py — الأيام الجاية). "" = المصدر ما يدعم الأيام."""
+        return ""
+
+    def fetch_day(self, day, etag: str = "", last_modified: str = "") -> tuple[str | None, str, str]:
+        """صفحة يوم بـ GET شرطي. Returns: (HTML أو None لو ما تغيّرت، ETag، Last-Modified)"""
+        return self.http.fetch_if_modified(self.day_url(day), etag, last_modified)
+
+    def scrape(self) -> list[ScrapedMatch]:
+        with metrics.timer("http_fetch"):
+            page_html = self.fetch()
+        with metrics.timer("parsing"):
+            return self.extract(page_html)
+
+    def close(self):
+        self.http.close()
+
+
+class YallakoraAdapter(SourceAdapter):
+    name = "yallakora"
+    DEFAULT_URL = "https://www.yallakora.com/match-center/"
+
+    def extract(self, page_html: str, today=None) -> list[ScrapedMatch]:
+        return parse_matches_html(page_html, today, base_url=self.url)
+
+    def day_url(self, day) -> str:
+        return f"{self.url}?date={day:%m/%d/%Y}"
+
+
+ADAPTERS: dict[str, type[SourceAdapter]] = {
+    YallakoraAdapter.name: YallakoraAdapter,
+}
+
+
+def make_source(spec: str, user_agent: str) -> SourceAdapter:
+    """"yallakora" أو "yallakora=https://..." (نفس الـ adapter على رابط ثاني)."""
+    name, _, url = spec.partition("=")
+    if name not in ADAPTERS:
+        raise ValueError(f"مصدر غير معروف: {name} (المتاح: {', '.join(ADAPTERS)})")
+    return ADAPTERS[name](user_agent, url or None)
+
+
+# ──────────────────────────────────────────────
+# Merge
+# ──────────────────────────────────────────────
+
+class SourceResult(NamedTuple):
+    source: str
+    confidence: float
+    fetched_at: float   # epoch — a reused result from an earlier cycle is older
+    matches: list[ScrapedMatch]
+
+
+# Higher = further along; a source that already says "finished" beats one still showing "live"
+STATUS_RANK = {"upcoming": 0, "live": 1, "finished": 2}
+
+# Filled from other sources when the winning record left them empty
+_COSMETIC_FIELDS = ("league_name", "home_team_logo", "away_team_logo", "channel", "round", "detail_url")
+
+_normalized = lru_cache(maxsize=32768)(normalize_name)  # team names seen across sources
+
+
+def merge_key(match: ScrapedMatch) -> tuple[tuple, bool]:
+    """
+    المفتاح بين المصادر: الأسماء الموحّدة (normalize_name) مرتبة + التاريخ.
+    Returns: (key, swapped) — swapped لو المصدر كاتب المضيف والضيف بالعكس
+    """
+    home = _normalized(match.home_team_name)
+    away = _normalized(match.away_team_name)
+    if home <= away:
+        return (home, away, match.key[2]), False
+    return (away, home, match.key[2]), True
+
+
+def merge_sources(results: list[SourceResult]) -> list[ScrapedMatch]:
+    """
+    مباراة واحدة لكل مفتاح. الترتيب: ترتيب أول ظهور (المصدر الأول أولاً).
+    results بترتيب الأولوية — عند التساوي الكامل المصدر الأسبق يفوز.
+    """
+    if len(results) == 1:
+        return results[0].matches
+
+    # key -> [rank, winner, winner swapped, identity, identity swapped, all candidates]
+    merged: dict[tuple, list] = {}
+    for priority, result in enumerate(results):
+        for match in result.matches:
+            key, swapped = merge_key(match)
+            rank = (
+                STATUS_RANK.get(match.status, 0),
+                match.minute,
+                match.home_score + match.away_score,  # goals only go up within a minute's reading
+                result.confidence,
+                result.fetched_at,
+                -priority,
+            )
+            entry = merged.get(key)
+            if entry is None:
+                merged[key] = [rank, match, swapped, match, swapped, [match]]
+                continue
+            entry[5].append(match)
+            if rank > entry[0]:
+                entry[0], entry[1], entry[2] = rank, match, swapped
+
+    out = []
+    for _, winner, winner_swapped, identity, identity_swapped, candidates in merged.values():
+        changes = {}
+        if winner is not identity:
+            home_score, away_score = winner.home_score, winner.away_score
+            if winner_swapped != identity_swapped:
+                home_score, away_score = away_score, home_score
+            changes.update(
+                status=winner.status, minute=winner.minute,
+                home_score=home_score, away_score=away_score,
+            )
+        if len(candidates) > 1:
+            for name in _COSMETIC_FIELDS:
+                if not getattr(identity, name):
+                    value = next((getattr(m, name) for m in candidates if getattr(m, name)), "")
+                    if value:
+                        changes[name] = value
+        out.append(dataclasses.replace(identity, **changes) if changes else identity)
+    return out
+
+
+# ──────────────────────────────────────────────
+# Pool (concurrent polling)
+# ──────────────────────────────────────────────
+
+class SourcePool:
+    """
+    جلب كل المصادر بالتوازي (thread لكل مصدر) ودمجها.
+    مصدر واحد = بدون threads وبدون دمج (adapter.scrape() مباشرة).
+    """
+
+    def __init__(
+        self,
+        adapters: list[SourceAdapter],
+        timeout: float = 10.0,
+        max_age: float = 120.0,
+        clock=time.time,
+    ):
+        self.adapters = adapters
+        self.timeout = timeout
+        self.max_age = max_age
+        self.clock = clock
+        self.stats = {"polls": 0, "failures": 0, "late": 0, "reused": 0}
+        self._lock = threading.Lock()
+        self._last: dict[int, SourceResult] = {}   # adapter index -> last good result
+        self._in_flight: dict[int, object] = {}    # adapter index -> future still running
+        self._executor = (
+            ThreadPoolExecutor(max_workers=len(adapters), thread_name_prefix="source")
+            if len(adapters) > 1 else None
+        )
+
+    @property
+    def primary(self) -> SourceAdapter:
+        return self.adapters[0]
+
+    def _poll_one(self, index: int) -> SourceResult | None:
+        adapter = self.adapters[index]
+        try:
+            matches = adapter.scrape()
+        except Exception as e:
+            logger.error(f"❌ خطأ في جلب المصدر {adapter.name} ({adapter.url}): {e}")
+            with self._lock:
+                self.stats["failures"] += 1
+            return None
+        result = SourceResult(adapter.name, adapter.confidence, self.clock(), matches)
+        with self._lock:
+            self._last[index] = result  # late results still land here for the next cycle
+        return result
+
+    def poll(self) -> list[SourceResult]:
+        """نتيجة كل مصدر (جديدة، أو آخر نتيجة لسه صالحة) بترتيب الأولوية."""
+        self.stats["polls"] += 1
+        if self._executor is None:
+            result = self._poll_one(0)
+            return [result] if result else []
+
+        with self._lock:
+            for index in range(len(self.adapters)):
+                if index not in self._in_flight:
+                    self._in_flight[index] = self._executor.submit(self._poll_one, index)
+            futures = dict(self._in_flight)
+        wait(futures.values(), timeout=self.timeout)
+
+        results = []
+        now = self.clock()
+        with self._lock:
+            for index, adapter in enumerate(self.adapters):
+                if futures[index].done():
+                    del self._in_flight[index]
+                    fresh = futures[index].result()
+                    if fresh:
+                        results.append(fresh)
+                        continue
+                else:
+                    self.stats["late"] += 1
+                last = self._last.get(index)
+                if last and now - last.fetched_at <= self.max_age:
+                    self.stats["reused"] += 1
+                    logger.info(f"♻️ {adapter.name}: استخدام نتيجة عمرها {int(now - last.fetched_at)}s")
+                    results.append(last)
+        return results
+
+    def scrape(self) -> list[ScrapedMatch]:
+        """المباريات المدموجة. يرمي RuntimeError لو ولا مصدر رجّع نتيجة (جديدة أو صالحة)."""
+        results = self.poll()
+        if not results:
+            raise RuntimeError(f"كل المصادر فشلت ({', '.join(a.name for a in self.adapters)})")
+        if len(results) == 1:
+            return results[0].matches
+
+        with metrics.timer("merge"):
+            merged = merge_sources(results)
+        total = sum(len(r.matches) for r in results)
+        logger.info(
+            f"🔀 دمج {len(results)} مصدر: {total} بطاقة → {len(merged)} مباراة"
+        )
+        return merged
+
+    def close(self):
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        for adapter in self.adapters:
+            adapter.close()
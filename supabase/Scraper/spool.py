@@ -0,0 +1,264 @@
+"""
+spool.py — كتابة مؤجّلة (write-behind) للمباريات عبر ملف SQLite محلي
+الدورة تكتب مبارياتها في الـ spool (ملي ثواني على القرص المحلي) وترجع للجلب فوراً،
+و thread منفصل يفرّغه في Postgres على دفعات. لو الـ DB واقف أو بطيء:
+  - الدورات ما تنتظر timeouts الاتصال
+  - ولا تضيع — تبقى في الملف لين ترجع الـ DB (حتى بعد إعادة تشغيل السكرابر)
+
+الملف يحتفظ بآخر حالة لكل مباراة فقط (المفتاح الطبيعي ScrapedMatch.key):
+عشر دورات أثناء انقطاع الـ DB = صف واحد لكل مباراة، مو عشرة.
+وضع WAL: الكتابة من الدورة والقراءة من الـ writer ما يقفلون بعض.
+
+الاستخدام:
+  python scraper.py --daemon --spool /var/lib/kora/spool.db
+  python spool.py --stats /var/lib/kora/spool.db            # كم مباراة تنتظر
+انقطاع الـ DB (وهمي، أو Postgres الاختبار يتوقف بـ pg_ctl): tests/test_spool.py
+"""
+
+import json
+import time
+import sqlite3
+import logging
+import argparse
+import threading
+from collections import deque
+from datetime import datetime
+
+from parsing import ScrapedMatch
+
+logger = logging.getLogger(__name__)
+
+DRAIN_BATCH_SIZE = 500       # matches per write (database.UPSERT_BATCH_SIZE)
+IDLE_SECONDS = 5.0           # writer wakes up at least this often (put() wakes it earlier)
+RETRY_MIN_SECONDS = 1.0      # first retry after a failed write, doubling...
+RETRY_MAX_SECONDS = 30.0     # ...up to this
+FLUSH_TIMEOUT_SECONDS = 10.0  # close(): how long to wait for the last drain
+DEFERRED_MAX = 8             # non-durable follow-up writes kept while the DB is down
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pending (
+    key       TEXT PRIMARY KEY,   -- ScrapedMatch.key as JSON
+    seq       INTEGER NOT NULL,   -- put() that wrote this state (a newer put() supersedes it)
+    queued_at REAL NOT NULL,      -- first time this match waited (lag)
+    payload   TEXT NOT NULL       -- ScrapedMatch.to_dict() as JSON
+);
+CREATE INDEX IF NOT EXISTS pending_seq ON pending (seq);
+"""
+
+
+def _encode_key(match: ScrapedMatch) -> str:
+    home, away, match_date = match.key
+    return json.dumps([home, away, match_date.isoformat()], ensure_ascii=False)
+
+
+def _encode(match: ScrapedMatch) -> str:
+    data = match.to_dict()
+    data["start_time"] = match.start_time.isoformat()
+    return json.dumps(data, ensure_ascii=False)
+
+
+def _decode(payload: str) -> ScrapedMatch:
+    data = json.loads(payload)
+    data["start_time"] = datetime.fromisoformat(data["start_time"])
+    return ScrapedMatch(**data)
+
+
+# ──────────────────────────────────────────────
+# Spool
+# ──────────────────────────────────────────────
+
+class MatchSpool:
+    """
+    Spool دائم على القرص + writer thread.
+
+    Args:
+        path: ملف SQLite (يُنشأ لو مو موجود — اللي فيه من تشغيل سابق يُكتب أول شي)
+        write(matches): الكتابة الفعلية (مثلاً upsert_matches) — أي exception = إعادة المحاولة لاحقاً
+    """
+
+    def __init__(self, path: str, write, batch_size: int = DRAIN_BATCH_SIZE, idle: float = IDLE_SECONDS):
+        self.path = path
+        self.write = write
+        self.batch_size = batch_size
+        self.idle = idle
+        self.stats = {
+            "appended": 0, "drained": 0, "batches": 0, "errors": 0, "failures": 0, "deferred_dropped": 0,
+        }
+        self._lock = threading.Lock()  # one connection, used by put() and the writer
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")  # WAL: survives a process crash
+        self._db.executescript(_SCHEMA)
+        self._seq = self._db.execute("SELECT COALESCE(MAX(seq), 0) FROM pending").fetchone()[0]
+        self._deferred: deque = deque(maxlen=DEFERRED_MAX)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._closed = False  # close() closed the connection — a writer stuck in write() must not touch it
+
+        left = self.pending()
+        if left:
+            logger.info(f"📥 spool: {left} مباراة من تشغيل سابق — تنكتب أول شي")
+        self._thread = threading.Thread(target=self._run, name="spool-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def healthy(self) -> bool:
+        """آخر كتابة نجحت (أو ما صار فيه كتابة بعد)."""
+        return self.stats["failures"] == 0
+
+    def pending(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM pending").fetchone()[0]
+
+    def lag(self) -> float:
+        """عمر أقدم مباراة تنتظر (ثواني) — 0 لو الـ spool فاضي."""
+        with self._lock:
+            oldest = self._db.execute("SELECT MIN(queued_at) FROM pending").fetchone()[0]
+        return max(time.time() - oldest, 0.0) if oldest else 0.0
+
+    def put(self, matches: list[ScrapedMatch]):
+        """حفظ حالة الدورة (transaction واحد) وإيقاظ الـ writer. ما يلمس الـ DB."""
+        if not matches:
+            return
+        now = time.time()
+        with self._lock:
+            self._seq += 1
+            rows = [(_encode_key(m), self._seq, now, _encode(m)) for m in matches]
+            self._db.execute("BEGIN")
+            self._db.executemany(
+                """
+                INSERT INTO pending (key, seq, queued_at, payload) VALUES (?, ?, ?, ?)
+                ON CONFLICT (key) DO UPDATE SET seq = excluded.seq, payload = excluded.payload
+                WHERE pending.payload IS NOT excluded.payload
+                """,
+                rows,
+            )
+            self._db.execute("COMMIT")
+            self.stats["appended"] += len(rows)
+        self._wake.set()
+
+    def defer(self, task):
+        """
+        كتابة تعتمد على المباريات (التفاصيل، الأحداث) — تشتغل بعد ما يفرغ الـ spool،
+        عشان صفوف المباريات تكون موجودة. ما تنحفظ على القرص: الدورة الجاية تجيب أحدث منها.
+        أثناء انقطاع طويل يبقى آخر DEFERRED_MAX بس — الأقدم ينحذف (ويتسجّل).
+        """
+        if len(self._deferred) == self._deferred.maxlen:
+            self.stats["deferred_dropped"] += 1
+            if self.stats["deferred_dropped"] == 1:
+                logger.warning(
+                    f"⚠️ spool: أكثر من {DEFERRED_MAX} كتابة مؤجلة (تفاصيل/أحداث) تنتظر الـ DB — الأقدم ينحذف"
+                )
+            else:
+                logger.debug(f"spool: كتابة مؤجلة #{self.stats['deferred_dropped']} انحذفت")
+        self._deferred.append(task)
+        self._wake.set()
+
+    def drain(self) -> bool:
+        """
+        كتابة كل اللي ينتظر على دفعات (الأقدم أولاً)، ثم الكتابات المؤجلة.
+        Returns: True لو فرغ الـ spool
+        """
+        while True:
+            with self._lock:
+                if self._closed:
+                    return False
+                rows = self._db.execute(
+                    "SELECT key, seq, payload FROM pending ORDER BY seq LIMIT ?", (self.batch_size,)
+                ).fetchall()
+            if not rows:
+                break
+            try:
+                self.write([_decode(payload) for _, _, payload in rows])
+            except Exception as e:
+                self.stats["errors"] += 1
+                self.stats["failures"] += 1
+                if self.stats["failures"] == 1:
+                    logger.warning(f"⚠️ spool: الكتابة في الـ DB فشلت — البيانات محفوظة محلياً: {e}")
+                else:
+                    logger.debug(f"spool: محاولة #{self.stats['failures']} فشلت: {e}")
+                return False
+
+            with self._lock:
+                if self._closed:
+                    # close() gave up on us mid-write: the rows stay in the file and the
+                    # next run writes them again (the upsert is idempotent)
+                    return False
+                # A newer put() for the same match changed seq — that state still waits
+                self._db.execute("BEGIN")
+                self._db.executemany(
+                    "DELETE FROM pending WHERE key = ? AND seq = ?", [(key, seq) for key, seq, _ in rows]
+                )
+                self._db.execute("COMMIT")
+            if self.stats["failures"]:
+                dropped = self.stats["deferred_dropped"]
+                logger.info(
+                    f"✅ spool: الـ DB رجعت بعد {self.stats['failures']} محاولة فاشلة"
+                    + (f" — {dropped} كتابة مؤجلة انحذفت أثناء الانقطاع" if dropped else "")
+                )
+                self.stats["deferred_dropped"] = 0
+            self.stats["failures"] = 0
+            self.stats["drained"] += len(rows)
+            self.stats["batches"] += 1
+
+        while self._deferred:
+            task = self._deferred.popleft()
+            try:
+                task()
+            except Exception as e:
+                logger.error(f"❌ spool: كتابة مؤجلة فشلت: {e}")
+        return True
+
+    def _retry_delay(self) -> float:
+        return min(RETRY_MIN_SECONDS * 2 ** (self.stats["failures"] - 1), RETRY_MAX_SECONDS)
+
+    def _run(self):
+        while True:
+            stopping = self._stop.is_set()
+            ok = self.drain()
+            if stopping or self._closed:
+                return
+            if ok:
+                self._wake.wait(self.idle)
+                self._wake.clear()
+            else:
+                # New cycles don't bring a failing DB back sooner — only close() cuts the wait
+                self._stop.wait(self._retry_delay())
+
+    def close(self, timeout: float = FLUSH_TIMEOUT_SECONDS) -> int:
+        """
+        محاولة أخيرة للتفريغ (بحد أقصى timeout)، واللي يبقى ينكتب في التشغيل الجاي.
+        الاتصال بالملف ينقفل دائماً — writer عالق في الـ DB بعد timeout يطلع بدون ما يلمسه.
+        Returns: عدد المباريات الباقية في الملف
+        """
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning(f"⚠️ spool: الكتابة في الـ DB ما خلصت خلال {timeout:.0f}s — تتكرر في التشغيل الجاي")
+        with self._lock:
+            left = self._db.execute("SELECT COUNT(*) FROM pending").fetchone()[0]
+            self._closed = True
+            self._db.close()
+        if left:
+            logger.warning(f"📥 spool: {left} مباراة باقية في {self.path} — تنكتب في التشغيل الجاي")
+        dropped = self.stats["deferred_dropped"] + len(self._deferred)
+        if dropped:
+            logger.warning(f"⚠️ spool: {dropped} كتابة مؤجلة (تفاصيل/أحداث) ما انكتبت")
+        return left
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    parser = argparse.ArgumentParser(description="⚽ Kora write-behind spool")
+    parser.add_argument("--stats", metavar="PATH", help="عدد المباريات المنتظرة في ملف spool")
+    args = parser.parse_args()
+
+    if args.stats:
+        with sqlite3.connect(args.stats) as db:
+            count, oldest = db.execute("SELECT COUNT(*), MIN(queued_at) FROM pending").fetchone()
+        age = f"، أقدمها من {time.time() - oldest:.0f}s" if oldest else ""
+        print(f"📥 {count} مباراة تنتظر{age}")
+    else:
+        parser.print_help()
@@ -0,0 +1,420 @@
+"""
+standings.py — حساب جدول الترتيب من نتائج المباريات
+بعد كل دورة upsert نحدّث فقط الدوريات اللي تغيّرت مبارياتها:
+  - المجاميع (لعب، فوز، تعادل، خسارة، أهداف، نقاط) تتحدّث بالفرق (طرح القديم + إضافة الجديد)
+  - الترتيب، آخر 5 نتائج (form) والاتجاه (trend) تنحسب في الذاكرة
+  - كتابة واحدة لكل دوري (INSERT ... ON CONFLICT (league_id, team_id))
+
+الجدول المباشر (include_live): المباريات الجارية تنحسب بنتيجتها الحالية،
+والاتجاه يُقارن بالترتيب الرسمي (المباريات المنتهية فقط).
+
+الموسم الحالي بس: leagues.season يحدد شكله ("2025-2026" يوليو ← يونيو، "2025" سنة كاملة)،
+والنافذة هي الموسم اللي فيه اليوم. الكؤوس والوديات والتصفيات (من الاسم) ما لها جدول.
+
+القياس (موسم وهمي، تحديث بالفرق مقابل إعادة حساب كاملة): python -m bench table
+"""
+
+import re
+import logging
+from datetime import date, datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from normalize import normalize_name
+
+logger = logging.getLogger(__name__)
+
+FORM_LENGTH = 5
+POINTS = {"W": 3, "D": 1, "L": 0}
+SEASON_START_MONTH = 7  # "2025-2026": July to June
+
+# Competition name tokens (after normalize_name) that mean "no league table"
+_NOT_LEAGUE_TOKENS = frozenset({
+    "كاس", "سوبر", "ودي", "وديه", "وديات", "تصفيات", "ابطال", "بطوله",
+    "cup", "friendly", "friendlies", "qualifiers", "qualification", "champions",
+})
+
+
+def is_league_format(name: str) -> bool:
+    """دوري بجدول نقاط؟ "كأس مصر" و "دوري أبطال آسيا" و "مباريات ودية" لا."""
+    return not _NOT_LEAGUE_TOKENS.intersection(normalize_name(name).lower().split())
+
+
+def season_window(season: str, today: date) -> tuple[date, date]:
+    """
+    [بداية، نهاية) الموسم اللي فيه today، بشكل leagues.season: "2025" سنة كاملة، غيره يوليو ← يونيو.
+    السنة نفسها ما تُستخدم — الافتراضي في الـ schema ثابت ('2025-2026') وما يتحدّث كل موسم.
+    """
+    month = 1 if re.fullmatch(r"\s*\d{4}\s*", season or "") else SEASON_START_MONTH
+    start = date(today.year if today.month >= month else today.year - 1, month, 1)
+    return start, date(start.year + 1, month, 1)
+
+
+def _utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+# ──────────────────────────────────────────────
+# Table Math
+# ──────────────────────────────────────────────
+
+def _outcome(goals_for: int, goals_against: int) -> str:
+    if goals_for > goals_against:
+        return "W"
+    if goals_for < goals_against:
+        return "L"
+    return "D"
+
+
+class TeamTotals:
+    """مجاميع فريق واحد — apply(sign=-1) يلغي نتيجة سابقة."""
+
+    __slots__ = ("played", "wins", "draws", "losses", "goals_for", "goals_against", "points")
+
+    def __init__(self):
+        self.played = self.wins = self.draws = self.losses = 0
+        self.goals_for = self.goals_against = self.points = 0
+
+    def apply(self, goals_for: int, goals_against: int, sign: int = 1):
+        outcome = _outcome(goals_for, goals_against)
+        self.played += sign
+        self.goals_for += sign * goals_for
+        self.goals_against += sign * goals_against
+        self.points += sign * POINTS[outcome]
+        if outcome == "W":
+            self.wins += sign
+        elif outcome == "D":
+            self.draws += sign
+        else:
+            self.losses += sign
+
+    def sort_key(self, team_id: str) -> tuple:
+        # Points, goal difference, goals scored; team id keeps ties deterministic
+        return (-self.points, -(self.goals_for - self.goals_against), -self.goals_for, str(team_id))
+
+
+def _accumulate(results, counts) -> dict:
+    """إعادة حساب كاملة لمجاميع دوري من نتائجه (team_id -> TeamTotals)."""
+    totals: dict = {}
+    for home_id, away_id, _, status, home_score, away_score in results:
+        totals.setdefault(home_id, TeamTotals())
+        totals.setdefault(away_id, TeamTotals())
+        if counts(status):
+            totals[home_id].apply(home_score, away_score)
+            totals[away_id].apply(away_score, home_score)
+    return totals
+
+
+def _positions(totals: dict) -> dict:
+    ordered = sorted(totals, key=lambda team_id: totals[team_id].sort_key(team_id))
+    return {team_id: position for position, team_id in enumerate(ordered, start=1)}
+
+
+# ──────────────────────────────────────────────
+# Standings Engine
+# ──────────────────────────────────────────────
+
+class StandingsEngine:
+    """
+    حالة جداول الترتيب في الذاكرة (تحميل واحد من الـ DB، ثم تحديثات بالفرق).
+    """
+
+    def __init__(self, include_live: bool = True):
+        self.include_live = include_live
+        # league_id -> {(home_id, away_id, match_date): (home_id, away_id, start_time, status, hs, as)}
+        self._results: dict[str, dict[tuple, tuple]] = {}
+        self._totals: dict[str, dict[str, TeamTotals]] = {}
+        self._official: dict[str, dict[str, int]] = {}  # positions from finished matches only
+        self._baseline: dict[str, dict[str, int]] = {}  # official positions before the latest result
+        self._incomplete: set[str] = set()  # leagues whose stored table has more games than we know of
+        # league_id -> current season [start, end), None = no table (inactive, cup, friendlies).
+        # Leagues missing here (apply() without a DB) count every match.
+        self._seasons: dict[str, tuple[date, date] | None] = {}
+        self._pruned: set[str] = set()  # leagues whose rows from past seasons are gone
+        self._reload_on: date | None = None  # first season end: the next season needs a fresh load
+        self._loaded = False
+        self.stats = {"matches_applied": 0, "leagues_recomputed": 0, "rows_written": 0}
+
+    def _counts(self, status: str) -> bool:
+        return status == "finished" or (self.include_live and status == "live")
+
+    # ── state ──
+
+    def _in_season(self, league_id: str, match_date: date) -> bool:
+        if league_id not in self._seasons:
+            return True
+        season = self._seasons[league_id]
+        return season is not None and season[0] <= match_date < season[1]
+
+    def describe(self, session: Session, league_ids=None):
+        """
+        موسم كل دوري (أو None لو ما له جدول) من جدول leagues — كل الدوريات، أو league_ids بس
+        (دوريات انضافت بعد التحميل).
+        """
+        if league_ids is None:
+            rows = session.execute(text("SELECT id, name, season, is_active FROM public.leagues")).fetchall()
+        elif league_ids:
+            rows = session.execute(
+                text("SELECT id, name, season, is_active FROM public.leagues WHERE id = ANY(CAST(:ids AS uuid[]))"),
+                {"ids": list(league_ids)},
+            ).fetchall()
+        else:
+            return
+        today = _utc_today()
+        for league_id, name, season, is_active in rows:
+            league_id = str(league_id)
+            if not is_active or not is_league_format(name):
+                self._seasons[league_id] = None
+                continue
+            self._seasons[league_id] = window = season_window(season, today)
+            if self._reload_on is None or window[1] < self._reload_on:
+                self._reload_on = window[1]
+
+    def load(self, session: Session):
+        """تحميل نتائج الموسم الحالي للدوريات الفعّالة وحساب المجاميع."""
+        self._seasons.clear()
+        self._pruned.clear()
+        self._reload_on = None
+        self.describe(session)
+        seasons = [season for season in self._seasons.values() if season]
+        since = min((start for start, _ in seasons), default=_utc_today())
+        rows = session.execute(text("""
+            SELECT m.league_id, m.home_team_id, m.away_team_id, m.start_time, m.match_date,
+                   m.status, m.home_score, m.away_score
+            FROM public.matches m
+            JOIN public.leagues l ON l.id = m.league_id
+            WHERE l.is_active AND m.match_date >= :since
+        """), {"since": since}).fetchall()
+
+        self._results.clear()
+        self._totals.clear()
+        loaded = 0
+        for league_id, home_id, away_id, start_time, match_date, status, home_score, away_score in rows:
+            league_id, home_id, away_id = str(league_id), str(home_id), str(away_id)
+            if not self._in_season(league_id, match_date):
+                continue
+            loaded += 1
+            self._results.setdefault(league_id, {})[(home_id, away_id, match_date)] = (
+                home_id, away_id, start_time, status, home_score or 0, away_score or 0,
+            )
+
+        for league_id, results in self._results.items():
+            self._totals[league_id] = _accumulate(results.values(), self._counts)
+            self._official[league_id] = self._baseline[league_id] = self._official_positions(league_id)
+
+        # A table entered by hand (or from before the scraper) may count games we have no
+        # rows for — recomputing it from our matches would wipe it, so leave those alone.
+        # Rows not updated since the season started are last season's table — write() drops them.
+        stored = session.execute(text("""
+            SELECT league_id, team_id, played, updated_at FROM public.standings
+        """)).fetchall()
+        self._incomplete.clear()
+        for league_id, team_id, played, updated_at in stored:
+            league_id = str(league_id)
+            season = self._seasons.get(league_id)
+            if season is None or (updated_at and updated_at.date() < season[0]):
+                continue
+            known = self._totals.get(league_id, {}).get(str(team_id))
+            if (played or 0) > (known.played if known else 0):
+                self._incomplete.add(league_id)
+        for league_id in self._incomplete:
+            logger.warning(f"⚠️ جدول الترتيب للدوري {league_id} فيه مباريات مش عندنا — ما راح نعدّله")
+
+        self._loaded = True
+        logger.info(f"🏆 تم تحميل {loaded} مباراة لـ {len(self._results)} دوري (جدول الترتيب، الموسم الحالي)")
+
+    def invalidate(self):
+        """
+        الـ DB فيها نتائج ما مرّت من هنا (نسخة ثانية كتبت نفس الدوريات — coordination.py).
+        التحديث الجاي يحمّل كل شي من جديد بدل ما يبني على مجاميع قديمة.
+        """
+        if self._loaded:
+            logger.info("🏆 جدول الترتيب: إعادة تحميل من الـ DB في التحديث الجاي")
+        self._loaded = False
+
+    def _official_positions(self, league_id: str) -> dict:
+        return _positions(_accumulate(self._results[league_id].values(), lambda status: status == "finished"))
+
+    def apply(self, rows: list[dict]) -> set[str]:
+        """
+        تطبيق صفوف المباريات المكتوبة (stats["rows"] من upsert_matches).
+        Returns: الدوريات اللي تغيّر جدولها
+        """
+        changed: set[str] = set()
+        finished_changed: set[str] = set()
+
+        for row in rows:
+            league_id = row.get("league_id")
+            if not league_id:
+                continue
+            league_id = str(league_id)
+            home_id, away_id = str(row["home_team_id"]), str(row["away_team_id"])
+            start_time = row["start_time"]
+            match_date = start_time.astimezone(timezone.utc).date() if start_time.tzinfo else start_time.date()
+            if not self._in_season(league_id, match_date):
+                continue
+            key = (home_id, away_id, match_date)
+            new = (home_id, away_id, start_time, row["status"], row["home_score"] or 0, row["away_score"] or 0)
+
+            results = self._results.setdefault(league_id, {})
+            totals = self._totals.setdefault(league_id, {})
+            old = results.get(key)
+            if old == new:
+                continue
+
+            home, away = totals.setdefault(home_id, TeamTotals()), totals.setdefault(away_id, TeamTotals())
+            if old and self._counts(old[3]):
+                home.apply(old[4], old[5], sign=-1)
+                away.apply(old[5], old[4], sign=-1)
+            if self._counts(new[3]):
+                home.apply(new[4], new[5])
+                away.apply(new[5], new[4])
+
+            results[key] = new
+            self.stats["matches_applied"] += 1
+            if (old is not None and old[3] == "finished") or new[3] == "finished":
+                finished_changed.add(league_id)
+            if old is None or self._counts(old[3]) or self._counts(new[3]):
+                changed.add(league_id)
+
+        for league_id in finished_changed:
+            self._baseline[league_id] = self._official.get(league_id, {})
+            self._official[league_id] = self._official_positions(league_id)
+
+        return changed
+
+    # ── output ──
+
+    def table(self, league_id: str) -> list[dict]:
+        """جدول دوري واحد مرتّب: position, points, ..., form (الأقدم ← الأحدث), trend."""
+        totals = self._totals.get(league_id, {})
+        results = self._results.get(league_id, {}).values()
+
+        recent: dict[str, list] = {team_id: [] for team_id in totals}
+        live_now = False
+        for home_id, away_id, start_time, status, home_score, away_score in results:
+            if not self._counts(status):
+                continue
+            live_now = live_now or status == "live"
+            recent[home_id].append((start_time, _outcome(home_score, away_score)))
+            recent[away_id].append((start_time, _outcome(away_score, home_score)))
+
+        # Live table: compare with the official table; otherwise with the one before the latest result
+        reference = self._official if live_now else self._baseline
+        reference = reference.get(league_id, {})
+
+        table = []
+        for position, team_id in enumerate(
+            sorted(totals, key=lambda team_id: totals[team_id].sort_key(team_id)), start=1
+        ):
+            t = totals[team_id]
+            before = reference.get(team_id, position)
+            table.append({
+                "team_id": team_id,
+                "position": position,
+                "points": t.points,
+                "played": t.played,
+                "wins": t.wins,
+                "draws": t.draws,
+                "losses": t.losses,
+                "goals_for": t.goals_for,
+                "goals_against": t.goals_against,
+                "form": [outcome for _, outcome in sorted(recent[team_id])[-FORM_LENGTH:]],
+                "trend": "up" if position < before else "down" if position > before else "same",
+            })
+        return table
+
+    def full_recompute(self, league_id: str) -> list[dict]:
+        """إعادة حساب المجاميع من الصفر (للمقارنة والتحقق) ثم الجدول."""
+        self._totals[league_id] = _accumulate(self._results.get(league_id, {}).values(), self._counts)
+        return self.table(league_id)
+
+    # ── DB ──
+
+    def write(self, session: Session, league_ids: set[str]) -> int:
+        """
+        كتابة جدول كل دوري بـ INSERT واحد (بدون commit).
+        الصفوف اللي ما تغيّرت ما تنكتب — عشان ما نطلق أحداث Realtime بدون داعي.
+        Returns: عدد الصفوف المكتوبة
+        """
+        written = 0
+        now = datetime.now(timezone.utc)
+        for league_id in league_ids - self._incomplete:
+            table = self.table(league_id)
+            if not table:
+                continue
+
+            season = self._seasons.get(league_id)
+            if season and league_id not in self._pruned:
+                # Last season's rows (relegated teams) — once per league after a load
+                session.execute(text("""
+                    DELETE FROM public.standings
+                    WHERE league_id = CAST(:league_id AS uuid) AND updated_at < :season_start
+                """), {"league_id": league_id, "season_start": datetime.combine(season[0], datetime.min.time(), timezone.utc)})
+                self._pruned.add(league_id)
+
+            params = {"league_id": league_id, "now": now}
+            values = []
+            for i, row in enumerate(table):
+                params.update({f"{col}_{i}": value for col, value in row.items()})
+                values.append(
+                    f"(CAST(:league_id AS uuid), CAST(:team_id_{i} AS uuid), :position_{i}, :points_{i}, "
+                    f":played_{i}, :wins_{i}, :draws_{i}, :losses_{i}, :goals_for_{i}, "
+                    f":goals_against_{i}, CAST(:form_{i} AS text[]), :trend_{i}, :now)"
+                )
+
+            result = session.execute(
+                text(f"""
+                    INSERT INTO public.standings
+                        (league_id, team_id, position, points, played, wins, draws, losses,
+                         goals_for, goals_against, form, trend, updated_at)
+                    VALUES {", ".join(values)}
+                    ON CONFLICT (league_id, team_id) DO UPDATE SET
+                        position = EXCLUDED.position,
+                        points = EXCLUDED.points,
+                        played = EXCLUDED.played,
+                        wins = EXCLUDED.wins,
+                        draws = EXCLUDED.draws,
+                        losses = EXCLUDED.losses,
+                        goals_for = EXCLUDED.goals_for,
+                        goals_against = EXCLUDED.goals_against,
+                        form = EXCLUDED.form,
+                        trend = EXCLUDED.trend,
+                        updated_at = EXCLUDED.updated_at
+                    WHERE (standings.position, standings.points, standings.played,
+                           standings.goals_for, standings.goals_against, standings.form, standings.trend)
+                      IS DISTINCT FROM
+                          (EXCLUDED.position, EXCLUDED.points, EXCLUDED.played,
+                           EXCLUDED.goals_for, EXCLUDED.goals_against, EXCLUDED.form, EXCLUDED.trend)
+                """),
+                params,
+            )
+            written += result.rowcount
+            self.stats["leagues_recomputed"] += 1
+
+        self.stats["rows_written"] += written
+        return written
+
+    def update(self, session: Session, rows: list[dict]) -> tuple[int, int]:
+        """
+        تحميل (أول مرة) + تطبيق صفوف الدورة + كتابة الدوريات المتغيّرة + commit.
+        Returns: (عدد الدوريات، عدد الصفوف المكتوبة)
+        """
+        if self._loaded and self._reload_on is not None and _utc_today() >= self._reload_on:
+            logger.info("🏆 موسم جديد — جدول الترتيب يتحمّل من جديد")
+            self._loaded = False
+        league_ids = {str(row["league_id"]) for row in rows if row.get("league_id")}
+        if not self._loaded:
+            self.load(session)
+            self.apply(rows)
+            leagues = {league_id for league_id in league_ids if self._seasons.get(league_id, ()) is not None}
+        else:
+            self.describe(session, league_ids - self._seasons.keys())  # created since the load
+            leagues = self.apply(rows)
+        leagues -= self._incomplete
+        if not leagues:
+            return 0, 0
+        written = self.write(session, leagues)
+        session.commit()
+        return len(leagues), written
@@ -0,0 +1,167 @@
+"""
+إعدادات مشتركة لاختبارات السكرابر (pytest من مجلد supabase/Scraper):
+  - الموديولات مسطّحة (import parsing) — مجلد السكرابر يتضاف لـ sys.path
+  - fixture_html(name): صفحة محفوظة من fixtures/
+  - fixture_server: سيرفر HTTP محلي يقدّم fixtures/ (ETag/304، و /flaky/ يرجع 503 أول مرة،
+        و /delayed/ صفحة فاضية تحط بطاقات الـ fixture بعد تأخير — للمتصفح)
+  - pg: Postgres اختبار فيه الـ migrations (TEST_DATABASE_URL) — الاختبارات اللي تحتاجه تتخطى بدونه.
+        الجداول تنمسح قبل كل اختبار، فلا تحط رابط الإنتاج هنا.
+
+الاستخدام:
+  python -m pytest tests
+  TEST_DATABASE_URL=postgresql://postgres@localhost:54322/postgres python -m pytest tests
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import threading
+from urllib.parse import urlsplit, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+SCRAPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(SCRAPER_DIR, "fixtures")
+if SCRAPER_DIR not in sys.path:
+    sys.path.insert(0, SCRAPER_DIR)
+
+# Everything the scraper writes, wiped before each Postgres test
+_TABLES = (
+    "public.match_events", "public.standings", "public.matches",
+    "public.teams", "public.leagues", "public.scraper_leases",
+)
+
+
+def fixture_html(name: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def _delayed_page(path: str) -> str:
+    """
+    /delayed/<fixture>?after=<ms>&step=<ms>: صفحة بدون بطاقات تحط body الـ fixture بعد after،
+    وبعدها بـ step بطاقة زيادة (وتصير window.__koraDone = true). فيها خط وفيديو من /assets/
+    عشان نتأكد إن المتصفح ما يطلبهم.
+    """
+    url = urlsplit(path)
+    query = {key: int(values[0]) for key, values in parse_qs(url.query).items()}
+    page = fixture_html(url.path.removeprefix("/delayed/"))
+    body = re.search(r"<body[^>]*>(.*)</body>", page, re.S).group(1)
+    body = json.dumps(body).replace("</", "<\\/")
+    return f"""<!doctype html>
+<html><head><meta charset="utf-8">
+<style>@font-face {{ font-family: Kora; src: url(/assets/kora.woff2); }} body {{ font-family: Kora; }}</style>
+</head><body>
+<video src="/assets/clip.mp4" autoplay muted></video>
+<div id="root"></div>
+<script>
+const body = {body};
+setTimeout(() => {{
+    document.getElementById("root").innerHTML = body;
+    setTimeout(() => {{
+        const card = document.querySelector(".liItem");
+        card.parentNode.appendChild(card.cloneNode(true));
+        window.__koraDone = true;
+    }}, {query.get("step", 0)});
+}}, {query.get("after", 0)});
+</script>
+</body></html>"""
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real site
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+            server.connections.add(self.client_address)
+        name = self.path.lstrip("/")
+        if name.startswith("delayed/"):
+            return self._send(200, _delayed_page(self.path).encode(), {"Content-Type": "text/html; charset=utf-8"})
+        if name.startswith("flaky/"):
+            name = name.removeprefix("flaky/")
+            with server.lock:
+                first = name not in server.failed
+                server.failed.add(name)
+            if first:
+                return self._send(503, b"")
+        path = os.path.join(FIXTURES_DIR, name)
+        if not os.path.isfile(path):
+            return self._send(404, b"")
+        with open(path, "rb") as f:
+            body = f.read()
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+        if self.headers.get("If-None-Match") == etag:
+            return self._send(304, b"", {"ETag": etag})
+        # No charset on purpose: requests would guess ISO-8859-1
+        self._send(200, body, {"ETag": etag, "Content-Type": "text/html"})
+
+    def _send(self, status: int, body: bytes, headers: dict | None = None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def fixture_server():
+    """
+    fixtures/ على http://127.0.0.1:<port>/ — server.url، server.requests (المسارات المطلوبة)،
+    server.connections (اتصالات العملاء — إعادة استخدام الاتصال).
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FixtureHandler)
+    server.url = f"http://127.0.0.1:{server.server_address[1]}/"
+    server.lock = threading.Lock()
+    server.requests, server.connections, server.failed = [], set(), set()
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def pg(monkeypatch):
+    """
+    database.py على قاعدة الاختبار: جداول فاضية، كاش البصمات والأحداث والـ resolver جديدة.
+    Returns: موديول database
+    """
+    url = os.environ.get("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL غير موجود — اختبار Postgres")
+
+    import database
+    from resolver import EntityResolver
+    from sqlalchemy import text
+
+    database.dispose_engine()
+    monkeypatch.setenv("DATABASE_URL", url)
+    monkeypatch.setattr(database, "_resolver", EntityResolver())
+    monkeypatch.setattr(database, "_fingerprint_cache", {})
+    monkeypatch.setattr(database, "_seen_events", {})
+    with database.session_scope() as session:
+        session.execute(text(f"TRUNCATE {', '.join(_TABLES)} CASCADE"))
+    yield database
+    database.dispose_engine()
+
+
+class FakeClock:
+    """ساعة يدوية للمنطق المعتمد على الوقت (tiers، coordination)."""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
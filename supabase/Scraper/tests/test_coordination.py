@@ -0,0 +1,198 @@
+"""
+تنسيق النسخ: epoch يزيد لما شغلنا ممكن يكون انكتب من نسخة ثانية،
+وعمليات حقيقية على نفس الـ DB: قائد واحد بالضبط، وبعد قتل نسخة دورياتها بس تنتقل.
+"""
+
+import os
+import time
+import signal
+import logging
+import multiprocessing
+
+from conftest import FakeClock
+from coordination import Coordinator
+from database import dispose_engine
+
+# Short leases so a killed instance is replaced within seconds
+TTL = 2.0
+RENEW_EVERY = 0.5
+SETTLE_SECONDS = 2.0
+TAKEOVER_SECONDS = TTL + 2 * RENEW_EVERY + 1.0
+
+
+def test_epoch_on_takeover(pg):
+    clock = FakeClock()
+    leader = Coordinator("leader", "a", ttl=30, renew_every=10, clock=clock)
+    standby = Coordinator("leader", "b", ttl=30, renew_every=10, clock=clock)
+    leader.refresh()
+    standby.refresh()
+    assert (leader.epoch, standby.epoch) == (1, 0)
+
+    leader.release()
+    standby.refresh(force=True)
+    assert standby.leader and standby.epoch == 1
+
+
+def test_epoch_on_rebalance_and_lapse(pg):
+    clock = FakeClock()
+    a = Coordinator("shard", "a", ttl=30, renew_every=10, clock=clock)
+    b = Coordinator("shard", "b", ttl=30, renew_every=10, clock=clock)
+    a.refresh()
+    assert a.epoch == 0  # alone, same ring as before
+
+    b.refresh()
+    a.refresh(force=True)
+    assert a.epoch == 1 and a.ring.members == ("a", "b")
+
+    # Missed renewals: the local lease lapsed, the others may have taken our leagues meanwhile
+    clock.advance(25)
+    a.refresh()
+    assert a.epoch == 2
+    a.refresh(force=True)
+    assert a.epoch == 2
+
+
+def test_idle_leader_keeps_the_lease(pg):
+    clock = FakeClock()
+    leader = Coordinator("leader", "a", ttl=30, renew_every=10, clock=clock)
+    standby = Coordinator("leader", "b", ttl=30, renew_every=10, clock=clock)
+    leader.refresh()
+    standby.refresh()
+    assert leader.cap_sleep(300) == 10
+    assert Coordinator("all", "c").cap_sleep(300) == 300
+
+    # Idle for 5 minutes (scheduler says 300s), waking up every renew_every to refresh
+    for _ in range(30):
+        clock.advance(leader.cap_sleep(300))
+        leader.refresh()
+        standby.refresh()
+        assert leader.active() and not standby.active()
+    assert (leader.epoch, standby.epoch, leader.stats["takeovers"]) == (1, 0, 1)
+
+    # The uncapped sleep: the lease lapses while asleep
+    clock.advance(300)
+    assert not leader.active()
+    leader.refresh()
+    assert leader.epoch == 2
+
+
+# ──────────────────────────────────────────────
+# Separate processes (SIGKILL, no release)
+# ──────────────────────────────────────────────
+
+def _leagues(count: int) -> list[str]:
+    return [f"دوري تجريبي {i}" for i in range(count)]
+
+
+def _worker(mode: str, instance_id: str, leagues: list[str], events, stop):
+    """يسجّل كل تغيير في حالته: (وقت، النسخة، active أو الدوريات اللي عليه)."""
+    logging.getLogger().setLevel(logging.WARNING)
+    coordinator = Coordinator(mode, instance_id, ttl=TTL, renew_every=RENEW_EVERY)
+    last = None
+    while not stop.is_set():
+        coordinator.refresh()
+        if mode == "leader":
+            state = coordinator.active()
+        else:
+            state = frozenset(l for l in leagues if coordinator.active() and coordinator.owns(l))
+        if state != last:
+            events.put((time.time(), instance_id, state))
+            last = state
+        time.sleep(0.02)
+    coordinator.release()
+    dispose_engine()
+
+
+def _drain(events) -> list:
+    out = []
+    while not events.empty():
+        out.append(events.get())
+    return out
+
+
+def _start(mode: str, ids: list[str], leagues: list[str]):
+    dispose_engine()  # children get their own connections
+    ctx = multiprocessing.get_context("fork")
+    events, stop = ctx.Queue(), ctx.Event()
+    procs = {iid: ctx.Process(target=_worker, args=(mode, iid, leagues, events, stop)) for iid in ids}
+    for proc in procs.values():
+        proc.start()
+    return procs, events, stop
+
+
+def _stop(procs: dict, stop):
+    stop.set()
+    for proc in procs.values():
+        proc.join(10)
+
+
+def test_one_leader_and_takeover_after_kill(pg):
+    procs, events, stop = _start("leader", [f"check-leader-{i}" for i in range(3)], [])
+    try:
+        time.sleep(SETTLE_SECONDS)
+        timeline = _drain(events)
+        leaders = {iid for _, iid, active in timeline if active}
+        assert len(leaders) == 1
+        (killed,) = leaders
+        os.kill(procs[killed].pid, signal.SIGKILL)
+        killed_at = time.time()
+        time.sleep(TAKEOVER_SECONDS)
+    finally:
+        _stop(procs, stop)
+    timeline += _drain(events)
+
+    # Active intervals; the killed one ends when it was killed
+    intervals, since = [], {}
+    for at, iid, active in sorted(timeline):
+        if active:
+            since[iid] = at
+        elif iid in since:
+            intervals.append((since.pop(iid), at, iid))
+    for iid, at in since.items():
+        intervals.append((at, killed_at if iid == killed else time.time(), iid))
+    intervals.sort()
+    for (s1, e1, a), (s2, e2, b) in zip(intervals, intervals[1:]):
+        assert not (s2 < e1 and a != b), f"قائدين بنفس الوقت: {a} و {b}"
+
+    successors = [(s, iid) for s, _, iid in intervals if iid != killed and s > killed_at - 0.5]
+    assert successors, "ما استلم أحد بعد إيقاف القائد"
+    assert successors[0][0] - killed_at <= TTL + 2 * RENEW_EVERY + 0.5
+
+
+def _owned_now(timeline) -> dict:
+    state = {}
+    for _, iid, leagues_owned in sorted(timeline):
+        state[iid] = leagues_owned
+    return state
+
+
+def _assert_partition(state: dict, leagues: list[str]):
+    counts = {}
+    for leagues_owned in state.values():
+        for league in leagues_owned:
+            counts[league] = counts.get(league, 0) + 1
+    assert [l for l in leagues if counts.get(l, 0) != 1] == []
+
+
+def test_shard_moves_only_the_killed_instances_leagues(pg):
+    leagues = _leagues(30)
+    ids = [f"check-shard-{i}" for i in range(3)]
+    procs, events, stop = _start("shard", ids, leagues)
+    try:
+        time.sleep(SETTLE_SECONDS)
+        timeline = _drain(events)
+        before = _owned_now(timeline)
+        _assert_partition(before, leagues)
+
+        killed = ids[0]
+        os.kill(procs[killed].pid, signal.SIGKILL)
+        time.sleep(TAKEOVER_SECONDS)
+        timeline += _drain(events)
+    finally:
+        _stop(procs, stop)
+
+    after = {iid: owned for iid, owned in _owned_now(timeline).items() if iid != killed}
+    _assert_partition(after, leagues)
+    # Everyone else keeps what they had
+    moved = sum(1 for iid in after for l in after[iid] if l not in before.get(iid, frozenset()))
+    assert moved == len(before[killed])
@@ -0,0 +1,54 @@
+"""details.py: كاش صفحات التفاصيل — صفحة جديدة ترجع مرة وحدة، والقديمة تنحذف."""
+
+from datetime import datetime, timezone
+
+from conftest import FakeClock
+from details import DetailFetcher
+from parsing import ScrapedMatch
+
+
+def _match(i: int, status: str = "live") -> ScrapedMatch:
+    return ScrapedMatch(
+        home_team_name=f"فريق {2 * i}",
+        away_team_name=f"فريق {2 * i + 1}",
+        start_time=datetime.now(timezone.utc),
+        status=status,
+        detail_url=f"http://details.test/match/{i}",
+    )
+
+
+def _fetcher(clock: FakeClock) -> DetailFetcher:
+    fetcher = DetailFetcher("test", live_ttl=60, upcoming_ttl=600, budget_seconds=5, clock=clock)
+    fetcher.http.fetch_html = lambda url: "<html><body><div class='referee'>حكم</div></body></html>"
+    return fetcher
+
+
+def test_pages_delivered_once_until_ttl():
+    clock = FakeClock(1000.0)
+    fetcher = _fetcher(clock)
+    try:
+        assert len(fetcher.fetch([_match(1), _match(2, "upcoming")])) == 2
+        assert fetcher.fetch([_match(1), _match(2, "upcoming")]) == []
+
+        clock.advance(61)  # live page stale, upcoming one still fresh
+        assert [m.detail_url for m, _ in fetcher.fetch([_match(1), _match(2, "upcoming")])] == [
+            "http://details.test/match/1"
+        ]
+        assert fetcher.stats["fetched"] == 3
+    finally:
+        fetcher.close()
+
+
+def test_cache_evicts_pages_no_cycle_asks_for():
+    clock = FakeClock(1000.0)
+    fetcher = _fetcher(clock)
+    try:
+        # A long run: every cycle brings different matches
+        for cycle in range(50):
+            fetcher.fetch([_match(cycle)])
+            clock.advance(60)
+        # Only pages younger than the longest TTL (600s) are left
+        assert sorted(fetcher._cache) == sorted(f"http://details.test/match/{i}" for i in range(40, 50))
+        assert set(fetcher._delivered) == set(fetcher._cache)
+    finally:
+        fetcher.close()
@@ -0,0 +1,23 @@
+"""discovery.py: الـ layout القديم والجديد لـ Yallakora — عدد المباريات، بدون تكرار، كل مباراة بدوريها، والـ layout يتخزّن."""
+
+import pytest
+from lxml import html as lxml_html
+
+from conftest import fixture_html
+from discovery import find_containers
+from http_fetcher import parse_matches_html
+
+
+@pytest.mark.parametrize("page, expected", [
+    ("yallakora_old.html", 3),
+    ("yallakora_new.html", 4),
+])
+def test_saved_layouts_are_discovered(page, expected):
+    page_html = fixture_html(page)
+    matches = parse_matches_html(page_html)
+
+    assert len(matches) == expected
+    assert len({m.key for m in matches}) == len(matches)
+    assert all(m.league_name for m in matches)
+    # parse_matches_html recorded the layout: the next page with it skips discovery
+    assert find_containers(lxml_html.fromstring(page_html)).cached
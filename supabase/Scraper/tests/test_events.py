@@ -0,0 +1,78 @@
+"""أحداث المباراة: مفتاح التكرار، والوقت بدل الضائع (45+2 ≠ 47)."""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+
+from details import parse_match_details
+from parsing import ScrapedMatch
+
+PAGE = """
+<html><body><ul class="eventsTtl">
+  <li class="goal home"><span class="min">45+2'</span><span class="playerName">محمد صلاح</span></li>
+  <li class="goal home"><span class="min">47'</span><span class="playerName">محمد صلاح</span></li>
+  <li class="yellow away"><span class="min">90+3'</span><span class="playerName">أحمد فتوح</span></li>
+  <li class="goal home"><span class="min">47'</span><span class="playerName">محمد  صلاح</span></li>
+</ul></body></html>
+"""
+
+MATCH = ScrapedMatch(
+    home_team_name="فريق الأحداث أ",
+    away_team_name="فريق الأحداث ب",
+    start_time=datetime.now(timezone.utc).replace(hour=12, minute=0, second=0, microsecond=0),
+    status="live",
+    home_score=2,
+    minute=93,
+    league_name="دوري الأحداث",
+)
+
+
+def test_stoppage_time_kept_apart():
+    events = parse_match_details(PAGE)["events"]
+    assert [(e["minute"], e["stoppage"], e["event_type"], e["side"]) for e in events] == [
+        (47, 2, "goal", "home"),
+        (47, 0, "goal", "home"),
+        (93, 3, "yellow_card", "away"),
+        (47, 0, "goal", "home"),
+    ]
+
+
+def test_insert_dedups_but_keeps_stoppage_goal(pg):
+    with pg.session_scope() as session:
+        pg.upsert_matches(session, [MATCH])
+
+    details = [(MATCH, parse_match_details(PAGE))]
+    with pg.session_scope() as session:
+        first = pg.insert_match_events(session, details)
+    with pg.session_scope() as session:
+        again = pg.insert_match_events(session, details)
+        rows = session.execute(text(
+            "SELECT minute, stoppage, event_type, player_name FROM public.match_events ORDER BY minute, stoppage DESC"
+        )).fetchall()
+
+    # The last row is the 47' goal again with extra whitespace in the name
+    assert first == {"inserted": 3, "skipped": 0, "seen": 1}
+    assert again == {"inserted": 0, "skipped": 0, "seen": 4}
+    assert [tuple(row) for row in rows] == [
+        (47, 2, "goal", "محمد صلاح"),
+        (47, 0, "goal", "محمد صلاح"),
+        (93, 3, "yellow_card", "أحمد فتوح"),
+    ]
+
+
+def test_events_before_their_match_row_are_retried(pg):
+    details = [(MATCH, parse_match_details(PAGE))]
+
+    # The details page came back before the match row was written
+    with pg.session_scope() as session:
+        early = pg.insert_match_events(session, details)
+    assert early == {"inserted": 0, "skipped": 3, "seen": 1}
+
+    with pg.session_scope() as session:
+        pg.upsert_matches(session, [MATCH])
+    with pg.session_scope() as session:
+        later = pg.insert_match_events(session, details)
+        count = session.execute(text("SELECT COUNT(*) FROM public.match_events")).scalar()
+
+    assert later == {"inserted": 3, "skipped": 0, "seen": 1}
+    assert count == 3
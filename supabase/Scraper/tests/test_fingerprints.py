@@ -0,0 +1,117 @@
+"""كشف التغيير: نفس الدورات تنعاد على upsert_matches — اللي ما تغيّر ما ينكتب، حتى بعد إعادة التشغيل."""
+
+import dataclasses
+from datetime import datetime, timezone, timedelta
+
+from sqlalchemy import text
+
+from parsing import ScrapedMatch
+from resolver import EntityResolver
+
+KICKOFF = datetime.now(timezone.utc).replace(hour=12, minute=0, second=0, microsecond=0)
+
+
+def _match(home: str, away: str, **fields) -> ScrapedMatch:
+    return ScrapedMatch(
+        home_team_name=home, away_team_name=away, start_time=KICKOFF, league_name="دوري البصمات", **fields
+    )
+
+
+SNAPSHOT = [
+    _match("فريق البصمة 1", "فريق البصمة 2", status="live", home_score=1, minute=30),
+    _match("فريق البصمة 3", "فريق البصمة 4", status="live", minute=12),
+    _match("فريق البصمة 5", "فريق البصمة 6"),
+]
+
+
+def _utc_day(match: ScrapedMatch):
+    return match.start_time.astimezone(timezone.utc).date()
+
+
+def _cycle(db, matches: list[ScrapedMatch]) -> dict:
+    with db.session_scope() as session:
+        stats = db.upsert_matches(session, matches)
+    return {key: stats[key] for key in ("inserted", "updated", "unchanged", "skipped")}
+
+
+def _stored(db) -> dict:
+    """(home, away) -> (status, home_score, away_score, minute, updated_at)"""
+    with db.session_scope() as session:
+        rows = session.execute(text("""
+            SELECT ht.name, at.name, m.status, m.home_score, m.away_score, m.minute, m.updated_at
+            FROM public.matches m
+            JOIN public.teams ht ON ht.id = m.home_team_id
+            JOIN public.teams at ON at.id = m.away_team_id
+        """)).fetchall()
+    return {(home, away): tuple(rest) for home, away, *rest in rows}
+
+
+def test_replay_writes_only_changes(pg):
+    assert _cycle(pg, SNAPSHOT) == {"inserted": 3, "updated": 0, "unchanged": 0, "skipped": 0}
+    first = _stored(pg)
+
+    # Same page again: nothing goes to the DB
+    assert _cycle(pg, SNAPSHOT) == {"inserted": 0, "updated": 0, "unchanged": 3, "skipped": 0}
+    assert _stored(pg) == first
+
+    # One goal: only that row is written
+    scored = [dataclasses.replace(SNAPSHOT[0], home_score=2, minute=31), *SNAPSHOT[1:]]
+    assert _cycle(pg, scored) == {"inserted": 0, "updated": 1, "unchanged": 2, "skipped": 0}
+    after = _stored(pg)
+    key = ("فريق البصمة 1", "فريق البصمة 2")
+    assert after[key][:4] == ("live", 2, 0, 31)
+    assert after[key][4] > first[key][4]
+    assert {k: v for k, v in after.items() if k != key} == {k: v for k, v in first.items() if k != key}
+
+
+def test_seeded_cache_survives_restart(pg):
+    _cycle(pg, SNAPSHOT)
+    stored = _stored(pg)
+
+    # New process: empty cache, seeded from the DB
+    pg._fingerprint_cache.clear()
+    with pg.session_scope() as session:
+        assert pg.seed_fingerprint_cache(session) == 3
+    assert sorted(pg._fingerprint_cache.values()) == sorted(m.fingerprint for m in SNAPSHOT)
+
+    assert _cycle(pg, SNAPSHOT) == {"inserted": 0, "updated": 0, "unchanged": 3, "skipped": 0}
+    assert _stored(pg) == stored
+
+
+def test_seeded_cache_hits_other_spellings(pg):
+    _cycle(pg, SNAPSHOT)
+    stored = _stored(pg)
+
+    # New process: fresh resolver and cache; the page now spells the names differently
+    pg._fingerprint_cache.clear()
+    pg._resolver = EntityResolver()
+    with pg.session_scope() as session:
+        pg.seed_fingerprint_cache(session)
+    respelled = [
+        dataclasses.replace(m, home_team_name=m.home_team_name.replace("البصمة", "البصمه"),
+                            away_team_name="نادي " + m.away_team_name)
+        for m in SNAPSHOT
+    ]
+
+    assert _cycle(pg, respelled) == {"inserted": 0, "updated": 0, "unchanged": 3, "skipped": 0}
+    assert _stored(pg) == stored
+
+
+def test_unseeded_restart_rewrites_everything(pg):
+    _cycle(pg, SNAPSHOT)
+    pg._fingerprint_cache.clear()
+
+    # Without the seed every row is "new" to the cache: rewritten, not duplicated
+    assert _cycle(pg, SNAPSHOT) == {"inserted": 0, "updated": 3, "unchanged": 0, "skipped": 0}
+    assert len(_stored(pg)) == 3
+
+
+def test_seed_skips_older_days(pg):
+    old = _match("فريق البصمة 7", "فريق البصمة 8", status="finished")
+    old = dataclasses.replace(old, start_time=KICKOFF - timedelta(days=5))
+    _cycle(pg, [old, *SNAPSHOT])
+
+    pg._fingerprint_cache.clear()
+    with pg.session_scope() as session:
+        assert pg.seed_fingerprint_cache(session, days_back=1) == 3
+    assert _utc_day(old) not in {day for _, _, day in pg._fingerprint_cache}
@@ -0,0 +1,62 @@
+"""http_fetcher.py على سيرفر محلي: الترميز، الـ GET الشرطي، الأخطاء، وإعادة استخدام الاتصال."""
+
+import pytest
+import requests
+
+from conftest import fixture_html
+from http_fetcher import HttpFetcher, parse_matches_html
+from sources import YallakoraAdapter
+
+
+@pytest.fixture
+def fetcher(fixture_server):
+    fetcher = HttpFetcher(fixture_server.url + "yallakora_new.html", "kora-test")
+    yield fetcher
+    fetcher.close()
+
+
+def test_fetch_decodes_arabic_without_charset(fetcher):
+    page_html = fetcher.fetch_html()
+    assert page_html == fixture_html("yallakora_new.html")
+    assert len(parse_matches_html(page_html)) == 4
+
+
+def test_connection_reused_between_requests(fixture_server, fetcher):
+    for name in ("yallakora_new.html", "yallakora_old.html", "yallakora_day.html"):
+        fetcher.fetch_html(fixture_server.url + name)
+    assert len(fixture_server.requests) == 3
+    assert len(fixture_server.connections) == 1
+
+
+def test_conditional_get(fixture_server, fetcher):
+    url = fixture_server.url + "yallakora_day.html"
+    page_html, etag, _ = fetcher.fetch_if_modified(url)
+    assert page_html == fixture_html("yallakora_day.html") and etag
+
+    assert fetcher.fetch_if_modified(url, etag=etag) == (None, etag, "")
+    assert fetcher.fetch_if_modified(url, etag='"old"')[0] == page_html
+
+
+def test_http_errors_raise(fixture_server, fetcher):
+    with pytest.raises(requests.HTTPError):
+        fetcher.fetch_html(fixture_server.url + "missing.html")
+
+
+def test_retries_a_503(fixture_server, fetcher):
+    assert fetcher.fetch_html(fixture_server.url + "flaky/yallakora_old.html") == fixture_html("yallakora_old.html")
+    assert fixture_server.requests.count("/flaky/yallakora_old.html") == 2
+
+
+def test_adapter_scrape_matches_parsing_the_saved_page(fixture_server):
+    adapter = YallakoraAdapter("kora-test", fixture_server.url + "yallakora_old.html")
+    try:
+        scraped = adapter.scrape()
+    finally:
+        adapter.close()
+    expected = parse_matches_html(fixture_html("yallakora_old.html"), base_url=adapter.url)
+    # Cards without a kickoff time get "now" — compare everything else
+    def fields(m):
+        return {k: v for k, v in m.to_dict().items() if k != "start_time"}
+
+    assert [fields(m) for m in scraped] == [fields(m) for m in expected]
+    assert len(scraped) == 3
@@ -0,0 +1,90 @@
+"""المفتاح الطبيعي (migration 008): البحث بنفس الفريقين ونفس اليوم يمر على uq_matches_teams_date، مو seq scan."""
+
+import json
+from datetime import datetime, timezone, timedelta
+
+from sqlalchemy import text
+
+INDEX = "uq_matches_teams_date"
+KICKOFF = datetime.now(timezone.utc).replace(hour=12, minute=0, second=0, microsecond=0)
+
+
+def _seed(session, teams: int = 60, days: int = 30):
+    """teams فريق، كل زوج متتالي يلعب كل يوم لمدة days يوم (~1800 مباراة)."""
+    session.execute(text("""
+        INSERT INTO public.teams (name)
+        SELECT 'فريق الفهرس ' || i FROM generate_series(1, :teams) AS i
+    """), {"teams": teams})
+    session.execute(text("""
+        WITH t AS (SELECT id, row_number() OVER (ORDER BY name) AS n FROM public.teams)
+        INSERT INTO public.matches (home_team_id, away_team_id, start_time)
+        SELECT h.id, a.id, CAST(:kickoff AS timestamptz) - make_interval(days => d)
+        FROM t h
+        JOIN t a ON a.n = h.n % :teams + 1
+        CROSS JOIN generate_series(0, :days - 1) AS d
+    """), {"teams": teams, "days": days, "kickoff": KICKOFF})
+    session.execute(text("ANALYZE public.matches"))
+
+
+def _plan(session, sql: str, params: dict) -> dict:
+    (plan,) = session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"), params).scalar()
+    return plan["Plan"]
+
+
+def _nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from _nodes(child)
+
+
+def _some_match(session) -> dict:
+    home, away, match_date = session.execute(text(
+        "SELECT home_team_id, away_team_id, match_date FROM public.matches ORDER BY match_date DESC LIMIT 1"
+    )).one()
+    return {"home": home, "away": away, "day": match_date}
+
+
+def test_natural_key_lookup_uses_unique_index(pg):
+    with pg.session_scope() as session:
+        _seed(session)
+        plan = _plan(session, """
+            SELECT id FROM public.matches
+            WHERE home_team_id = :home AND away_team_id = :away AND match_date = :day
+        """, _some_match(session))
+
+    scans = [(node["Node Type"], node.get("Index Name")) for node in _nodes(plan) if "Scan" in node["Node Type"]]
+    assert scans == [("Index Scan", INDEX)], json.dumps(plan, indent=2)
+
+
+def test_details_update_joins_through_unique_index(pg):
+    # Same shape as update_match_details: UPDATE ... FROM (VALUES ...) on the natural key
+    with pg.session_scope() as session:
+        _seed(session)
+        plan = _plan(session, """
+            UPDATE public.matches m SET venue = v.venue
+            FROM (VALUES (CAST(:home AS uuid), CAST(:away AS uuid), CAST(:day AS date), 'ستاد القاهرة'))
+                AS v(home_team_id, away_team_id, match_date, venue)
+            WHERE m.home_team_id = v.home_team_id
+              AND m.away_team_id = v.away_team_id
+              AND m.match_date = v.match_date
+        """, _some_match(session))
+
+    scans = [node.get("Index Name") for node in _nodes(plan) if node["Node Type"] == "Index Scan"]
+    assert INDEX in scans, json.dumps(plan, indent=2)
+    assert not any(node["Node Type"] == "Seq Scan" and node.get("Relation Name") == "matches" for node in _nodes(plan))
+
+
+def test_upsert_conflict_target_is_unique_index(pg):
+    with pg.session_scope() as session:
+        home, away = session.execute(text("""
+            INSERT INTO public.teams (name) VALUES ('فريق الفهرس أ'), ('فريق الفهرس ب') RETURNING id
+        """)).scalars().all()
+        row = {
+            "league_id": None, "home_team_id": home, "away_team_id": away, "start_time": KICKOFF,
+            "status": "upcoming", "home_score": 0, "away_score": 0, "minute": 0,
+            "channel": "", "round": "", "updated_at": KICKOFF,
+        }
+        params = {f"{col}_0": value for col, value in row.items()}
+        plan = _plan(session, pg._upsert_statement(1).text, params)
+
+    assert plan["Conflict Arbiter Indexes"] == [INDEX]
@@ -0,0 +1,110 @@
+"""توحيد الأسماء والمطابقة التقريبية: همزة، تاء مربوطة، تشكيل، "ال" = "Al-"، والعتبة 0.55 / الفرق 0.15."""
+
+import pytest
+
+from normalize import normalize_name, TrigramIndex
+from resolver import NameIndex
+
+# id -> how the DB spells it
+TEAMS = {
+    "ahly_eg": "الأهلي المصري",
+    "ahly_sa": "الأهلي السعودي",
+    "hilal": "الهلال السعودي",
+    "zamalek": "الزمالك",
+    "ittihad_alex": "الاتحاد السكندري",
+    "ittihad_jeddah": "اتحاد جدة",
+    "masry": "المصري البورسعيدي",
+    "ahly_en": "Al-Ahly",
+}
+
+
+@pytest.mark.parametrize("noisy, clean", [
+    ("الأهْــلي", "الاهلي"),                 # diacritics + tatweel
+    ("إتحاد جدة", "اتحاد جده"),              # hamza below + taa marbuta
+    ("آل الشيخ", "ال الشيخ"),                # madda
+    ("الشرطة", "الشرطه"),
+    ("المؤسسة", "الموسسه"),                  # waw hamza
+    ("المصرى", "المصري"),                    # alef maqsura
+    ("نادي الزمالك F.C.", "الزمالك"),        # noise tokens + punctuation
+    ("الزمالك", "زمالك"),                    # article
+    ("Al-Ahly", "Ahly"),
+    ("El Ahly", "AL AHLY FC"),
+    ("  الهلال   السعودي ", "هلال سعودي"),
+    ("وادي دجلة ١٩٩٠", "وادي دجله 1990"),    # Eastern digits
+])
+def test_noisy_spellings_normalize_alike(noisy, clean):
+    assert normalize_name(noisy) == normalize_name(clean)
+
+
+def test_short_words_keep_their_letters():
+    # "ال" is only an article when 3+ letters follow it
+    assert normalize_name("الم") == "الم"
+    assert normalize_name("al") == ""
+    assert normalize_name("الاتحاد") == "اتحاد" != normalize_name("اتحاد جدة")
+
+
+def _index() -> TrigramIndex:
+    index = TrigramIndex()
+    for entity_id, name in TEAMS.items():
+        index.add(name, entity_id)
+    return index
+
+
+def _match(index: TrigramIndex, name: str) -> str | None:
+    match = index.best_match(name)
+    return match.entity_id if match else None
+
+
+def test_confident_match_clears_threshold_and_margin():
+    index = _index()
+    best, runner_up = index.candidates("الأهلي مصر")[:2]
+    assert best.entity_id == "ahly_eg"
+    assert best.score >= index.threshold and best.score - runner_up.score >= index.margin
+    assert _match(index, "الأهلي مصر") == "ahly_eg"
+    assert _match(index, "الاهلى السعودى") == "ahly_sa"
+
+
+def test_weak_match_below_threshold_is_rejected():
+    index = _index()
+    # A bare "الهلال" only shares half its trigrams with "الهلال السعودي"
+    (only,) = index.candidates("الهلال")
+    assert only.entity_id == "hilal" and only.score < index.threshold
+    assert _match(index, "الهلال") is None
+    loose = TrigramIndex(threshold=only.score)
+    loose.add("الهلال السعودي", "hilal")
+    assert _match(loose, "الهلال") == "hilal"
+
+
+def test_ambiguous_match_within_margin_is_rejected():
+    index = _index()
+    # Two clubs called Ittihad: the best one clears the threshold but not the margin
+    best, runner_up = index.candidates("الاتحاد")[:2]
+    assert {best.entity_id, runner_up.entity_id} == {"ittihad_alex", "ittihad_jeddah"}
+    assert best.score >= index.threshold
+    assert best.score - runner_up.score < index.margin
+    assert _match(index, "الاتحاد") is None
+    assert _match(index, "اتحاد جده") == "ittihad_jeddah"
+
+
+def test_bare_ahly_does_not_grab_either_club():
+    assert _match(_index(), "الأهلي") is None
+
+
+def test_name_index_lookup_order():
+    index = NameIndex()
+    for entity_id, name in TEAMS.items():
+        index.add(name, entity_id, aliases=("Zamalek SC",) if entity_id == "zamalek" else ())
+
+    assert index.lookup("الأهلي المصري") == "ahly_eg"         # exact
+    assert index.lookup("الاهلى المصرى") == "ahly_eg"         # normalized
+    assert index.lookup("El Ahly") == "ahly_en"               # normalized, "ال" = "Al-"
+    assert index.lookup("zamalek") == "zamalek"               # alias
+    assert index.lookup("الأهلي مصر") == "ahly_eg"            # trigram
+    assert index.lookup("الأهلي") is None
+    assert index.lookup("الاتحاد") is None
+    # Resolved spellings are remembered as exact names
+    assert index.exact["الاهلى المصرى"] == "ahly_eg"
+
+    index.remove_ids({"ahly_eg"})
+    assert index.lookup("الأهلي المصري") is None
+    assert index.lookup("الاهلى المصرى") is None
@@ -0,0 +1,86 @@
+"""parsing.py: نصوص الحالة والنتيجة المرجعية (كل كلمة في STATUS_KEYWORDS لازم تظهر مرة على الأقل)."""
+
+import pytest
+
+from parsing import STATUS_KEYWORDS, StatusInfo, parse_score, parse_status
+
+# (status text, expected StatusInfo) — every keyword in STATUS_KEYWORDS appears at least once
+GOLDEN_STATUSES = (
+    # live
+    ("مباشر", StatusInfo("live", 0, None, 0)),
+    ("Live", StatusInfo("live", 0, None, 0)),
+    ("جارية الآن", StatusInfo("live", 0, None, 0)),
+    ("بدأت", StatusInfo("live", 0, None, 0)),
+    ("الشوط الأول 23'", StatusInfo("live", 23, "first_half", 0)),
+    ("الشوط الثاني", StatusInfo("live", 0, "second_half", 0)),
+    ("شوط ثاني 67'", StatusInfo("live", 67, "second_half", 0)),
+    ("الشوط", StatusInfo("live", 0, None, 0)),
+    ("ش.ث", StatusInfo("live", 0, "second_half", 0)),
+    ("مباشر 45+2'", StatusInfo("live", 47, "first_half", 2)),
+    ("مباشر ٤٥+٢'", StatusInfo("live", 47, "first_half", 2)),
+    ("مباشر ۷۸′", StatusInfo("live", 78, "second_half", 0)),
+    ("90+4", StatusInfo("live", 94, "second_half", 4)),
+    ("90 + 4'", StatusInfo("live", 94, "second_half", 4)),
+    ("67'", StatusInfo("live", 67, "second_half", 0)),
+    # half time
+    ("HT", StatusInfo("live", 45, "half_time", 0)),
+    ("ش.أ", StatusInfo("live", 45, "half_time", 0)),
+    ("نهاية الشوط", StatusInfo("live", 45, "half_time", 0)),
+    ("نهاية الشوط الأول", StatusInfo("live", 45, "half_time", 0)),
+    ("استراحة", StatusInfo("live", 45, "half_time", 0)),
+    ("Half Time", StatusInfo("live", 45, "half_time", 0)),
+    ("Halftime", StatusInfo("live", 45, "half_time", 0)),
+    # extra time / penalties
+    ("Extra Time 105'", StatusInfo("live", 105, "extra_time", 0)),
+    ("وقت إضافي 98'", StatusInfo("live", 98, "extra_time", 0)),
+    ("الأشواط الإضافية", StatusInfo("live", 0, "extra_time", 0)),
+    ("ET 112'", StatusInfo("live", 112, "extra_time", 0)),
+    ("ركلات الترجيح", StatusInfo("live", 0, "penalties", 0)),
+    ("Penalties", StatusInfo("live", 0, "penalties", 0)),
+    ("pens", StatusInfo("live", 0, "penalties", 0)),
+    ("انتهت بركلات الترجيح", StatusInfo("finished", 120, "penalties", 0)),
+    ("AET", StatusInfo("finished", 120, "extra_time", 0)),
+    # finished
+    ("FT", StatusInfo("finished", 90, "full_time", 0)),
+    ("انتهت", StatusInfo("finished", 90, "full_time", 0)),
+    ("انتهت المباراة", StatusInfo("finished", 90, "full_time", 0)),
+    ("ن.م", StatusInfo("finished", 90, "full_time", 0)),
+    ("نهاية المباراة", StatusInfo("finished", 90, "full_time", 0)),
+    ("نهاية", StatusInfo("finished", 90, "full_time", 0)),
+    ("Finished", StatusInfo("finished", 90, "full_time", 0)),
+    ("Ended", StatusInfo("finished", 90, "full_time", 0)),
+    ("Full Time", StatusInfo("finished", 90, "full_time", 0)),
+    # upcoming
+    ("", StatusInfo("upcoming", 0, None, 0)),
+    ("20:00", StatusInfo("upcoming", 0, None, 0)),
+    ("لم تبدأ", StatusInfo("upcoming", 0, None, 0)),
+    ("Street", StatusInfo("upcoming", 0, None, 0)),
+    ("قريباً", StatusInfo("upcoming", 0, None, 0)),
+)
+
+GOLDEN_SCORES = (
+    ("2 - 1", (2, 1)),
+    ("2-1", (2, 1)),
+    ("3 – 0", (3, 0)),
+    ("1:1", (1, 1)),
+    ("٢ - ١", (2, 1)),
+    ("۳ - ۲", (3, 2)),
+    ("-", (0, 0)),
+    ("", (0, 0)),
+)
+
+
+@pytest.mark.parametrize("text, expected", GOLDEN_STATUSES)
+def test_parse_status(text, expected):
+    assert parse_status(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", GOLDEN_SCORES)
+def test_parse_score(text, expected):
+    assert parse_score(text) == expected
+
+
+def test_every_keyword_has_a_golden_string():
+    texts = [text.lower() for text, _ in GOLDEN_STATUSES]
+    missing = [kw for kw in STATUS_KEYWORDS if not any(kw in text for text in texts)]
+    assert missing == []
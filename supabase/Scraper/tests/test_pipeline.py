@@ -0,0 +1,67 @@
+"""pipeline.py: الكتابات بنفس ترتيب الجلب، والجلب ينتظر لما الكتابة متأخرة (backpressure)."""
+
+import time
+import asyncio
+import threading
+
+from pipeline import run_pipeline
+
+
+def _run(fetch, write, **kwargs) -> int:
+    return asyncio.run(run_pipeline(fetch, write, lambda matches: 0, **kwargs))
+
+
+def test_writes_keep_fetch_order():
+    fetched, written = [], []
+
+    def fetch(iteration):
+        fetched.append(iteration)
+        return [iteration]
+
+    def write(iteration, matches):
+        time.sleep(0.002 * (iteration % 3))  # uneven write times
+        written.append((iteration, matches))
+
+    assert _run(fetch, write, should_stop=lambda: len(fetched) >= 10) == 10
+    assert written == [(i, [i]) for i in range(1, 11)]
+
+
+def test_fetch_waits_for_slow_writer():
+    release = threading.Event()
+    fetched, seen_while_blocked = [], []
+
+    def fetch(iteration):
+        fetched.append(iteration)
+        return []
+
+    def write(iteration, matches):
+        release.wait(5)
+
+    def watchdog():
+        time.sleep(0.2)
+        seen_while_blocked.extend(fetched)
+        release.set()
+
+    threading.Thread(target=watchdog, daemon=True).start()
+    _run(fetch, write, queue_size=1, should_stop=lambda: len(fetched) >= 5)
+    # One cycle in the writer, one in the queue, the third waiting on put()
+    assert seen_while_blocked == [1, 2, 3]
+    assert fetched == [1, 2, 3, 4, 5]
+
+
+def test_failed_fetch_is_reported_and_loop_continues():
+    failed, written = [], []
+
+    def fetch(iteration):
+        if iteration == 2:
+            raise RuntimeError("down")
+        return [iteration]
+
+    _run(
+        fetch,
+        lambda iteration, matches: written.append(iteration),
+        should_stop=lambda: len(written) + len(failed) >= 3,
+        on_failed=lambda iteration, error: failed.append((iteration, str(error))),
+    )
+    assert failed == [(2, "down")]
+    assert 1 in written and 3 in written
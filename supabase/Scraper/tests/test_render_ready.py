@@ -0,0 +1,49 @@
+"""
+wait_until_ready و _block_heavy_requests في Chromium حقيقي على fixture_server:
+البطاقات تنحط بعد تأخير (/delayed/)، والجاهزية ما ترجع قبل ما يثبت عددها، والصور والخطوط
+والفيديو ما تنطلب أبداً. تتخطى بدون playwright أو بدون متصفح مثبّت (playwright install chromium).
+"""
+
+import pytest
+
+pytest.importorskip("playwright.sync_api")
+
+from scraper import BrowserSession, wait_until_ready, RENDER_STABLE_MS, RENDER_TIMEOUT_MS
+
+AFTER_MS = 800  # cards injected after this long
+STEP_MS = 300   # one more card — shorter than RENDER_STABLE_MS, so not ready in between
+CARDS = 4       # yallakora_new.html
+
+
+@pytest.fixture
+def page():
+    session = BrowserSession()
+    try:
+        page = session.page
+    except Exception as e:
+        session.close()
+        pytest.skip(f"Chromium غير مثبّت: {e}")
+    yield page
+    session.close()
+
+
+def test_ready_only_after_cards_render(fixture_server, page):
+    page.goto(fixture_server.url + f"delayed/yallakora_new.html?after={AFTER_MS}&step={STEP_MS}",
+              wait_until="domcontentloaded")
+    elapsed = wait_until_ready(page)
+
+    assert page.evaluate("window.__koraDone === true")
+    assert page.evaluate("document.querySelectorAll('.liItem').length") == CARDS + 1
+    assert (AFTER_MS + STEP_MS + RENDER_STABLE_MS) / 1000 <= elapsed < RENDER_TIMEOUT_MS / 1000
+
+
+def test_heavy_resources_never_requested(fixture_server, page):
+    page.goto(fixture_server.url + f"delayed/yallakora_new.html?after={AFTER_MS}&step={STEP_MS}",
+              wait_until="domcontentloaded")
+    wait_until_ready(page)
+    page.wait_for_load_state("load")
+
+    # Logos (<img>), the @font-face font and the <video> are aborted in the browser
+    assert page.evaluate("document.querySelectorAll('img[src^=\"/logos/\"]').length") > 0
+    assert [path for path in fixture_server.requests if path.startswith(("/logos/", "/assets/"))] == []
+    assert [path for path in fixture_server.requests if path.startswith("/delayed/")] != []
@@ -0,0 +1,87 @@
+"""scheduler.py بساعة وهمية: مباشر، نافذة البداية (قبل الموعد وبعده)، الانتظار الطويل، الحدود، ونهاية وقت التشغيل."""
+
+from datetime import datetime, timezone, timedelta
+
+import pytest
+
+from conftest import FakeClock
+from parsing import ScrapedMatch
+from scheduler import PollScheduler
+
+NOW = datetime.now(timezone.utc).replace(hour=12, minute=0, second=0, microsecond=0)
+
+
+def _scheduler(**kwargs) -> PollScheduler:
+    kwargs.setdefault("clock", FakeClock(NOW.timestamp()))
+    return PollScheduler(
+        min_interval=10, max_interval=300, live_interval=10, default_interval=30,
+        kickoff_window=600, kickoff_grace=900, **kwargs,
+    )
+
+
+def _match(status: str = "upcoming", kickoff: timedelta = timedelta(0), **fields) -> ScrapedMatch:
+    return ScrapedMatch(
+        home_team_name="الأهلي", away_team_name="الزمالك", start_time=NOW + kickoff, status=status, **fields
+    )
+
+
+def test_live_match_polls_fast():
+    matches = [_match(kickoff=timedelta(hours=5)), _match("live", minute=30)]
+    assert _scheduler().next_interval(matches) == (10, "live")
+
+
+def test_no_data_uses_default():
+    assert _scheduler().next_interval([]) == (30, "no_data")
+
+
+@pytest.mark.parametrize("kickoff", [
+    timedelta(minutes=10),    # window opens
+    timedelta(minutes=1),
+    timedelta(0),             # whistle
+    timedelta(minutes=-3),    # past kickoff, card still "upcoming"
+    timedelta(minutes=-14),
+])
+def test_kickoff_window_bursts_around_kickoff(kickoff):
+    assert _scheduler().next_interval([_match(kickoff=kickoff)]) == (10, "kickoff_soon")
+
+
+def test_kickoff_long_past_is_idle():
+    # Still "upcoming" 20 minutes after kickoff: postponed or never flipped — stop bursting
+    assert _scheduler().next_interval([_match(kickoff=timedelta(minutes=-20))]) == (300, "idle")
+
+
+def test_card_without_parsed_time_is_idle():
+    # parse_card falls back to the scrape time — not a kickoff that just passed
+    untimed = _match(kickoff=timedelta(seconds=-4, microseconds=-123456))
+    assert _scheduler().next_interval([untimed]) == (300, "idle")
+
+
+def test_waits_until_the_kickoff_window():
+    clock = FakeClock(NOW.timestamp())
+    scheduler = _scheduler(clock=clock)
+    matches = [_match("finished"), _match(kickoff=timedelta(minutes=14))]
+    assert scheduler.next_interval(matches) == (240, "next_kickoff")
+
+    clock.advance(240)
+    assert scheduler.next_interval(matches) == (10, "kickoff_soon")
+
+
+def test_idle_backs_off_to_max():
+    assert _scheduler().next_interval([_match("finished")]) == (300, "idle")
+
+
+def test_interval_is_clamped():
+    scheduler = _scheduler(clock=FakeClock(NOW.timestamp() + 57))
+    # 3s until the window opens -> min_interval
+    assert scheduler.next_interval([_match(kickoff=timedelta(minutes=11))]) == (10, "next_kickoff")
+    # Tomorrow's kickoff -> max_interval
+    assert scheduler.next_interval([_match(kickoff=timedelta(days=1))]) == (300, "next_kickoff")
+
+
+def test_deadline_caps_the_sleep():
+    clock = FakeClock(NOW.timestamp())
+    scheduler = _scheduler(clock=clock)
+    idle = [_match("finished")]
+    assert scheduler.next_interval(idle, deadline=clock() + 45) == (45, "budget")
+    assert scheduler.next_interval(idle, deadline=clock() + 600) == (300, "idle")
+    assert scheduler.next_interval(idle, deadline=clock() - 5) == (0.0, "budget")
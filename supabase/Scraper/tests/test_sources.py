@@ -0,0 +1,117 @@
+"""sources.py: الـ adapter على صفحات محفوظة، الدمج بين المصادر، والنتيجة القديمة لما مصدر يتعطل."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from conftest import FakeClock, fixture_html
+from http_fetcher import parse_matches_html
+from parsing import ScrapedMatch
+from sources import SourceAdapter, SourcePool, SourceResult, make_source, merge_sources
+
+KICKOFF = datetime.now(timezone.utc).replace(hour=18, minute=0, second=0, microsecond=0)
+
+
+def _match(home: str, away: str, **fields) -> ScrapedMatch:
+    return ScrapedMatch(home_team_name=home, away_team_name=away, start_time=KICKOFF, **fields)
+
+
+@pytest.mark.parametrize("page", ["yallakora_old.html", "yallakora_new.html", "yallakora_day.html"])
+def test_yallakora_extracts_saved_pages(page):
+    adapter = make_source("yallakora", "kora-test")
+    try:
+        matches = adapter.extract(fixture_html(page))
+    finally:
+        adapter.close()
+    assert matches
+    assert [m.key for m in matches] == [m.key for m in parse_matches_html(fixture_html(page))]
+    # Relative links resolved against the adapter's URL
+    assert all(m.detail_url.startswith("https://www.yallakora.com/match/") for m in matches)
+
+
+def test_adapter_without_extract_fails_at_construction():
+    class Incomplete(SourceAdapter):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete("kora-test")
+
+
+def test_unknown_source_is_rejected():
+    with pytest.raises(ValueError):
+        make_source("nosuchsite", "kora-test")
+
+
+def test_merge_keeps_first_names_and_takes_latest_state():
+    first = [_match("الأهلي", "الزمالك", status="live", minute=60, home_score=1, league_name="")]
+    # Second source: other spelling, home/away swapped, a goal later, and knows the league
+    second = [_match("نادي الزمالك", "الاهلى", status="live", minute=63, home_score=0, away_score=2,
+                     league_name="الدوري المصري", channel="أون تايم")]
+
+    (merged,) = merge_sources([
+        SourceResult("a", 1.0, 100.0, first),
+        SourceResult("b", 0.9, 100.0, second),
+    ])
+    assert (merged.home_team_name, merged.away_team_name) == ("الأهلي", "الزمالك")
+    assert (merged.minute, merged.home_score, merged.away_score) == (63, 2, 0)
+    assert (merged.league_name, merged.channel) == ("الدوري المصري", "أون تايم")
+    assert merged.key == first[0].key
+
+
+def test_merge_finished_beats_live_and_ties_go_to_first_source():
+    live = [_match("الهلال", "النصر", status="live", minute=90, home_score=1)]
+    finished = [_match("الهلال", "النصر", status="finished", minute=90, home_score=1)]
+    (merged,) = merge_sources([SourceResult("a", 1.0, 100.0, live), SourceResult("b", 1.0, 100.0, finished)])
+    assert merged.status == "finished"
+
+    a = [_match("الهلال", "النصر", status="live", minute=30, channel="SSC 1")]
+    b = [_match("الهلال", "النصر", status="live", minute=30, channel="SSC 2")]
+    (merged,) = merge_sources([SourceResult("a", 1.0, 100.0, a), SourceResult("b", 1.0, 100.0, b)])
+    assert merged is a[0]
+
+
+class _Scripted(SourceAdapter):
+    """مصدر بنتائج محددة مسبقاً — Exception في القائمة = الجلب فشل."""
+
+    name = "scripted"
+
+    def __init__(self, outcomes: list):
+        super().__init__("kora-test", "http://scripted.test/")
+        self.outcomes = outcomes
+
+    def extract(self, page_html: str, today=None) -> list[ScrapedMatch]:
+        return []
+
+    def scrape(self) -> list[ScrapedMatch]:
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def test_pool_reuses_last_result_until_max_age():
+    clock = FakeClock(1000.0)
+    primary = [_match("الأهلي", "الزمالك", status="live", minute=10)]
+    backup = [_match("الاتحاد", "الشباب", status="live", minute=20)]
+    pool = SourcePool(
+        [_Scripted([primary] * 3), _Scripted([backup, OSError("down"), OSError("down")])],
+        max_age=60, clock=clock,
+    )
+    try:
+        assert len(pool.scrape()) == 2
+        clock.advance(30)
+        assert len(pool.scrape()) == 2  # backup's result from 30s ago
+        clock.advance(40)
+        assert pool.scrape() == primary  # 70s old: dropped
+        assert pool.stats["failures"] == 2 and pool.stats["reused"] == 1
+    finally:
+        pool.close()
+
+
+def test_pool_raises_when_every_source_fails():
+    pool = SourcePool([_Scripted([OSError("down")]), _Scripted([OSError("down")])], clock=FakeClock())
+    try:
+        with pytest.raises(RuntimeError):
+            pool.scrape()
+    finally:
+        pool.close()
@@ -0,0 +1,220 @@
+"""
+spool.py: الإغلاق مع writer عالق، الكتابات المؤجلة اللي تنحذف أثناء الانقطاع،
+وانقطاع الـ DB أثناء التشغيل: لا حالة ضايعة، والدورة ما تنتظر.
+
+الانقطاع على Postgres حقيقي يوقف قاعدة الاختبار بـ pg_ctl ويشغّلها — يحتاج مجلدها:
+  TEST_DATABASE_URL=... TEST_PGDATA=/tmp/pgdata python -m pytest tests/test_spool.py
+"""
+
+import os
+import time
+import shlex
+import logging
+import sqlite3
+import threading
+import tempfile
+import subprocess
+from datetime import datetime, timezone, timedelta
+
+import pytest
+
+from parsing import ScrapedMatch
+from spool import MatchSpool, DEFERRED_MAX
+
+
+def _matches(count: int = 3) -> list[ScrapedMatch]:
+    kickoff = datetime.now(timezone.utc).replace(hour=18, minute=0, second=0, microsecond=0)
+    return [
+        ScrapedMatch(home_team_name=f"spool {2 * i}", away_team_name=f"spool {2 * i + 1}", start_time=kickoff)
+        for i in range(count)
+    ]
+
+
+def test_close_with_stuck_writer_closes_connection(tmp_path):
+    path = str(tmp_path / "spool.db")
+    entered, release = threading.Event(), threading.Event()
+
+    def stuck_write(matches):
+        entered.set()
+        release.wait(5)
+
+    spool = MatchSpool(path, stuck_write, idle=0.01)
+    spool.put(_matches())
+    assert entered.wait(5)
+
+    assert spool.close(timeout=0.1) == 3
+    with pytest.raises(sqlite3.ProgrammingError):
+        spool._db.execute("SELECT 1")
+
+    # The writer comes back after close() and leaves the file alone
+    release.set()
+    spool._thread.join(5)
+    assert not spool._thread.is_alive()
+
+    written = []
+    reopened = MatchSpool(path, written.extend, idle=0.01)
+    assert reopened.close() == 0
+    assert len(written) == 3
+
+
+def test_deferred_overflow_is_logged(tmp_path, caplog):
+    def down(matches):
+        raise ConnectionError("connection refused")
+
+    spool = MatchSpool(str(tmp_path / "spool.db"), down, idle=0.01)
+    spool.put(_matches())
+    with caplog.at_level(logging.WARNING, logger="spool"):
+        for _ in range(DEFERRED_MAX + 3):
+            spool.defer(lambda: None)
+        assert spool.stats["deferred_dropped"] == 3
+        spool.close(timeout=0.5)
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert any("الأقدم ينحذف" in message for message in messages)
+    assert any(f"{DEFERRED_MAX + 3} كتابة مؤجلة" in message for message in messages)
+
+
+# ──────────────────────────────────────────────
+# DB outage
+# ──────────────────────────────────────────────
+
+CYCLE_LATENCY_LIMIT = 0.05  # seconds a cycle may spend in put() — even with the DB down
+
+
+def _synthetic_cycle(cycle: int, count: int = 40) -> list[ScrapedMatch]:
+    """count مباراة مباشرة، النتيجة والدقيقة تتغيّر مع الدورات."""
+    kickoff = datetime.now(timezone.utc).replace(hour=18, minute=0, second=0, microsecond=0)
+    return [
+        ScrapedMatch(
+            home_team_name=f"spool فريق {2 * i}",
+            away_team_name=f"spool فريق {2 * i + 1}",
+            start_time=kickoff + timedelta(minutes=15 * (i % 4)),
+            status="live",
+            home_score=cycle // (3 + i % 5),
+            away_score=cycle // (4 + i % 3),
+            minute=min(cycle, 90),
+            league_name="دوري spool",
+        )
+        for i in range(count)
+    ]
+
+
+class _FakeDB:
+    """Postgres وهمي: {key: fingerprint} — down=True يرمي خطأ اتصال بعد تأخير."""
+
+    def __init__(self):
+        self.rows: dict[tuple, tuple] = {}
+        self.down = False
+
+    def write(self, matches: list[ScrapedMatch]):
+        if self.down:
+            time.sleep(0.05)
+            raise ConnectionError("connection refused")
+        for m in matches:
+            self.rows[m.key] = m.fingerprint
+
+    def final_states(self) -> dict:
+        return dict(self.rows)
+
+
+class _LocalPostgres:
+    """قاعدة الاختبار نفسها (pg fixture) تتوقف وترجع بـ pg_ctl، بنفس خيارات التشغيل."""
+
+    def __init__(self, database, pgdata: str, pg_ctl: str):
+        self.database = database
+        self.pgdata = pgdata
+        self.pg_ctl = pg_ctl
+        # e.g. a custom socket directory: "pg_ctl start" alone would drop it
+        with open(os.path.join(pgdata, "postmaster.opts")) as f:
+            argv = shlex.split(f.read())[1:]
+        self.options = shlex.join(arg for i, arg in enumerate(argv) if "-D" not in (arg, argv[i - 1]))
+        self._down = False
+
+    @property
+    def down(self) -> bool:
+        return self._down
+
+    @down.setter
+    def down(self, value: bool):
+        log = os.path.join(tempfile.gettempdir(), "kora-spool-test.log")
+        command = ["stop", "-m", "fast"] if value else ["start", "-l", log, "-o", self.options]
+        subprocess.run([self.pg_ctl, "-D", self.pgdata, "-w", *command], check=True, capture_output=True)
+        self._down = value
+
+    def write(self, matches: list[ScrapedMatch]):
+        with self.database.session_scope() as session:
+            stats = self.database.upsert_matches(session, matches)
+        if stats.get("error"):
+            raise ConnectionError(stats["error"])
+
+    def final_states(self) -> dict:
+        from sqlalchemy import text
+        with self.database.session_scope() as session:
+            result = session.execute(text("""
+                SELECT h.name, a.name, m.match_date, m.status, m.home_score, m.away_score, m.minute
+                FROM public.matches m
+                JOIN public.teams h ON h.id = m.home_team_id
+                JOIN public.teams a ON a.id = m.away_team_id
+                WHERE h.name LIKE 'spool %'
+            """))
+            return {(home, away, day): (status, hs, as_, minute) for home, away, day, status, hs, as_, minute in result}
+
+
+def _run_outage(db, path: str, cycles: int, interval: float, outage: tuple[int, int], restart_at: int) -> dict:
+    """
+    cycles دورة كل interval ثانية. الـ DB واقفة من outage[0] لين outage[1]،
+    والسكرابر نفسه "يعيد التشغيل" (spool جديد على نفس الملف) عند restart_at.
+    """
+    spool = MatchSpool(path, db.write, idle=interval)
+    result = {"latencies": [], "max_pending": 0, "pending_after_restart": None}
+    try:
+        for cycle in range(1, cycles + 1):
+            if cycle == outage[0]:
+                db.down = True
+            elif cycle == outage[1]:
+                db.down = False
+            if cycle == restart_at:
+                spool.close(timeout=1.0)
+                spool = MatchSpool(path, db.write, idle=interval)
+                result["pending_after_restart"] = spool.pending()
+
+            last = _synthetic_cycle(cycle)
+            started = time.perf_counter()
+            spool.put(last)
+            result["latencies"].append(time.perf_counter() - started)
+            result["max_pending"] = max(result["max_pending"], spool.pending())
+            time.sleep(interval)
+    finally:
+        if db.down:
+            db.down = False
+        result["left"] = spool.close(timeout=30.0)
+
+    result["last"] = {m.key: m.fingerprint for m in last}
+    return result
+
+
+def _assert_no_state_lost(db, result: dict):
+    assert result["pending_after_restart"], "الـ spool فاضي بعد إعادة التشغيل أثناء الانقطاع"
+    assert result["left"] == 0
+    # Ten cycles during the outage = one row per match, not ten
+    assert result["max_pending"] <= len(result["last"])
+    actual = db.final_states()
+    lost = [key for key, fingerprint in result["last"].items() if actual.get(key) != fingerprint]
+    assert not lost, f"{len(lost)} مباراة حالتها الأخيرة ما وصلت (مثلاً {lost[0]})"
+    assert max(result["latencies"]) <= CYCLE_LATENCY_LIMIT
+
+
+def test_outage_loses_no_final_state(tmp_path):
+    db = _FakeDB()
+    result = _run_outage(db, str(tmp_path / "spool.db"), cycles=60, interval=0.02, outage=(10, 40), restart_at=25)
+    _assert_no_state_lost(db, result)
+
+
+def test_postgres_outage_loses_no_final_state(pg, tmp_path):
+    pgdata = os.environ.get("TEST_PGDATA")
+    if not pgdata:
+        pytest.skip("TEST_PGDATA غير موجود — إيقاف Postgres الاختبار بـ pg_ctl")
+
+    db = _LocalPostgres(pg, pgdata, os.environ.get("TEST_PG_CTL", "pg_ctl"))
+    result = _run_outage(db, str(tmp_path / "spool.db"), cycles=30, interval=0.2, outage=(8, 22), restart_at=15)
+    _assert_no_state_lost(db, result)
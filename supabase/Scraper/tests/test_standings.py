@@ -0,0 +1,146 @@
+"""جدول الترتيب: الحساب بالفرق، الموسم الحالي بس، وإعادة التحميل لما نسخة ثانية كتبت نفس الدوري."""
+
+from datetime import date, datetime, timezone, timedelta
+
+import pytest
+from sqlalchemy import text
+
+from bench.table import synthetic_season
+from parsing import ScrapedMatch
+from standings import StandingsEngine, is_league_format, season_window
+
+KICKOFF = datetime.now(timezone.utc).replace(hour=12, minute=0, second=0, microsecond=0)
+
+
+def _result(home: str, away: str, home_score: int, away_score: int, days_ago: int,
+            league: str = "دوري الترتيب") -> ScrapedMatch:
+    return ScrapedMatch(
+        home_team_name=home,
+        away_team_name=away,
+        start_time=KICKOFF - timedelta(days=days_ago),
+        status="finished",
+        home_score=home_score,
+        away_score=away_score,
+        league_name=league,
+    )
+
+
+def _write(db, engine: StandingsEngine, match: ScrapedMatch):
+    """نفس _upsert_cycle في scraper.py: upsert ثم تحديث الجدول."""
+    with db.session_scope() as session:
+        stats = db.upsert_matches(session, [match])
+    with db.session_scope() as session:
+        engine.update(session, stats["rows"])
+
+
+def _stored_table(db) -> dict:
+    with db.session_scope() as session:
+        rows = session.execute(text("""
+            SELECT t.name, s.played, s.points FROM public.standings s
+            JOIN public.teams t ON t.id = s.team_id
+        """)).fetchall()
+    return {name: (played, points) for name, played, points in rows}
+
+
+def test_incremental_matches_full_recompute():
+    engine = StandingsEngine(include_live=False)
+    engine._loaded = True  # nothing in the DB to load
+    rows = [
+        {"league_id": "L", "home_team_id": h, "away_team_id": a, "start_time": KICKOFF - timedelta(days=d),
+         "status": "finished", "home_score": hs, "away_score": as_}
+        for d, (h, a, hs, as_) in enumerate([("A", "B", 1, 0), ("C", "A", 2, 2), ("B", "C", 0, 3)])
+    ]
+    engine.apply(rows)
+    # Correct a score, as a later cycle would
+    engine.apply([{**rows[0], "home_score": 0, "away_score": 1}])
+
+    incremental = engine.table("L")
+    assert engine.full_recompute("L") == incremental
+    assert [(row["team_id"], row["points"], row["played"]) for row in incremental] == [
+        ("C", 4, 2), ("B", 3, 2), ("A", 1, 2),
+    ]
+
+
+def test_season_never_drifts_from_full_recompute():
+    engine = StandingsEngine()
+    rounds = synthetic_season(teams=10)
+    for round_rows in rounds:
+        (league_id,) = engine.apply(round_rows)
+        table = engine.table(league_id)
+        assert table == engine.full_recompute(league_id)
+    assert sum(row["played"] for row in table) == 2 * sum(len(r) for r in rounds)
+
+
+def test_invalidate_reloads_leagues_written_elsewhere(pg):
+    ours = StandingsEngine(include_live=False)
+    _write(pg, ours, _result("فريق أ", "فريق ب", 1, 0, days_ago=3))
+
+    # Another instance owned the league for a while (shard rebalance / lost leader lease)
+    _write(pg, StandingsEngine(include_live=False), _result("فريق ج", "فريق أ", 2, 0, days_ago=2))
+
+    # The league comes back to us: without the reload our totals miss the match above
+    ours.invalidate()
+    _write(pg, ours, _result("فريق ب", "فريق ج", 1, 1, days_ago=1))
+
+    assert _stored_table(pg) == {
+        "فريق أ": (2, 3),
+        "فريق ب": (2, 1),
+        "فريق ج": (2, 4),
+    }
+
+
+@pytest.mark.parametrize("season, today, window", [
+    ("2025-2026", date(2025, 10, 1), (date(2025, 7, 1), date(2026, 7, 1))),
+    ("2025-2026", date(2026, 3, 1), (date(2025, 7, 1), date(2026, 7, 1))),
+    ("2025-2026", date(2027, 9, 1), (date(2027, 7, 1), date(2028, 7, 1))),  # stale schema default
+    ("2026", date(2026, 3, 1), (date(2026, 1, 1), date(2027, 1, 1))),
+    ("", date(2026, 3, 1), (date(2025, 7, 1), date(2026, 7, 1))),
+])
+def test_season_window(season, today, window):
+    assert season_window(season, today) == window
+
+
+@pytest.mark.parametrize("name, league", [
+    ("الدوري المصري الممتاز", True),
+    ("الدوري السعودي للمحترفين", True),
+    ("دوري روشن", True),
+    ("كأس مصر", False),
+    ("السوبر المصري", False),
+    ("دوري أبطال آسيا", False),
+    ("مباريات ودية", False),
+    ("تصفيات كأس العالم", False),
+    ("FA Cup", False),
+    ("Club Friendlies", False),
+])
+def test_league_format(name, league):
+    assert is_league_format(name) is league
+
+
+def test_table_counts_current_season_only(pg):
+    start, _ = season_window("", KICKOFF.date())
+    last_season = (KICKOFF.date() - start).days + 30
+
+    # Last season: the same clubs, plus one relegated since, with its old table row
+    with pg.session_scope() as session:
+        pg.upsert_matches(session, [
+            _result("فريق أ", "فريق ب", 5, 0, days_ago=last_season),
+            _result("فريق هابط", "فريق أ", 3, 0, days_ago=last_season + 7),
+        ])
+        session.execute(text("""
+            INSERT INTO public.standings (league_id, team_id, position, points, played, updated_at)
+            SELECT t.league_id, t.id, 1, 60, 30, :updated_at FROM public.teams t WHERE t.name = 'فريق هابط'
+        """), {"updated_at": datetime.combine(start, datetime.min.time(), timezone.utc) - timedelta(days=20)})
+
+    engine = StandingsEngine(include_live=False)
+    _write(pg, engine, _result("فريق ب", "فريق أ", 2, 1, days_ago=0))  # today: always this season
+    assert _stored_table(pg) == {"فريق أ": (1, 0), "فريق ب": (1, 3)}
+
+
+def test_cups_get_no_table(pg):
+    engine = StandingsEngine(include_live=False)
+    _write(pg, engine, _result("فريق أ", "فريق ب", 1, 0, days_ago=0, league="كأس الترتيب"))
+    assert _stored_table(pg) == {}
+    # Leagues created after the first load are described on the way in
+    _write(pg, engine, _result("فريق ج", "فريق د", 1, 0, days_ago=0))
+    _write(pg, engine, _result("فريق هـ", "فريق د", 0, 0, days_ago=0, league="كأس الترتيب 2"))
+    assert _stored_table(pg) == {"فريق ج": (1, 3), "فريق د": (1, 0)}
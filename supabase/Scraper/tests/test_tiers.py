@@ -0,0 +1,118 @@
+"""tiers.py بساعة وهمية و fixtures: الصلاحية لكل طبقة، ميزانية الأيام الجاية، 304، وتغيّر اليوم."""
+
+from datetime import datetime, timezone, timedelta
+
+from conftest import FakeClock, fixture_html
+from sources import YallakoraAdapter
+from tiers import TieredCrawler, HOT_TTL_SECONDS, WARM_TTL_SECONDS, COLD_TTL_SECONDS
+
+# 12:00 UTC: the new layout's upcoming match (19:00) is outside the kickoff window
+START = datetime.now(timezone.utc).replace(hour=12, minute=0, second=0, microsecond=0)
+TODAY_LIVE = 4   # yallakora_new.html: two live matches
+DAY_MATCHES = 3  # yallakora_day.html
+
+
+class _FixtureAdapter(YallakoraAdapter):
+    """صفحات الأيام من fixture، مع ETag: نفس الـ ETag = 304."""
+
+    def __init__(self):
+        self.url = self.DEFAULT_URL
+        self.etag = '"v1"'
+        self.requests: list = []
+
+    def fetch_day(self, day, etag="", last_modified=""):
+        self.requests.append(day)
+        if etag == self.etag:
+            return None, etag, last_modified
+        return fixture_html("yallakora_day.html"), self.etag, ""
+
+
+class _Setup:
+    def __init__(self):
+        self.clock = FakeClock(START.timestamp())
+        self.adapter = _FixtureAdapter()
+        self.today_html = fixture_html("yallakora_new.html")
+        self.crawler = TieredCrawler(self._fetch_today, self.adapter, days=3, cold_budget=1, clock=self.clock)
+
+    def _fetch_today(self):
+        return self.adapter.extract(self.today_html, today=datetime.fromtimestamp(self.clock(), timezone.utc).date())
+
+    def poll_all_days(self):
+        """t=0, 3, 6: صفحة اليوم وكل الأيام الجاية (يوم لكل دورة)."""
+        for _ in range(3):
+            self.crawler.poll()
+            self.clock.advance(3)
+
+    def end_live_matches(self):
+        self.today_html = self.today_html.replace("مباشر 23'", "انتهت").replace("ش.أ", "انتهت")
+
+
+def test_hot_ttl_and_cold_budget():
+    s = _Setup()
+    crawler = s.crawler
+
+    # t=0: today's page (hot — live matches) + one cold day, two deferred
+    assert len(crawler.poll()) == TODAY_LIVE + DAY_MATCHES
+    assert crawler.today_tier() == "hot"
+    assert crawler.stats["cold"]["deferred"] == 2
+
+    # t=3: hot TTL (5s) not over; the budget moves on to the next cold day
+    s.clock.advance(3)
+    assert len(crawler.poll()) == DAY_MATCHES
+    assert crawler.stats["hot"]["hits"] == 1
+
+    # t=6: hot refetch + the last cold day
+    s.clock.advance(3)
+    assert len(crawler.poll()) == TODAY_LIVE + DAY_MATCHES
+    assert crawler.stats["hot"]["fetches"] == 1  # the first fetch had no page to judge: warm
+    assert sorted(set(s.adapter.requests)) == [START.date() + timedelta(days=n) for n in (1, 2, 3)]
+
+    # t=8: nothing due
+    s.clock.advance(2)
+    assert crawler.poll() == []
+    assert len(crawler.snapshot()) == TODAY_LIVE + 3 * DAY_MATCHES
+
+
+def test_nothing_live_turns_warm():
+    s = _Setup()
+    crawler = s.crawler
+    s.poll_all_days()
+
+    s.end_live_matches()
+    s.clock.advance(HOT_TTL_SECONDS)
+    crawler.poll()
+    assert crawler.today_tier() == "warm"
+
+    warm_fetches = crawler.stats["warm"]["fetches"]
+    s.clock.advance(60)
+    crawler.poll()
+    assert crawler.stats["warm"]["fetches"] == warm_fetches
+    s.clock.advance(WARM_TTL_SECONDS)
+    crawler.poll()
+    assert crawler.stats["warm"]["fetches"] == warm_fetches + 1
+
+
+def test_cold_refetch_is_conditional():
+    s = _Setup()
+    crawler = s.crawler
+    s.poll_all_days()
+
+    # Cold TTL over: conditional requests -> 304, nothing re-emitted
+    s.clock.advance(COLD_TTL_SECONDS)
+    today = crawler._today(s.clock())
+    cold_fresh = [m for _ in range(3) for m in crawler.poll() if m.key[2] != today]
+    assert crawler.stats["cold"]["not_modified"] == 3
+    assert cold_fresh == []
+
+
+def test_midnight_drops_yesterday():
+    s = _Setup()
+    crawler = s.crawler
+    s.poll_all_days()
+
+    # Yesterday's page dropped, tomorrow's page becomes today's
+    s.clock.now = (START + timedelta(days=1, minutes=1)).timestamp()
+    fetches = crawler.stats["warm"]["fetches"] + crawler.stats["hot"]["fetches"]
+    crawler.poll()
+    assert crawler.stats["warm"]["fetches"] + crawler.stats["hot"]["fetches"] == fetches + 1
+    assert min(crawler._pages) == START.date() + timedelta(days=1)
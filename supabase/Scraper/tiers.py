@@ -0,0 +1,180 @@
+"""
+tiers.py — جلب الصفحات على طبقات، كل طبقة بمدة صلاحية وميزانية خاصة فيها
+  - hot:  صفحة اليوم وفيها مباراة مباشرة (أو تبدأ قريب) — كل دورة تقريباً (ثواني)
+  - warm: صفحة اليوم وما فيها شي جاري — كل كم دقيقة (المنتهية ما تتغير)
+  - cold: صفحات الأيام الجاية (?date=) — كل كم ساعة، بـ GET شرطي (ETag / Last-Modified)،
+          وعدد محدود من الصفحات لكل دورة عشان ما تأخر صفحة اليوم
+
+صفحة اليوم وحدة عند المصدر: hot و warm نفس الصفحة، والفرق مدة الصلاحية حسب آخر نسخة منها.
+الدورة ترجع بس المباريات اللي انجلبت فيها (للكتابة)؛ snapshot() فيها كل اللي نعرفه (للجدولة).
+
+الاختبارات (ساعة وهمية + fixtures: الصلاحية، الميزانية، 304، تغيّر اليوم): tests/test_tiers.py
+"""
+
+import time
+import logging
+from datetime import datetime, timezone, timedelta
+from typing import NamedTuple
+
+import metrics
+from parsing import ScrapedMatch
+
+logger = logging.getLogger(__name__)
+
+TIERS = ("hot", "warm", "cold")
+HOT_TTL_SECONDS = 5          # below the live poll interval: every live cycle refetches
+WARM_TTL_SECONDS = 300
+COLD_TTL_SECONDS = 6 * 3600
+COLD_DAYS = 3                # days after today
+COLD_BUDGET_PAGES = 1        # cold pages per cycle (the rest wait for the next cycles)
+KICKOFF_WINDOW_SECONDS = 600  # an upcoming match this close makes today's page hot
+
+
+class PageEntry(NamedTuple):
+    fetched_at: float
+    matches: list[ScrapedMatch]
+    etag: str = ""
+    last_modified: str = ""
+
+
+class TieredCrawler:
+    """
+    Args:
+        fetch_today() -> matches: صفحة اليوم (نفس fetch_matches — كل المصادر والـ backend)
+        adapter: المصدر الأساسي لصفحات الأيام الجاية (SourceAdapter.fetch_day)
+        days: كم يوم بعد اليوم (0 = بدون الطبقة الباردة)
+        clock: epoch seconds (قابل للحقن — ساعة وهمية في الاختبارات)
+    """
+
+    def __init__(
+        self,
+        fetch_today,
+        adapter=None,
+        days: int = COLD_DAYS,
+        hot_ttl: float = HOT_TTL_SECONDS,
+        warm_ttl: float = WARM_TTL_SECONDS,
+        cold_ttl: float = COLD_TTL_SECONDS,
+        cold_budget: int = COLD_BUDGET_PAGES,
+        kickoff_window: float = KICKOFF_WINDOW_SECONDS,
+        clock=time.time,
+    ):
+        self.fetch_today = fetch_today
+        self.adapter = adapter
+        self.days = days if adapter is not None and adapter.day_url(datetime.now(timezone.utc).date()) else 0
+        self.ttl = {"hot": hot_ttl, "warm": warm_ttl, "cold": cold_ttl}
+        self.cold_budget = cold_budget
+        self.kickoff_window = kickoff_window
+        self.clock = clock
+        self.stats = {
+            tier: {"hits": 0, "misses": 0, "fetches": 0, "not_modified": 0, "errors": 0, "deferred": 0}
+            for tier in TIERS
+        }
+        self._pages: dict = {}  # date -> PageEntry (today's page and the cold days)
+
+    def _today(self, now: float):
+        return datetime.fromtimestamp(now, timezone.utc).date()
+
+    def today_tier(self, now: float | None = None) -> str:
+        """hot لو آخر نسخة من صفحة اليوم فيها مباراة جارية أو تبدأ خلال kickoff_window."""
+        now = self.clock() if now is None else now
+        entry = self._pages.get(self._today(now))
+        if entry is None:
+            return "warm"
+        for m in entry.matches:
+            if m.status == "live":
+                return "hot"
+            if m.status == "upcoming" and m.start_time.timestamp() - now <= self.kickoff_window:
+                return "hot"
+        return "warm"
+
+    def _count(self, tier: str, event: str, value: int = 1):
+        self.stats[tier][event] += value
+        metrics.count(f"tier_{tier}_{event}", value)
+
+    def _due(self, tier: str, day, now: float) -> bool:
+        entry = self._pages.get(day)
+        due = entry is None or now - entry.fetched_at >= self.ttl[tier]
+        self._count(tier, "misses" if due else "hits")
+        return due
+
+    def poll(self) -> list[ScrapedMatch]:
+        """
+        دورة واحدة: صفحة اليوم لو انتهت صلاحيتها، ثم صفحات الأيام الجاية ضمن الميزانية.
+        Returns: المباريات اللي انجلبت في هالدورة فقط (304 والكاش ما يرجعون)
+        يرمي exception لو جلب صفحة اليوم فشل (الدورة فاشلة)
+        """
+        now = self.clock()
+        today = self._today(now)
+        for day in [day for day in self._pages if day < today]:
+            del self._pages[day]
+
+        fresh: list[ScrapedMatch] = []
+
+        # ── hot / warm: today's page ──
+        tier = self.today_tier(now)
+        if self._due(tier, today, now):
+            self._count(tier, "fetches")
+            try:
+                matches = self.fetch_today()
+            except Exception:
+                # The cycle fails (health file) — the cold days wait for the next one
+                self._count(tier, "errors")
+                raise
+            if matches:
+                self._pages[today] = PageEntry(now, matches)
+                fresh.extend(matches)
+            else:
+                # Empty — try again next cycle instead of trusting it for a whole TTL
+                self._count(tier, "errors")
+
+        # ── cold: the next days, oldest fetch first, within the budget ──
+        budget = self.cold_budget
+        upcoming = [today + timedelta(days=n) for n in range(1, self.days + 1)]
+        for day in sorted(upcoming, key=lambda d: self._pages[d].fetched_at if d in self._pages else 0):
+            if not self._due("cold", day, now):
+                continue
+            if budget <= 0:
+                self._count("cold", "deferred")
+                continue
+            budget -= 1
+            fresh.extend(self._fetch_day(day, now))
+
+        return fresh
+
+    def _fetch_day(self, day, now: float) -> list[ScrapedMatch]:
+        entry = self._pages.get(day)
+        self._count("cold", "fetches")
+        try:
+            with metrics.timer("http_fetch"):
+                page_html, etag, last_modified = self.adapter.fetch_day(
+                    day, entry.etag if entry else "", entry.last_modified if entry else ""
+                )
+        except Exception as e:
+            logger.warning(f"⚠️ فشل جلب مباريات {day}: {e}")
+            self._count("cold", "errors")
+            return []
+
+        if page_html is None:
+            self._count("cold", "not_modified")
+            self._pages[day] = entry._replace(fetched_at=now)
+            return []
+
+        with metrics.timer("parsing"):
+            # Cards without a kickoff time get today's date — not this day's, so they're left out
+            matches = [m for m in self.adapter.extract(page_html, today=day) if m.key[2] == day]
+        self._pages[day] = PageEntry(now, matches, etag, last_modified)
+        logger.info(f"🗓️ مباريات {day}: {len(matches)} مباراة")
+        return matches
+
+    def snapshot(self) -> list[ScrapedMatch]:
+        """كل المباريات المعروفة (اليوم + الأيام الجاية) — للجدولة."""
+        return [m for day in sorted(self._pages) for m in self._pages[day].matches]
+
+    def summary(self) -> str:
+        return " | ".join(
+            f"{tier}: {s['fetches']} جلب، {s['hits']} من الكاش"
+            + (f"، {s['not_modified']} بدون تغيير" if s["not_modified"] else "")
+            + (f"، {s['errors']} فشل" if s["errors"] else "")
+            for tier, s in self.stats.items()
+            if s["hits"] or s["misses"]
+        )
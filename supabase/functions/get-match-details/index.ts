@@ -44,7 +44,9 @@ serve(async (req) => {
                 .from("match_events")
                 .select("*, teams(name)")
                 .eq("match_id", match_id)
-                .order("minute", { ascending: true }),
+                .order("minute", { ascending: true })
+                // Same minute: 45+2 (stoppage 2) came before a second-half 47'
+                .order("stoppage", { ascending: false }),
 
             // Lineups
             supabase
@@ -45,16 +45,20 @@ serve(async (req) => {
 
         if (matchError) throw matchError;
 
-        // Insert event if provided
+        // Insert event if provided (a repeated event is ignored — see migrations 009 and 011)
         if (event) {
-            const { error: eventError } = await supabase.from("match_events").insert({
-                match_id,
-                minute: event.minute,
-                event_type: event.event_type,
-                player_name: event.player_name,
-                team_id: event.team_id,
-                description: event.description ?? "",
-            });
+            const { error: eventError } = await supabase.from("match_events").upsert(
+                {
+                    match_id,
+                    minute: event.minute,
+                    stoppage: event.stoppage ?? 0,
+                    event_type: event.event_type,
+                    player_name: event.player_name,
+                    team_id: event.team_id,
+                    description: event.description ?? "",
+                },
+                { onConflict: "match_id,minute,stoppage,event_type,player_name", ignoreDuplicates: true }
+            );
             if (eventError) throw eventError;
         }
 
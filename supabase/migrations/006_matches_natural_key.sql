@@ -0,0 +1,16 @@
+-- ============================================================
+-- شوف TV — Natural Key for Matches (scraper upsert target)
+-- ============================================================
+
+-- The scraper identifies a match by (home team, away team, UTC day).
+-- Remove historical duplicates first, keeping the most recently updated row.
+DELETE FROM public.matches m
+USING public.matches d
+WHERE m.home_team_id = d.home_team_id
+  AND m.away_team_id = d.away_team_id
+  AND (m.start_time AT TIME ZONE 'UTC')::date = (d.start_time AT TIME ZONE 'UTC')::date
+  AND (COALESCE(m.updated_at, m.created_at), m.id) < (COALESCE(d.updated_at, d.created_at), d.id);
+
+-- Conflict target for INSERT ... ON CONFLICT in database.upsert_matches()
+CREATE UNIQUE INDEX uq_matches_natural_key
+  ON public.matches (home_team_id, away_team_id, ((start_time AT TIME ZONE 'UTC')::date));
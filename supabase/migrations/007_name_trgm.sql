@@ -0,0 +1,11 @@
+-- ============================================================
+-- شوف TV — Trigram Indexes for Team/League Name Search
+-- ============================================================
+
+-- Fuzzy name search (similarity(), %, ILIKE '%...%') without sequential scans.
+-- The scraper matches names in memory (Scraper/normalize.py uses the same
+-- trigram scheme); these indexes serve ad-hoc lookups and other clients.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX idx_teams_name_trgm ON public.teams USING gin (name gin_trgm_ops);
+CREATE INDEX idx_leagues_name_trgm ON public.leagues USING gin (name gin_trgm_ops);
@@ -0,0 +1,18 @@
+-- ============================================================
+-- شوف TV — Stored Match Date (index-backed natural key)
+-- ============================================================
+
+-- UTC calendar day of the match, maintained by Postgres.
+-- Lookups by "same teams, same day" hit a plain b-tree on real columns
+-- instead of evaluating start_time::date row by row.
+ALTER TABLE public.matches
+  ADD COLUMN match_date DATE GENERATED ALWAYS AS ((start_time AT TIME ZONE 'UTC')::date) STORED;
+
+-- Replaces the expression index from 006 as the scraper's ON CONFLICT target
+ALTER TABLE public.matches
+  ADD CONSTRAINT uq_matches_teams_date UNIQUE (home_team_id, away_team_id, match_date);
+
+DROP INDEX IF EXISTS public.uq_matches_natural_key;
+
+-- Day-based queries (today's matches, scraper warm-up)
+CREATE INDEX idx_matches_match_date ON public.matches(match_date);
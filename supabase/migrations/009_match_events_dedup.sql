@@ -0,0 +1,22 @@
+-- ============================================================
+-- شوف TV — Match Events Dedup Key
+-- ============================================================
+
+-- One row per real event: the scraper polls live matches every few seconds
+-- and inserts with ON CONFLICT DO NOTHING, so a repeated event never reaches
+-- Realtime subscribers twice.
+
+-- Remove existing duplicates (keep the earliest row)
+DELETE FROM public.match_events e
+USING public.match_events d
+WHERE e.match_id = d.match_id
+  AND e.minute = d.minute
+  AND e.event_type = d.event_type
+  AND e.player_name = d.player_name
+  AND (e.created_at, e.id) > (d.created_at, d.id);
+
+ALTER TABLE public.match_events
+  ADD CONSTRAINT uq_match_events_dedup UNIQUE (match_id, minute, event_type, player_name);
+
+-- The unique index leads with match_id, so the plain index from 002 is redundant
+DROP INDEX IF EXISTS public.idx_events_match;
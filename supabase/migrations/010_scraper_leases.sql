@@ -0,0 +1,24 @@
+-- ============================================================
+-- شوف TV — Scraper Leases (coordination between scraper instances)
+-- ============================================================
+
+-- Overlapping runs (GitHub Actions cron every 5 minutes, 280s loop) used to
+-- write every match twice. Each instance holds time-limited leases here:
+--   'leader'            — --coordination leader: only the holder scrapes
+--   'member:<instance>' — --coordination shard: live members, leagues are
+--                         split between them by consistent hashing
+-- Leases are plain rows with an expiry (not session advisory locks), so they
+-- survive the Supabase transaction pooler and a crashed instance simply stops
+-- renewing. Expiry is compared to the database clock only.
+CREATE TABLE public.scraper_leases (
+  name        TEXT PRIMARY KEY,
+  holder      TEXT NOT NULL,
+  acquired_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  renewed_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+  expires_at  TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX idx_scraper_leases_expires ON public.scraper_leases(expires_at);
+
+-- Scraper only (service role bypasses RLS); no policies for app users
+ALTER TABLE public.scraper_leases ENABLE ROW LEVEL SECURITY;
@@ -0,0 +1,16 @@
+-- ============================================================
+-- شوف TV — Stoppage Time in the Match Events Dedup Key
+-- ============================================================
+
+-- "45+2" is stored as minute 47 (elapsed time, same as matches.minute), so a
+-- stoppage-time event and a second-half 47' event by the same player collided
+-- on uq_match_events_dedup and the later one was silently dropped. The added
+-- minutes get their own column and join the key: 45+2 → (47, 2), 47' → (47, 0).
+ALTER TABLE public.match_events
+  ADD COLUMN stoppage INT NOT NULL DEFAULT 0;
+
+ALTER TABLE public.match_events
+  DROP CONSTRAINT uq_match_events_dedup;
+
+ALTER TABLE public.match_events
+  ADD CONSTRAINT uq_match_events_dedup UNIQUE (match_id, minute, stoppage, event_type, player_name);